@@ -0,0 +1,97 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; either version 2
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+"""
+Numpy <-> BMesh through the scratch mesh against the old per element loops
+
+    blender -b --addons svrx --python benchmarks/bench_bmesh.py
+"""
+
+import timeit
+
+import bmesh
+import numpy as np
+
+from svrx.util.mesh import bmesh_from_pydata, rxdata_from_bm
+from svrx.util.smesh import SvPolygon
+from svrx.util.topology import plane_edges, plane_faces
+
+
+def old_bmesh_from_pydata(verts, edges=None, faces=None):
+    bm = bmesh.new()
+    add_vert = bm.verts.new
+    for co in verts:
+        add_vert(co)
+    bm.verts.index_update()
+    bm.verts.ensure_lookup_table()
+    if faces is not None:
+        add_face = bm.faces.new
+        for face in faces:
+            add_face(tuple(bm.verts[i] for i in face))
+        bm.faces.index_update()
+    if edges is not None:
+        add_edge = bm.edges.new
+        for edge in edges:
+            try:
+                add_edge(tuple(bm.verts[i] for i in edge))
+            except ValueError:
+                pass
+        bm.edges.index_update()
+    return bm
+
+
+def old_rxdata_from_bm(bm):
+    vertices = np.ones((len(bm.verts), 4), dtype=np.float64)
+    for idx, v in enumerate(bm.verts):
+        vertices[idx, :3] = v.co
+    edges = np.array([(e.verts[0].index, e.verts[1].index) for e in bm.edges], dtype=np.uint32)
+    faces = SvPolygon.from_pydata([[i.index for i in p.verts] for p in bm.faces])
+    return vertices, edges, faces
+
+
+def bench(label, func, base=None, number=1):
+    t = min(timeit.repeat(func, number=number, repeat=3)) / number
+    ratio = "{:>8.1f}x".format(base / t) if base else ""
+    print("{:<34}{:>12.4f}{}".format(label, t, ratio))
+    return t
+
+
+def main():
+    print("{:<34}{:>12}".format("", "seconds"))
+    for side in (100, 1001):
+        verts = np.ones((side * side, 4))
+        verts[:, 0] = np.tile(np.arange(side), side)
+        verts[:, 1] = np.repeat(np.arange(side), side)
+        verts[:, 2] = 0.0
+        edges = plane_edges(side, side)
+        faces = plane_faces(side, side)
+        name = "{} faces".format(len(faces))
+
+        base = bench("old bmesh_from_pydata " + name,
+                     lambda: old_bmesh_from_pydata(verts[:, :3].tolist(), edges, faces).free())
+        bench("bmesh_from_pydata " + name,
+              lambda: bmesh_from_pydata(verts, edges, faces).free(), base)
+
+        bm = bmesh_from_pydata(verts, edges, faces)
+        base = bench("old rxdata_from_bm " + name, lambda: old_rxdata_from_bm(bm))
+        bench("rxdata_from_bm " + name, lambda: rxdata_from_bm(bm), base)
+        bm.free()
+
+
+if __name__ == "__main__":
+    main()
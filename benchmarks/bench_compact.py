@@ -0,0 +1,70 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; either version 2
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+"""
+Vertex layouts, (N, 4) float64 against compact (N, 3) float32
+
+    blender -b --addons svrx --python benchmarks/bench_compact.py
+"""
+
+import timeit
+
+import numpy as np
+
+from svrx.nodes.generator.plane import plane_verts
+from svrx.util.vertices import transform, as_layout, layout_scope
+
+
+def bench(label, full, compact, number=3):
+    t_full = min(timeit.repeat(full, number=number, repeat=3)) / number
+    t_compact = min(timeit.repeat(compact, number=number, repeat=3)) / number
+    print("{:<30}{:>12.6f}{:>12.6f}{:>8.1f}x".format(label, t_full, t_compact, t_full / t_compact))
+
+
+def make_plane(side, compact):
+    t = np.linspace(-1.0, 1.0, side)
+    with layout_scope(compact):
+        return plane_verts(t, t)
+
+
+def main():
+    side = 3163  # about 10M vertices
+    mat = np.eye(4)
+    mat[:3, :3] *= 2.0
+    mat[:3, 3] = (1.0, 2.0, 3.0)
+
+    full = make_plane(side, False)
+    compact = make_plane(side, True)
+    print("{} vertices".format(len(full)))
+    print("{:<30}{:>12}{:>12}".format("", "full", "compact"))
+    print("{:<30}{:>12.1f}{:>12.1f}".format("MB", full.nbytes / 2**20, compact.nbytes / 2**20))
+
+    bench("plane",
+          lambda: make_plane(side, False),
+          lambda: make_plane(side, True))
+    bench("transform",
+          lambda: transform(full, mat),
+          lambda: transform(compact, mat))
+    # what the viewer does before foreach_set on mesh.vertices
+    bench("to blender co",
+          lambda: np.ascontiguousarray(full[:, :3], dtype=np.float32).ravel(),
+          lambda: as_layout(compact, True).ravel())
+
+
+if __name__ == "__main__":
+    main()
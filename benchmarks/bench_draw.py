@@ -0,0 +1,58 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; either version 2
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+"""
+Viewer buffers, bgl.Buffer from a python list against gl_buffer
+
+    blender -b --addons svrx --python benchmarks/bench_draw.py
+"""
+
+import timeit
+
+import bgl
+import numpy as np
+
+from svrx.nodes.output.viewer import gl_buffer, _can_copy_direct
+
+
+def old_buffer(gl_type, array):
+    return bgl.Buffer(gl_type, max(array.size, 1), array.ravel().tolist() or [0])
+
+
+def bench(label, old, new, number=3):
+    t_old = min(timeit.repeat(old, number=number, repeat=3)) / number
+    t_new = min(timeit.repeat(new, number=number, repeat=3)) / number
+    print("{:<30}{:>12.6f}{:>12.6f}{:>8.1f}x".format(label, t_old, t_new, t_old / t_new))
+
+
+def main():
+    print("direct copy", _can_copy_direct())
+    print("{:<30}{:>12}{:>12}".format("", "old", "new"))
+    for tris in (50000, 500000):
+        tri_co = np.random.random((tris * 3, 3)).astype(np.float32)
+        edges = np.random.randint(0, tris, tris * 3).astype(np.uint32)
+        bench("tri_co {}".format(tris),
+              lambda: old_buffer(bgl.GL_FLOAT, tri_co),
+              lambda: gl_buffer(bgl.GL_FLOAT, tri_co))
+        bench("edge_index {}".format(tris),
+              lambda: old_buffer(bgl.GL_INT, edges),
+              lambda: gl_buffer(bgl.GL_INT, edges))
+
+
+if __name__ == "__main__":
+    main()
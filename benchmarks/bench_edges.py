@@ -0,0 +1,66 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; either version 2
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+"""
+Deriving edges from faces, util.polygon.face_edges against
+mesh.update(calc_edges=True)
+
+    blender -b --addons svrx --python benchmarks/bench_edges.py
+"""
+
+import timeit
+
+import bpy
+import numpy as np
+
+from svrx.util.mesh import clear_mesh, as_int32
+from svrx.util.polygon import face_edges
+from svrx.util.topology import plane_faces
+
+
+def calc_edges(mesh, vert_count, faces):
+    clear_mesh(mesh)
+    mesh.vertices.add(vert_count)
+    mesh.loops.add(len(faces.vertex_indices))
+    mesh.loops.foreach_set("vertex_index", as_int32(faces.vertex_indices))
+    mesh.polygons.add(len(faces))
+    mesh.polygons.foreach_set("loop_start", as_int32(faces.loop_start))
+    mesh.polygons.foreach_set("loop_total", as_int32(faces.loop_total))
+    mesh.update(calc_edges=True)
+
+
+def bench(label, func, base=None, number=1):
+    t = min(timeit.repeat(func, number=number, repeat=3)) / number
+    ratio = "{:>8.1f}x".format(base / t) if base else ""
+    print("{:<34}{:>12.4f}{}".format(label, t, ratio))
+    return t
+
+
+def main():
+    mesh = bpy.data.meshes.new("bench_edges")
+    print("{:<34}{:>12}".format("", "seconds"))
+    for side in (101, 1001):
+        faces = plane_faces(side, side)
+        name = "{} quads".format(len(faces))
+        base = bench("calc_edges " + name, lambda: calc_edges(mesh, side * side, faces))
+        bench("face_edges " + name, lambda: face_edges(faces), base)
+    bpy.data.meshes.remove(mesh)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; either version 2
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+"""
+List matching, util.match kernels against the old python loops
+
+    blender -b --addons svrx --python benchmarks/bench_match.py
+"""
+
+import itertools
+import timeit
+
+import numpy as np
+
+from svrx.util.function import match_long_repeat, match_long_cycle, array_as, array_as_cycle
+
+
+def old_match_long_repeat(*parameters, limit=None, mask=None):
+    counts = [len(p) for p in parameters]
+    max_len = max(counts)
+    for i in range(max_len):
+        args = []
+        for c, parameter in zip(counts, parameters):
+            args.append(parameter[min(c - 1, i)])
+        yield args
+
+
+def old_match_long_cycle(*parameters, limit=None, mask=None):
+    counts = [len(p) for p in parameters]
+    max_len = max(counts)
+    args = []
+    for c, p in zip(counts, parameters):
+        if c < max_len:
+            args.append(itertools.cycle(p))
+        else:
+            args.append(p)
+    yield from zip(*args)
+
+
+def old_array_as(a, shape):
+    if a.shape == shape:
+        return a
+    new_a = np.empty(shape, dtype=a.dtype)
+    new_a[:len(a)] = a
+    new_a[len(a):] = a[-1]
+    return new_a
+
+
+def old_array_as_cycle(a, shape):
+    if a.shape == shape:
+        return a
+    new_a = np.empty(shape, dtype=a.dtype)
+    for i in range(shape[0]):
+        new_a[i] = a[i % len(a)]
+    return new_a
+
+
+def bench(label, old, new, number=5):
+    t_old = min(timeit.repeat(old, number=number, repeat=3)) / number
+    t_new = min(timeit.repeat(new, number=number, repeat=3)) / number
+    print("{:<30}{:>12.6f}{:>12.6f}{:>8.1f}x".format(label, t_old, t_new, t_old / t_new))
+
+
+def main():
+    print("{:<30}{:>12}{:>12}".format("", "old", "new"))
+    for size in (1000, 100000):
+        a = np.random.random(size)
+        b = np.random.random(size // 7)
+        c = np.random.random(3)
+        bench("match_long_repeat {}".format(size),
+              lambda: list(old_match_long_repeat(a, b, c)),
+              lambda: list(match_long_repeat(a, b, c)))
+        bench("match_long_cycle {}".format(size),
+              lambda: list(old_match_long_cycle(a, b, c)),
+              lambda: list(match_long_cycle(a, b, c)))
+        v = np.random.random((size // 7, 4))
+        bench("array_as {}".format(size),
+              lambda: old_array_as(v, (size, 4)),
+              lambda: array_as(v, (size, 4)))
+        bench("array_as_cycle {}".format(size),
+              lambda: old_array_as_cycle(v, (size, 4)),
+              lambda: array_as_cycle(v, (size, 4)))
+
+
+if __name__ == "__main__":
+    main()
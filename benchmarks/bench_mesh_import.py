@@ -0,0 +1,75 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; either version 2
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+"""
+SMesh.from_mesh against the old import with edge_keys and uint32 buffers
+
+    blender -b --addons svrx --python benchmarks/bench_mesh_import.py
+"""
+
+import timeit
+
+import bpy
+import numpy as np
+
+from svrx.util.smesh import SMesh, SvVertices, SvEdges, SvPolygon
+
+
+def grid_mesh(side):
+    """grid mesh with side * side vertices"""
+    bpy.ops.mesh.primitive_grid_add(x_subdivisions=side, y_subdivisions=side)
+    obj = bpy.context.active_object
+    return obj.data
+
+
+def old_from_mesh(mesh):
+    vertices = np.empty(len(mesh.vertices) * 3, dtype=np.float32)
+    mesh.vertices.foreach_get("co", vertices)
+    vertices.shape = (len(mesh.vertices), 3)
+    real_vertices = np.ones((len(mesh.vertices), 4))
+    real_vertices[:, :3] = vertices
+    edges = np.array(mesh.edge_keys, dtype=np.uint32)
+    loop_total = np.empty(len(mesh.polygons), dtype=np.uint32)
+    loop_start = np.empty(len(mesh.polygons), dtype=np.uint32)
+    mesh.polygons.foreach_get("loop_total", loop_total)
+    mesh.polygons.foreach_get("loop_start", loop_start)
+    vertex_indices = np.empty(len(mesh.loops), dtype=np.uint32)
+    mesh.loops.foreach_get("vertex_index", vertex_indices)
+    return (SvVertices(real_vertices), SvEdges(edges),
+            SvPolygon(loop_start, loop_total, vertex_indices))
+
+
+def bench(label, func, base=None, number=3):
+    t = min(timeit.repeat(func, number=number, repeat=3)) / number
+    ratio = "{:>8.1f}x".format(base / t) if base else ""
+    print("{:<34}{:>12.4f}{}".format(label, t, ratio))
+    return t
+
+
+def main():
+    print("{:<34}{:>12}".format("", "seconds"))
+    for side in (100, 1000):
+        mesh = grid_mesh(side)
+        name = "{} verts".format(len(mesh.vertices))
+        base = bench("old from_mesh " + name, lambda: old_from_mesh(mesh))
+        bench("from_mesh " + name, lambda: SMesh.from_mesh(mesh), base)
+        bench("from_mesh compact " + name, lambda: SMesh.from_mesh(mesh, compact=True), base)
+
+
+if __name__ == "__main__":
+    main()
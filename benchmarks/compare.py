@@ -0,0 +1,72 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; either version 2
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+"""
+Compare two reports from run.py, doesn't need blender
+
+    python benchmarks/compare.py old.json new.json --nodes
+"""
+
+import argparse
+import json
+
+
+def load(path):
+    with open(path) as report_file:
+        report = json.load(report_file)
+    return report['meta'], {(r['layout'], r['size']): r for r in report['results']}
+
+
+def ratio(old, new):
+    return new / old if old else float('nan')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="compare svrx benchmark reports")
+    parser.add_argument("old")
+    parser.add_argument("new")
+    parser.add_argument("--nodes", action="store_true", help="show per node timings")
+    parser.add_argument("--threshold", type=float, default=1.1,
+                        help="mark changes larger than this ratio")
+    args = parser.parse_args(argv)
+
+    old_meta, old = load(args.old)
+    new_meta, new = load(args.new)
+    print("old: {} {}  new: {} {}".format(old_meta['commit'], old_meta['date'],
+                                          new_meta['commit'], new_meta['date']))
+
+    for key in sorted(set(old) & set(new)):
+        o, n = old[key], new[key]
+        r = ratio(o['total'], n['total'])
+        mark = ''
+        if r > args.threshold:
+            mark = ' slower'
+        elif r < 1 / args.threshold:
+            mark = ' faster'
+        print("{:<20}{:>10}{:>12.6f}{:>12.6f}{:>8.2f}x{}".format(key[0], key[1], o['total'],
+                                                                n['total'], r, mark))
+        if args.nodes:
+            for name in sorted(set(o['nodes']) & set(n['nodes'])):
+                on, nn = o['nodes'][name], n['nodes'][name]
+                print("    {:<26}{:>12.6f}{:>12.6f}{:>8.2f}x{:>10.1f}MB".format(
+                    name, on['time'], nn['time'], ratio(on['time'], nn['time']),
+                    nn['memory'] / 2**20))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; either version 2
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+"""
+Reference layouts for the benchmark suite, each function takes
+a size and returns a json layout, see svrx.core.serialize
+"""
+
+import math
+
+from svrx.core.offline import LayoutBuilder
+
+
+def generator_fanout(size):
+    """size circles from one list of radii, exercises @generator"""
+    b = LayoutBuilder("generator_fanout")
+    radii = b.add("SvRxNodeNumberRangeInt", mode="Count", Start=1, Count=size)
+    circle = b.add("SvRxNodeCircle")
+    out = b.add("SvRxNodeRxMeshOut")
+    b.link(radii, 0, circle, 1)
+    b.link(circle, 0, out, 0)
+    b.link(circle, 1, out, 1)
+    b.link(circle, 2, out, 2)
+    return b.layout
+
+
+def math_chain(size, depth=50):
+    """depth add nodes after each other on size numbers"""
+    b = LayoutBuilder("math_chain")
+    last = b.add("SvRxNodeNumberRandom", mode="Random Float", Size=size)
+    for _ in range(depth):
+        add = b.add("SvRxNodeMath", mode="Add")
+        b.link(last, 0, add, 0)
+        last = add
+    out = b.add("SvRxNodeStethoscope")
+    b.link(last, 0, out, 0)
+    return b.layout
+
+
+def matrix_transform(size):
+    """one plane transformed by size matrices, recurse_levels over matrices"""
+    b = LayoutBuilder("matrix_transform")
+    locations = b.add("SvRxNodeVectorRandom", Size=size, Scale=10.0)
+    matrix = b.add("SvRxNodeCreateMatrix")
+    plane = b.add("SvRxNodeGenPlane", mode="Grid", X=4, Y=4)
+    transform = b.add("SvRxNodeMatrixTransform")
+    out = b.add("SvRxNodeStethoscope")
+    b.link(locations, 0, matrix, 0)
+    b.link(plane, 0, transform, 0)
+    b.link(matrix, 0, transform, 1)
+    b.link(transform, 0, out, 0)
+    return b.layout
+
+
+def spline_resample(size):
+    """cubic spline through 100 points evaluated at size points"""
+    b = LayoutBuilder("spline_resample")
+    points = b.add("SvRxNodeVectorRandom", Size=100)
+    spline = b.add("SvRxNodeVertexInterpol", mode="Cubic Spline Count", Count=size)
+    out = b.add("SvRxNodeStethoscope")
+    b.link(points, 0, spline, 0)
+    b.link(spline, 0, out, 0)
+    return b.layout
+
+
+def topology(size):
+    """grid and torus with about size vertices, exercises util.topology"""
+    b = LayoutBuilder("topology")
+    side = max(2, int(math.sqrt(size)))
+    plane = b.add("SvRxNodeGenPlane", mode="Grid", X=side, Y=side)
+    torus = b.add("SvRxNodeGenTorus", mode="Torus", N1=side, N2=side)
+    for gen in (plane, torus):
+        out = b.add("SvRxNodeRxMeshOut")
+        for i in range(3):
+            b.link(gen, i, out, i)
+    return b.layout
+
+
+LAYOUTS = {
+    'generator_fanout': (generator_fanout, (100, 1000, 10000)),
+    'math_chain': (math_chain, (1000, 100000, 1000000)),
+    'matrix_transform': (matrix_transform, (100, 1000, 10000)),
+    'spline_resample': (spline_resample, (1000, 100000, 1000000)),
+    'topology': (topology, (10000, 100000, 1000000)),
+}
@@ -0,0 +1,113 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; either version 2
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+"""
+Run the reference layouts and write a json report
+
+    blender -b --addons svrx --python benchmarks/run.py -- -o report.json -r 3 -l topology
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+
+from svrx.core.offline import Plan
+from layouts import LAYOUTS
+
+
+def git_commit():
+    try:
+        out = subprocess.check_output(["git", "rev-parse", "--short", "HEAD"],
+                                      cwd=os.path.dirname(os.path.abspath(__file__)))
+        return out.decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_layout(layout, repeat=3):
+    """
+    best of repeat for timings, memory from one extra traced run
+    since tracing slows down execution
+    """
+    plan = Plan(layout)
+    best = None
+    for _ in range(repeat):
+        plan.execute()
+        total = sum(plan.timings.values())
+        if best is None or total < best[0]:
+            best = total, dict(plan.timings)
+    plan.execute(trace_memory=True)
+    total, timings = best
+    nodes = {}
+    for node, t in timings.items():
+        # virtual nodes of the same kind share a name, counted together
+        entry = nodes.setdefault(node.name, {'time': 0.0, 'memory': 0})
+        entry['time'] += t
+        entry['memory'] = max(entry['memory'], plan.memory.get(node, 0))
+    plan.timings = timings
+    analysis = plan.analysis()
+    parallel = {key: analysis[key] for key in ('critical_path', 'critical_path_time',
+                                               'max_speedup', 'max_width')}
+    return {'total': total, 'nodes': nodes, 'parallel': parallel}
+
+
+def main(argv=None):
+    if argv is None:
+        argv = sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else sys.argv[1:]
+    parser = argparse.ArgumentParser(description="svrx benchmark suite")
+    parser.add_argument("-o", "--out", default="svrx_bench.json")
+    parser.add_argument("-r", "--repeat", type=int, default=3)
+    parser.add_argument("-l", "--layouts", nargs="*", default=sorted(LAYOUTS))
+    parser.add_argument("-s", "--sizes", nargs="*", type=int, default=None,
+                        help="override the default sizes")
+    args = parser.parse_args(argv)
+
+    results = []
+    for name in args.layouts:
+        make_layout, sizes = LAYOUTS[name]
+        for size in args.sizes or sizes:
+            res = run_layout(make_layout(size), args.repeat)
+            res.update(layout=name, size=size)
+            results.append(res)
+            print("{:<20}{:>10}{:>12.6f}s".format(name, size, res['total']))
+
+    report = {
+        'meta': {
+            'commit': git_commit(),
+            'date': time.strftime("%Y-%m-%d %H:%M:%S"),
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'machine': platform.machine(),
+        },
+        'results': results
+    }
+    with open(args.out, 'w') as report_file:
+        json.dump(report, report_file, indent=2, sort_keys=True)
+    return report
+
+
+if __name__ == "__main__":
+    main()
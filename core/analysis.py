@@ -0,0 +1,159 @@
+# -*- coding: utf-8 -*-
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; either version 2
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+"""
+Analysis of an execution plan, the node order from DAG() and the
+socket links it fills in, weighted by the cost of each node.
+Nodes are keyed by the node objects, names are only used in the
+results since virtual nodes of the same kind share a name.
+
+    deps = node_dependencies(socket_links)
+    result = analyze(dag_list, deps, times)   # times {node: seconds}
+    print(report_text(result))
+"""
+
+import collections
+
+
+def node_name(node):
+    return getattr(node, 'name', node)
+
+
+def node_dependencies(socket_links):
+    """
+    socket_links as filled in by DAG, {to_socket: from_socket}
+    returns {node: set of the nodes it reads from}
+    """
+    deps = collections.defaultdict(set)
+    for to_socket, from_socket in socket_links.items():
+        deps[to_socket.node].add(from_socket.node)
+    return deps
+
+
+def critical_path(order, deps, cost):
+    """
+    order, nodes in execution order
+    deps, {node: input nodes}
+    cost, {node: cost}, missing nodes cost 0
+    returns the most expensive chain of dependent nodes as a list
+    from first to last, and its total cost
+    """
+    finish = {}
+    previous = {}
+    for node in order:
+        before = [d for d in deps.get(node, ()) if d in finish]
+        start = 0.0
+        if before:
+            previous[node] = max(before, key=finish.get)
+            start = finish[previous[node]]
+        finish[node] = start + cost.get(node, 0.0)
+
+    if not finish:
+        return [], 0.0
+    node = max(order, key=finish.get)
+    length = finish[node]
+    path = [node]
+    while node in previous:
+        node = previous[node]
+        path.append(node)
+    path.reverse()
+    return path, length
+
+
+def node_levels(order, deps):
+    """
+    topological level of each node, 0 for nodes without inputs, else one
+    more than the deepest input. Nodes on the same level don't depend on
+    each other and could run at the same time
+    """
+    levels = {}
+    for node in order:
+        before = [levels[d] for d in deps.get(node, ()) if d in levels]
+        levels[node] = max(before) + 1 if before else 0
+    return levels
+
+
+def analyze(order, deps, cost, name=node_name):
+    """
+    critical path and parallelism of a plan, returns a json friendly dict
+    with the nodes given by name(node)
+
+    total_work, sum of all node costs, the serial execution time
+    critical_path_time, lower bound on the time with unlimited workers
+    max_speedup, total_work / critical_path_time
+    level_bound, time if every level runs in parallel with a barrier
+    between levels, what a simple wavefront executor could reach
+    levels, width (node count), work and span (slowest node) per level
+    critical_path and nodes are [name, cost] pairs, names can repeat
+    """
+    total = sum(cost.get(node, 0.0) for node in order)
+    path, length = critical_path(order, deps, cost)
+    levels = node_levels(order, deps)
+
+    waves = collections.defaultdict(list)
+    for node in order:
+        waves[levels[node]].append(node)
+    wavefronts = []
+    for level in sorted(waves):
+        nodes = waves[level]
+        costs = [cost.get(node, 0.0) for node in nodes]
+        wavefronts.append({
+            'level': level,
+            'width': len(nodes),
+            'work': sum(costs),
+            'span': max(costs),
+            'nodes': [name(node) for node in nodes],
+        })
+    level_bound = sum(w['span'] for w in wavefronts)
+
+    return {
+        'node_count': len(order),
+        'total_work': total,
+        'critical_path': [[name(node), cost.get(node, 0.0)] for node in path],
+        'critical_path_time': length,
+        'max_speedup': total / length if length > 0 else 1.0,
+        'level_bound': level_bound,
+        'level_speedup': total / level_bound if level_bound > 0 else 1.0,
+        'max_width': max((w['width'] for w in wavefronts), default=0),
+        'levels': wavefronts,
+        'nodes': [[name(node), cost.get(node, 0.0)] for node in order],
+    }
+
+
+def report_text(result):
+    """the result of analyze as readable text"""
+    lines = [
+        "Nodes: {}".format(result['node_count']),
+        "Total work: {:.6f}".format(result['total_work']),
+        "Critical path: {:.6f}".format(result['critical_path_time']),
+        "Max speedup: {:.2f}x".format(result['max_speedup']),
+        "Level by level: {:.6f} {:.2f}x".format(result['level_bound'], result['level_speedup']),
+        "Max width: {}".format(result['max_width']),
+        "",
+        "Critical path:",
+    ]
+    total = result['total_work'] or 1.0
+    for name, node_cost in result['critical_path']:
+        lines.append("    {:<40}{:>12.6f}{:>8.1%}".format(name, node_cost, node_cost / total))
+    lines.append("")
+    lines.append("{:<8}{:>8}{:>12}{:>12}".format("Level", "Width", "Work", "Span"))
+    for wave in result['levels']:
+        lines.append("{:<8}{:>8}{:>12.6f}{:>12.6f}".format(
+            wave['level'], wave['width'], wave['work'], wave['span']))
+    return "\n".join(lines)
@@ -0,0 +1,184 @@
+# -*- coding: utf-8 -*-
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; either version 2
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+"""
+Cost estimate made before executing a tree.
+
+Node functions can declare the size of their output with an out_bytes
+formula, called with the same arguments as the function itself
+
+    @node_func(bl_idname="SvRxNodeGenPlane", multi_label="Plane", id=0,
+               out_bytes=lambda x, y, size: x * y * 32)
+
+Unlinked inputs are the socket defaults and properties, linked inputs
+a stand-in for what their output socket produced in the previous run,
+see remember, so nodes fed by a node that hasn't run yet are skipped.
+Time is predicted from the seconds per estimated byte measured in
+previous runs.
+
+Nothing is estimated, remembered or learned for a tree while both its
+budgets are 0, so the first run with a budget only estimates the nodes
+that don't depend on the output of other nodes.
+"""
+
+import numpy as np
+
+from svrx.core.data_tree import SvDataTree
+from svrx.core.inference import socket_index
+from svrx.util.function import array_as
+
+
+# seconds per estimated byte, {cost key: rate}, learned while executing
+rates = {}
+
+# (bytes, seconds) estimated for the last execution of each tree
+last_estimate = {}
+
+# what output sockets produced in the last run, {socket key: (stand-in, leaf count)}
+known_outputs = {}
+
+# data up to this size is kept as it is, larger only by shape and dtype
+SAMPLE_SIZE = 1024
+
+
+def cost_key(func):
+    return func.bl_idname + ": " + func.label
+
+
+def socket_key(socket):
+    return socket.id_data.name, socket.node.name, socket_index(socket)
+
+
+def stand_in(data):
+    """
+    data itself if small, else a zero stride array with its shape and
+    dtype, enough for formulas that look at sizes. None if not an array
+    """
+    if not isinstance(data, np.ndarray):
+        return None
+    if data.size <= SAMPLE_SIZE:
+        return data.copy()
+    return np.broadcast_to(np.zeros(1, dtype=data.dtype), data.shape)
+
+
+def remember(socket, tree):
+    """keep a stand-in for the first leaf of the output tree of socket"""
+    leaves = len(tree.children) if tree.level else 1
+    while tree.level and tree.children:
+        tree = tree.children[0]
+    sample = None if tree.level else stand_in(tree.data)
+    if sample is None:
+        known_outputs.pop(socket_key(socket), None)
+    else:
+        known_outputs[socket_key(socket)] = sample, max(leaves, 1)
+
+
+def node_args(func, node, socket_links=None):
+    """
+    arguments of func for node matched to the same length, and how many
+    times the node is called for the largest linked input.
+    None if a linked input has not been seen yet
+    """
+    args = []
+    calls = 1
+    for param, _, _ in func.parameters:
+        if isinstance(param, int):
+            socket = node.inputs[param]
+            if socket.is_linked:
+                from_socket = (socket_links or {}).get(socket)
+                known = from_socket and known_outputs.get(socket_key(from_socket))
+                if not known:
+                    return None
+                args.append(np.atleast_1d(known[0]))
+                calls = max(calls, known[1])
+            else:
+                args.append(np.atleast_1d(SvDataTree(socket).data))
+        else:
+            args.append(np.atleast_1d(getattr(node, param)))
+
+    # same as the generator matching, non iterable parameters are passed whole
+    mask = getattr(func, 'mask', None) or [False] * len(args)
+    length = max([len(a) for a, m in zip(args, mask) if not m] or [1])
+    return [a if m or not len(a) else array_as(a, (length,) + a.shape[1:])
+            for a, m in zip(args, mask)], calls
+
+
+def estimate_node(func, node, socket_links=None):
+    """estimated output bytes of node, None if it can't be estimated"""
+    formula = getattr(func, 'out_bytes', None)
+    if formula is None:
+        return None
+    found = node_args(func, node, socket_links)
+    if found is None:
+        return None
+    args, calls = found
+    try:
+        return float(np.sum(formula(*args))) * calls
+    except Exception:
+        # a formula that doesn't fit the data only loses the estimate
+        return None
+
+
+def estimate(dag_list, nodes, socket_links=None):
+    """
+    {node: (bytes, seconds)} for the nodes that can be estimated,
+    seconds is None until the node type has been timed once.
+    socket_links as filled in by DAG, for the linked inputs
+    """
+    result = {}
+    for node in dag_list:
+        func = nodes[node]
+        nbytes = estimate_node(func, node, socket_links)
+        if nbytes is not None:
+            rate = rates.get(cost_key(func))
+            result[node] = nbytes, None if rate is None else nbytes * rate
+    return result
+
+
+def learn(func, nbytes, seconds):
+    """update the seconds per byte of func from one measured call"""
+    if nbytes <= 0:
+        return
+    key = cost_key(func)
+    rate = seconds / nbytes
+    if key in rates:
+        rate = (rates[key] + rate) * 0.5
+    rates[key] = rate
+
+
+def check_budget(estimates, max_bytes=0, max_seconds=0):
+    """
+    returns (node, message) for the most expensive node over budget,
+    or None. A budget of 0 is unlimited
+    """
+    if not estimates:
+        return None
+    total_bytes = sum(b for b, _ in estimates.values())
+    total_seconds = sum(s for _, s in estimates.values() if s is not None)
+    if max_bytes and total_bytes > max_bytes:
+        node = max(estimates, key=lambda n: estimates[n][0])
+        msg = "Estimated {:.0f} MB, {} alone {:.0f} MB, over the {:.0f} MB budget".format(
+            total_bytes / 2**20, node.name, estimates[node][0] / 2**20, max_bytes / 2**20)
+        return node, msg
+    if max_seconds and total_seconds > max_seconds:
+        node = max(estimates, key=lambda n: estimates[n][1] or 0.0)
+        msg = "Estimated {:.1f} s, {} alone {:.1f} s, over the {:.1f} s budget".format(
+            total_seconds, node.name, estimates[node][1], max_seconds)
+        return node, msg
+    return None
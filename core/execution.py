@@ -19,6 +19,7 @@
 
 import collections
 from itertools import chain
+import time
 
 import svrx
 from svrx.core.data_tree import SvDataTree
@@ -26,8 +27,12 @@ from svrx.core.type_conversion import needs_conversion, get_conversion
 from svrx.nodes.node_base import Stateful
 
 import svrx.core.timings as timings
+import svrx.core.cost as cost
+import svrx.core.inference as inference
 from svrx.core.timings import add_time, time_func, start_timing, show_timings
 import svrx.ui.error as error
+from svrx.util import bgl_callback, bgl_callback_3dview
+from svrx.util.vertices import layout_scope
 
 
 class SvTreeDB:
@@ -219,8 +224,16 @@ def DAG(ng, nodes, socket_links):
     # 3. wifi node replacement
 
     links = filter_reroute(ng)
+    return sort_links(links, nodes, socket_links, real_nodes=ng.rx_real_nodes)
+
+
+def sort_links(links, nodes, socket_links, real_nodes=False):
+    """
+    compile, type check and topologically sort the nodes
+    connected by links, shared between DAG and offline execution
+    """
     compile_nodes(links, nodes)
-    real_links = verify_links(links, nodes, socket_links, real_nodes=ng.rx_real_nodes)
+    real_links = verify_links(links, nodes, socket_links, real_nodes=real_nodes)
 
     from_nodes = set(node for node in chain(*real_links.values()))
     starts = {node for node in real_links.keys() if node not in from_nodes}
@@ -288,7 +301,9 @@ def recurse_levels(f, in_levels, out_levels, in_trees, out_trees):
             recurse_levels(f, in_levels, out_levels, args, outs)
 
 
-def collect_inputs(func, node):
+def collect_inputs(func, node, get=None):
+    if get is None:
+        get = data_trees.get
     in_trees = []
     in_levels = []
     for param, level, data_type in func.parameters:
@@ -297,7 +312,7 @@ def collect_inputs(func, node):
         if isinstance(param, int):
             socket = node.inputs[param]
             if socket.is_linked:
-                tree = data_trees.get(socket)
+                tree = get(socket)
             elif socket.required:
                 print("Warning Required socket not connected", node.name)
                 msg = "Required socket not connected {}: {}".format(node.name, socket.name)
@@ -311,11 +326,30 @@ def collect_inputs(func, node):
 
 
 def exec_node_group(node_group):
+    """
+    execute node_group, draw callbacks changed by the nodes are
+    applied and the views tagged for redraw once at the end.
+    Vertices are made in the layout chosen on the tree
+    """
+    callbacks = (bgl_callback, bgl_callback_3dview)
+    for callback in callbacks:
+        callback.begin_batch()
+    try:
+        with layout_scope(node_group.rx_compact_vertices):
+            _exec_node_group(node_group)
+    finally:
+        for callback in callbacks:
+            callback.end_batch()
+
+
+def _exec_node_group(node_group):
     data_trees.clean(node_group)
     error.clear(node_group)
     nodes = {}
     socket_links = {}
-    do_timings = node_group.do_timings_text or node_group.do_timings_graphics
+    do_timings = (node_group.do_timings_text or node_group.do_timings_graphics or
+                  node_group.do_timings_heatmap)
+    trace_memory = node_group.do_timings_heatmap and node_group.heatmap_mode == 'MEMORY'
     if do_timings:
         timings.start_timing()
 
@@ -324,11 +358,39 @@ def exec_node_group(node_group):
     dag_list = DAG(node_group, nodes, socket_links)
     data_trees.set_links(node_group, socket_links)
     add_time("DAG")
+    if do_timings:
+        timings.set_plan(dag_list, socket_links)
+    check_contracts = node_group.rx_check_contracts
+    # nothing to estimate for without a budget
+    use_budget = bool(node_group.rx_memory_budget or node_group.rx_time_budget)
+    node = None
     try:
+        if check_contracts:
+            _, issues = inference.infer(dag_list, nodes, socket_links)
+            inference.last_issues[node_group.name] = issues
+        else:
+            inference.last_issues.pop(node_group.name, None)
+        estimates = {}
+        if use_budget:
+            estimates = cost.estimate(dag_list, nodes, socket_links)
+            cost.last_estimate[node_group.name] = (
+                sum(b for b, _ in estimates.values()),
+                sum(s for _, s in estimates.values() if s is not None))
+            over_budget = cost.check_budget(estimates,
+                                            node_group.rx_memory_budget * 2**20,
+                                            node_group.rx_time_budget)
+            if over_budget:
+                node, msg = over_budget
+                raise MemoryError(msg)
+        else:
+            cost.last_estimate.pop(node_group.name, None)
+
         for node in dag_list:
 
             func = nodes[node]
             add_time(node.bl_idname + ": " + node.name)
+            if trace_memory:
+                timings.start_memory()
 
             if isinstance(func, Stateful):
                 add_time(func.label)
@@ -346,24 +408,44 @@ def exec_node_group(node_group):
 
             out_levels = [l for _, l in func.returns]
 
+            start = time.perf_counter()
             if do_timings:
                 recurse_levels(time_func(func), in_levels, out_levels, in_trees, out_trees)
             else:
                 recurse_levels(func, in_levels, out_levels, in_trees, out_trees)
+            if node in estimates:
+                cost.learn(func, estimates[node][0], time.perf_counter() - start)
 
-            for ot in out_trees:
+            for socket, ot in zip(node.outputs, out_trees):
                 if ot:
                     ot.set_level()
+                    if use_budget:
+                        cost.remember(socket, ot)
+
+            if check_contracts:
+                for socket, ot, (s_type, _) in zip(node.outputs, out_trees, func.returns):
+                    issue = ot and inference.check_tree(ot, s_type)
+                    if issue:
+                        issues.append("{}: {} is {}".format(node.name, socket.name, issue))
 
             if isinstance(func, Stateful):
                 add_time(func.label)
                 func.stop()
                 add_time(func.label)
 
+            if trace_memory:
+                timings.stop_memory(node.name)
             add_time(node.bl_idname + ": " + node.name)
         add_time(node_group.name)
 
         if do_timings:
             show_timings(node_group)
     except Exception as err:
+        if node is None:
+            # failed while planning, before any node ran
+            if not dag_list:
+                raise
+            node = dag_list[0]
+        if trace_memory:
+            timings.stop_memory(node.name)
         error.show(node, err)
@@ -21,7 +21,7 @@ import bpy
 from bpy.app.handlers import persistent
 
 from svrx.core.tree import svrx_trees
-from svrx.util import bgl_callback, bgl_callback_3dview
+from svrx.util import bgl_callback, bgl_callback_3dview, object_index
 import svrx
 
 @persistent
@@ -46,6 +46,8 @@ def sv_file_load(scene):
     for callback in (bgl_callback, bgl_callback_3dview):
         callback.callback_disable_all()
 
+    object_index.invalidate()
+
     for ng in svrx_trees():
         for node in ng.nodes:
             if node.bl_idname == "SvRxNodeScript":
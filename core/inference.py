@@ -0,0 +1,155 @@
+# -*- coding: utf-8 -*-
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; either version 2
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+"""
+dtype and shape contracts, see the dtype / shape attributes of the
+types in svrx.typing.
+
+infer runs over the plan from DAG() before execution and finds the
+links where the data can't fit the input without a lossy cast.
+check_tree verifies, while executing, that a node produced what its
+output type promises.
+
+A contract is (dtype, shape, exact_dtype), None for anything.
+
+The contracts are only used to report issues, the debug panel lists
+them. Execution and the mesh writers don't depend on them, so nothing
+here runs unless the tree has rx_check_contracts on.
+"""
+
+import collections
+
+import numpy as np
+
+
+# issues found in the last execution of each tree, {tree name: [str]}
+last_issues = {}
+
+
+def type_contract(s_type):
+    return s_type.dtype, s_type.shape, s_type.exact_dtype
+
+
+def dtype_fits(dtype, contract):
+    expected, _, exact = contract
+    if dtype is None or expected is None:
+        return True
+    if exact:
+        return dtype == expected
+    if expected.kind == 'b':
+        # any number is a truth value, as for bool(x)
+        return dtype.kind in 'biuf'
+    return bool(np.can_cast(dtype, expected, 'same_kind'))
+
+
+def shape_fits(shape, contract):
+    expected = contract[1]
+    if shape is None or expected is None:
+        return True
+    if len(shape) != len(expected):
+        return False
+    return all(e is None or s is None or s == e for s, e in zip(shape, expected))
+
+
+def describe(dtype, shape):
+    dims = "" if shape is None else "({})".format(
+        ", ".join("N" if s is None else str(s) for s in shape))
+    return "{} {}".format(dtype if dtype is not None else "any", dims).strip()
+
+
+def socket_index(socket):
+    index = getattr(socket, 'index', None)
+    if index is None:
+        sockets = socket.node.outputs if socket.is_output else socket.node.inputs
+        index = sockets.index(socket)
+    return index
+
+
+def input_type(func, index):
+    for param, _, s_type in func.parameters:
+        if param == index:
+            return s_type
+    return None
+
+
+def infer(dag_list, nodes, socket_links):
+    """
+    propagate contracts through the plan, returns the contract of every
+    output {(node, index): contract} and the issues found as text.
+    Outputs without a dtype, like Anytype, take the contract of the
+    first linked input that has one
+    """
+    inputs = collections.defaultdict(list)
+    for to_socket, from_socket in socket_links.items():
+        inputs[to_socket.node].append((socket_index(to_socket), from_socket))
+
+    contracts = {}
+    issues = []
+    for node in dag_list:
+        func = nodes[node]
+        known = None
+        for to_index, from_socket in sorted(inputs[node], key=lambda i: i[0]):
+            contract = contracts.get((from_socket.node, socket_index(from_socket)))
+            to_type = input_type(func, to_index)
+            if contract is None or to_type is None:
+                continue
+            if known is None and contract[0] is not None:
+                known = contract
+            expected = type_contract(to_type)
+            if not (dtype_fits(contract[0], expected) and shape_fits(contract[1], expected)):
+                issues.append("{}: {} gets {}, expects {}".format(
+                    node.name, node.inputs[to_index].name,
+                    describe(*contract[:2]), describe(*expected[:2])))
+
+        for index, (s_type, _) in enumerate(func.returns):
+            contract = type_contract(s_type)
+            if contract[0] is None and known is not None:
+                contract = known
+            contracts[(node, index)] = contract
+    return contracts, issues
+
+
+def data_layout(data):
+    """dtype and shape of data, SvPolygon by its index arrays"""
+    if hasattr(data, 'vertex_indices'):
+        return data.vertex_indices.dtype, None
+    if isinstance(data, np.ndarray):
+        return data.dtype, data.shape
+    return None, None
+
+
+def check_tree(tree, s_type):
+    """
+    compare the first leaf of tree with the contract of s_type,
+    returns a description of the mismatch or None
+    """
+    while tree.level and tree.children:
+        tree = tree.children[0]
+    if tree.level or tree.data is None:
+        return None
+    contract = type_contract(s_type)
+    dtype, shape = data_layout(tree.data)
+    if dtype is None and contract[0] is not None:
+        return "{} instead of {}".format(type(tree.data).__name__, describe(*contract[:2]))
+    if dtype_fits(dtype, contract) and shape_fits(shape, contract):
+        return None
+    compact = getattr(s_type, 'compact', None)
+    if compact and dtype_fits(dtype, compact) and shape_fits(shape, compact):
+        return None
+    return "{} instead of {}".format(describe(dtype, shape), describe(*contract[:2]))
@@ -0,0 +1,320 @@
+# -*- coding: utf-8 -*-
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; either version 2
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+"""
+Execute a json layout, see svrx.core.serialize, without a node tree.
+
+The layout is turned into OfflineNode/OfflineSocket stand ins that
+behave enough like the real thing for the normal execution machinery.
+Everything is run as in exec_node_group, but stateful nodes without
+outputs (mesh out, viewers etc.) are treated as sinks and only have
+their inputs collected, unless run_sinks is set.
+
+    plan = Plan(load_layout("layout.json"))
+    sinks = plan.execute()
+    sinks["Viewer"]["Vertices"]  # SvDataTree
+    plan.timings                 # {node: seconds}
+    plan.analysis()              # critical path, see svrx.core.analysis
+"""
+
+import collections
+import time
+import tracemalloc
+
+from svrx.core.analysis import analyze, node_dependencies
+from svrx.core.data_tree import SvDataTree
+from svrx.core.execution import (VirtualLink, VirtualSocket,
+                                 sort_links, collect_inputs, recurse_levels)
+from svrx.nodes.node_base import Stateful
+from svrx.nodes.classes import (NodeBase, NodeStateful, _node_classes,
+                                _multi_storage, _node_scripts)
+from svrx.core.serialize import json_value, LAYOUT_VERSION
+from svrx.util.importers import text_remap
+from svrx.util.vertices import layout_scope
+
+
+class OfflineSocket(VirtualSocket):
+    def __init__(self, node, index, data, output=False):
+        super().__init__(node,
+                         name=data.get('name'),
+                         default=data.get('default_value'),
+                         output=output)
+        self.index = index
+        self.bl_idname = data.get('bl_idname', "SvRxSocketAny")
+        self.required = data.get('required', False)
+
+
+class OfflineNode:
+    """
+    Stand in for a real node, properties are plain attributes
+    """
+
+    def __init__(self, layout, name, data):
+        self.id_data = layout
+        self.name = name
+        self.node_id = name
+        self.bl_idname = data['bl_idname']
+        self.mode = data.get('mode')
+        self.text_file = data.get('text_file', '')
+        self.location = data.get('location', (0.0, 0.0))
+        for prop, value in data.get('properties', {}).items():
+            setattr(self, prop, value)
+        self.inputs = [OfflineSocket(self, idx, s) for idx, s in enumerate(data.get('inputs', []))]
+        self.outputs = [OfflineSocket(self, idx, s, output=True)
+                        for idx, s in enumerate(data.get('outputs', []))]
+
+    def compile(self):
+        func = lookup_func(self.bl_idname, self.mode, self.text_file)
+        if self.bl_idname in _node_classes:
+            return func(self)
+        return func
+
+
+def lookup_func(bl_idname, mode=None, text_file=''):
+    """
+    find the node function, or the class for stateful nodes
+    """
+    if bl_idname in _node_classes:
+        return NodeStateful.get_cls(bl_idname)
+    elif bl_idname in _multi_storage:
+        func_dict, _ = _multi_storage[bl_idname]
+        return func_dict[mode]
+    elif bl_idname == "SvRxNodeScript":
+        return _node_scripts.get(text_remap(text_file))
+    else:
+        return NodeBase.get_func(bl_idname)
+
+
+def property_default(prop):
+    """default value of a bpy property definition"""
+    keywords = getattr(prop, 'keywords', None)
+    if keywords is None:
+        keywords = prop[1]
+    return json_value(keywords.get('default'))
+
+
+class LayoutBuilder:
+    """
+    Create json layouts from code, using the registered node functions
+    for socket and property defaults
+
+        builder = LayoutBuilder("Bench")
+        plane = builder.add("SvRxNodeGenPlane", mode="Grid", X=100, Y=100)
+        out = builder.add("SvRxNodeRxMeshOut")
+        builder.link(plane, 0, out, 0)
+        layout = builder.layout
+    """
+
+    def __init__(self, name="Layout"):
+        self.layout = {'version': LAYOUT_VERSION, 'name': name, 'nodes': {}, 'links': []}
+
+    def add(self, bl_idname, mode=None, name=None, properties=None, **defaults):
+        """
+        add node, defaults are socket default values by socket name,
+        returns the node name
+        """
+        func = lookup_func(bl_idname, mode)
+        if name is None:
+            name = "{}.{:03d}".format(mode or func.label, len(self.layout['nodes']))
+
+        inputs = []
+        for socket_type, socket_name, settings in func.inputs_template:
+            socket = {'name': socket_name, 'bl_idname': socket_type}
+            settings = settings or {}
+            if 'default_value' in settings:
+                socket['default_value'] = json_value(settings['default_value'])
+            if settings.get('required'):
+                socket['required'] = True
+            if socket_name in defaults:
+                socket['default_value'] = json_value(defaults.pop(socket_name))
+            inputs.append(socket)
+        if defaults:
+            raise KeyError("No sockets {} on {}".format(list(defaults), bl_idname))
+
+        props = {prop_name: property_default(prop) for prop_name, prop in func.properties.items()}
+        props.update(properties or {})
+
+        node = {
+            'bl_idname': bl_idname,
+            'location': [0.0, 0.0],
+            'properties': props,
+            'inputs': inputs,
+            'outputs': [{'name': n, 'bl_idname': b} for b, n in func.outputs_template]
+        }
+        if mode is not None:
+            node['mode'] = mode
+        self.layout['nodes'][name] = node
+        return name
+
+    def link(self, from_name, from_index, to_name, to_index):
+        self.layout['links'].append([from_name, from_index, to_name, to_index])
+
+
+class Plan:
+    """
+    Execution plan for a json layout
+    """
+
+    def __init__(self, layout, run_sinks=False, compact=False):
+        self.name = layout.get('name', "Layout")
+        self.run_sinks = run_sinks
+        self.compact = compact
+        self.nodes = {}
+        for name, data in layout['nodes'].items():
+            self.nodes[name] = OfflineNode(self, name, data)
+
+        links = []
+        for from_name, from_index, to_name, to_index in layout['links']:
+            from_socket = self.nodes[from_name].outputs[from_index]
+            to_socket = self.nodes[to_name].inputs[to_index]
+            links.append(VirtualLink(from_socket, to_socket))
+
+        self.funcs = {}
+        self.socket_links = {}
+        self.order = sort_links(links, self.funcs, self.socket_links)
+        self.data = {}
+        self.timings = {}
+        self.memory = {}
+
+    def get(self, socket):
+        if not socket.is_output:
+            socket = self.socket_links[socket]
+        return self.data[socket]
+
+    def is_sink(self, node):
+        return not any(socket.is_linked for socket in node.outputs)
+
+    def set_param(self, key, value):
+        """
+        set input socket default or property value, key is "node name:param"
+        where param is the socket name or the property name.
+        Linked inputs don't use their default so they can't be set
+        """
+        node_name, _, param = key.rpartition(":")
+        node = self.nodes[node_name]
+        for socket in node.inputs:
+            if socket.name == param:
+                if socket.is_linked:
+                    raise ValueError("Input {} on {} is linked".format(param, node_name))
+                socket.default_value = value
+                return
+        if hasattr(node, param):
+            setattr(node, param, value)
+        else:
+            raise KeyError("No input or property {} on {}".format(param, node_name))
+        # stateful nodes copy their properties when they are made
+        if isinstance(self.funcs.get(node), Stateful):
+            self.funcs[node] = node.compile()
+
+    def downstream(self, nodes):
+        """all nodes that depend on any node in nodes, including nodes"""
+        children = collections.defaultdict(set)
+        for to_socket, from_socket in self.socket_links.items():
+            children[from_socket.node].add(to_socket.node)
+        result = set()
+        stack = list(nodes)
+        while stack:
+            node = stack.pop()
+            if node not in result:
+                result.add(node)
+                stack.extend(children[node])
+        return result
+
+    def execute(self, cached=None, trace_memory=False):
+        """
+        run the plan, returns {node name: {socket name: SvDataTree}}
+        with the inputs of every sink node
+
+        cached, nodes that keep their outputs from the previous execute
+        trace_memory, record peak allocation per node in self.memory,
+        keyed by node as self.timings
+        """
+        with layout_scope(self.compact):
+            return self._execute(cached, trace_memory)
+
+    def _execute(self, cached, trace_memory):
+        cached = cached or set()
+        self.data = {s: t for s, t in self.data.items() if s.node in cached}
+        self.timings = {}
+        self.memory = {}
+        sinks = {}
+        for node in self.order:
+            func = self.funcs[node]
+            start = time.perf_counter()
+
+            inputs = None
+            if self.is_sink(node):
+                inputs = collect_inputs(func, node, get=self.get)
+                sinks[node.name] = {node.inputs[param].name: tree
+                                    for (param, _, _), tree in zip(func.parameters, inputs[0])
+                                    if isinstance(param, int)}
+                if isinstance(func, Stateful) and not self.run_sinks:
+                    continue
+
+            if node in cached:
+                continue
+
+            if trace_memory:
+                tracemalloc.start()
+            try:
+                self._run_node(node, func, inputs)
+                self.timings[node] = time.perf_counter() - start
+                if trace_memory:
+                    self.memory[node] = tracemalloc.get_traced_memory()[1]
+            finally:
+                if trace_memory:
+                    tracemalloc.stop()
+        return sinks
+
+    def _run_node(self, node, func, inputs=None):
+        """execute one node, inputs from collect_inputs if already collected"""
+        if inputs is None:
+            inputs = collect_inputs(func, node, get=self.get)
+        in_trees, in_levels = inputs
+
+        if isinstance(func, Stateful):
+            func.start()
+
+        out_trees = []
+        for socket in node.outputs:
+            if socket.is_linked:
+                tree = SvDataTree()
+                tree.name = node.name + ": " + socket.name
+                self.data[socket] = tree
+                out_trees.append(tree)
+            else:
+                out_trees.append(None)
+
+        out_levels = [l for _, l in func.returns]
+        recurse_levels(func, in_levels, out_levels, in_trees, out_trees)
+
+        for ot in out_trees:
+            if ot:
+                ot.set_level()
+
+        if isinstance(func, Stateful):
+            func.stop()
+
+    def analysis(self):
+        """critical path and parallelism from the timings of the last execute"""
+        return analyze(self.order, node_dependencies(self.socket_links), self.timings)
+
+
+def execute_layout(layout, run_sinks=False):
+    return Plan(layout, run_sinks=run_sinks).execute()
@@ -0,0 +1,124 @@
+# -*- coding: utf-8 -*-
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; either version 2
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+"""
+Json layout format
+
+{
+    "version": 1,
+    "name": "NodeTree",
+    "nodes": {
+        "Plane": {
+            "bl_idname": "SvRxNodeGenPlane",
+            "mode": "Plane",                # only for multi mode nodes
+            "location": [0.0, 0.0],
+            "properties": {"prop_name": value},
+            "inputs": [{"name": "X", "bl_idname": "SvRxSocketInt", "default_value": 10}],
+            "outputs": [{"name": "Vertices", "bl_idname": "SvRxSocketVertex"}]
+        },
+    },
+    "links": [["Plane", 0, "Viewer", 0]]   # from node, socket index, to node, socket index
+}
+
+Reroutes are removed when saving, the links go directly between real nodes.
+A layout can be executed without a node tree, see svrx.core.offline
+"""
+
+import json
+
+LAYOUT_VERSION = 1
+
+
+def json_value(value):
+    """convert blender property values into something json can store"""
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if isinstance(value, set):  # enum flag
+        return sorted(value)
+    if hasattr(value, "tolist"):  # numpy
+        return value.tolist()
+    if hasattr(value, "name"):  # blender ID
+        return value.name
+    if hasattr(value, "__len__"):  # bpy_prop_array, mathutils
+        return [json_value(v) for v in value]
+    return str(value)
+
+
+def layout_as_json(ng):
+    """
+    ng as a json layout, raises ValueError if ng has invalid links
+    since those would be left out
+    """
+    invalid = ["{}:{} -> {}:{}".format(l.from_node.name, l.from_socket.name,
+                                       l.to_node.name, l.to_socket.name)
+               for l in ng.links if not l.is_valid]
+    if invalid:
+        raise ValueError("Invalid links in {}: {}".format(ng.name, ", ".join(invalid)))
+
+    from svrx.core.execution import filter_reroute
+
+    nodes = {}
+    for node in ng.nodes:
+        if hasattr(node, "as_json"):
+            nodes[node.name] = node.as_json()
+
+    links = []
+    for link in filter_reroute(ng):
+        links.append([link.from_node.name, link.from_socket.index,
+                      link.to_node.name, link.to_socket.index])
+
+    return {
+        'version': LAYOUT_VERSION,
+        'name': ng.name,
+        'nodes': nodes,
+        'links': links
+    }
+
+
+def layout_from_json(ng, layout):
+    """
+    add the nodes and links from layout to ng, returns dict of
+    layout name: node since blender might rename nodes on collision
+    """
+    created = {}
+    for name, data in layout['nodes'].items():
+        node = ng.nodes.new(data['bl_idname'])
+        node.name = name
+        node.location = data.get('location', (0.0, 0.0))
+        node.from_json(data)
+        created[name] = node
+
+    for from_name, from_index, to_name, to_index in layout['links']:
+        from_socket = created[from_name].outputs[from_index]
+        to_socket = created[to_name].inputs[to_index]
+        ng.links.new(from_socket, to_socket)
+    return created
+
+
+def save_layout(ng, path):
+    with open(path, 'w') as layout_file:
+        json.dump(layout_as_json(ng), layout_file, indent=2, sort_keys=True)
+
+
+def load_layout(path):
+    with open(path) as layout_file:
+        layout = json.load(layout_file)
+    if layout.get('version', 0) > LAYOUT_VERSION:
+        raise ValueError("Unsupported layout version {}".format(layout['version']))
+    return layout
@@ -26,6 +26,7 @@ from bpy.props import (FloatProperty,
                        StringProperty)
 
 from .execution import data_trees
+from .serialize import json_value
 
 
 
@@ -126,6 +127,18 @@ class SocketBase:
                 if getattr(self, key) is not None:
                     setattr(self, key, value)
 
+    def as_json(self):
+        data = {'name': self.name, 'bl_idname': self.bl_idname}
+        if self.default_value is not None:
+            data['default_value'] = json_value(self.default_value)
+        if self.required:
+            data['required'] = True
+        return data
+
+    def from_json(self, data):
+        if 'default_value' in data and self.default_value is not None:
+            self.default_value = data['default_value']
+
 
 def replace_socket(socket, new_type=None, new_name=None, settings=None):
     '''
@@ -307,6 +320,13 @@ class MeshSocket(bpy.types.NodeSocket, SocketBase):
     color = (.1, .1, .1, 1.0)
 
 
+class InstancesSocket(bpy.types.NodeSocket, SocketBase):
+    bl_idname = "SvRxSocketInstances"
+    bl_label = "Instances Socket"
+
+    color = (.4, .1, .6, 1.0)
+
+
 class ObjectSocket(bpy.types.NodeSocket, SocketBase):
     bl_idname = 'SvRxSocketObject'
     bl_label = 'Blender Objects'
@@ -0,0 +1,159 @@
+# -*- coding: utf-8 -*-
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; either version 2
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+"""
+Parameter sweep, run a json layout for every combination in a grid
+
+    grid = {"Plane:Size": [1.0, 2.0, 4.0], "Torus:R": [1.0, 2.0]}
+    report = sweep(load_layout("layout.json"), grid, out_dir="/tmp/sweep", processes=4)
+
+Each variant writes the inputs of the sink nodes to out_dir/variant_NNNNN.npz
+and out_dir/sweep.json maps the files to parameter values.
+
+Every worker builds the plan once and executes the nodes that don't depend on
+the swept parameters once, later variants only run the nodes downstream.
+
+From the command line, with the add-on enabled:
+
+    blender -b --python-expr "import svrx.core.sweep as s; s.main()" -- layout.json grid.json -o out -j 4
+"""
+
+import argparse
+import itertools
+import json
+import multiprocessing
+import os
+import sys
+import time
+
+import numpy as np
+
+from svrx.core.offline import Plan
+from svrx.core.serialize import load_layout
+from svrx.util.smesh import SvPolygon
+
+
+_worker = {}
+
+
+def grid_variants(grid):
+    """list of [(key, value), ...] for each combination in grid"""
+    keys = sorted(grid.keys())
+    return [list(zip(keys, values)) for values in itertools.product(*(grid[k] for k in keys))]
+
+
+def leaf_arrays(prefix, data):
+    """yield (name, array) for data that can be stored in a npz file"""
+    if data is None:
+        return
+    if isinstance(data, SvPolygon):
+        yield prefix + ".loop_start", data.loop_start
+        yield prefix + ".loop_total", data.loop_total
+        yield prefix + ".vertex_indices", data.vertex_indices
+        return
+    array = np.asarray(data)
+    if array.dtype != object:
+        yield prefix, array
+
+
+def write_npz(path, sinks):
+    arrays = {}
+    for node_name, sockets in sinks.items():
+        for socket_name, tree in sockets.items():
+            for idx, data in enumerate(tree):
+                prefix = "{}.{}.{}".format(node_name, socket_name, idx)
+                arrays.update(leaf_arrays(prefix, data))
+    np.savez(path, **arrays)
+
+
+def _init_worker(layout, keys):
+    plan = Plan(layout)
+    swept = {plan.nodes[key.rpartition(":")[0]] for key in keys}
+    dirty = plan.downstream(swept)
+    plan.execute()
+    _worker['plan'] = plan
+    _worker['cached'] = set(plan.order) - dirty
+
+
+def _run_variant(job):
+    index, values, out_dir = job
+    plan = _worker['plan']
+    for key, value in values:
+        plan.set_param(key, value)
+    sinks = plan.execute(cached=_worker['cached'])
+    path = None
+    if out_dir:
+        path = os.path.join(out_dir, "variant_{:05d}.npz".format(index))
+        write_npz(path, sinks)
+    return index, path, sum(plan.timings.values())
+
+
+def sweep(layout, grid, out_dir=None, processes=None):
+    """
+    run layout for each combination of values in grid {"node:param": [values]}
+    processes, number of worker processes, 1 runs in this process
+    """
+    variants = grid_variants(grid)
+    keys = sorted(grid.keys())
+    if out_dir:
+        os.makedirs(out_dir, exist_ok=True)
+    jobs = [(idx, values, out_dir) for idx, values in enumerate(variants)]
+
+    start = time.perf_counter()
+    if processes == 1:
+        _init_worker(layout, keys)
+        results = [_run_variant(job) for job in jobs]
+    else:
+        with multiprocessing.Pool(processes, _init_worker, (layout, keys)) as pool:
+            results = pool.map(_run_variant, jobs, chunksize=max(1, len(jobs) // 64))
+    seconds = time.perf_counter() - start
+
+    report = {
+        'variants': len(variants),
+        'seconds': seconds,
+        'variants_per_second': len(variants) / seconds if seconds else 0.0,
+        'node_seconds': sum(r[2] for r in results),
+        'results': [{'file': path, 'params': dict(variants[idx])} for idx, path, _ in results]
+    }
+    if out_dir:
+        with open(os.path.join(out_dir, "sweep.json"), 'w') as report_file:
+            json.dump(report, report_file, indent=2)
+    return report
+
+
+def main(argv=None):
+    if argv is None:
+        argv = sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else sys.argv[1:]
+    parser = argparse.ArgumentParser(description="Run a svrx layout over a parameter grid")
+    parser.add_argument("layout", help="json layout file")
+    parser.add_argument("grid", help='json file {"node:param": [values]}')
+    parser.add_argument("-o", "--out", default=None, help="directory for .npz results")
+    parser.add_argument("-j", "--processes", type=int, default=None,
+                        help="worker processes, default cpu count")
+    args = parser.parse_args(argv)
+
+    with open(args.grid) as grid_file:
+        grid = json.load(grid_file)
+    report = sweep(load_layout(args.layout), grid, args.out, args.processes)
+    print("{variants} variants in {seconds:.3f}s, {variants_per_second:.1f} variants/s".format(**report))
+    return report
+
+
+if __name__ == "__main__":
+    main()
@@ -20,17 +20,27 @@
 import collections
 from itertools import chain
 import time
+import tracemalloc
 
 import io
 
 import bpy
 import bgl
+import blf
 
 from svrx.util import bgl_callback
+from svrx.core.analysis import node_dependencies, critical_path
 
 
 timings = []
 
+# peak bytes allocated by each node in the last run, if traced
+memory = {}
+
+# nodes in execution order, their dependencies and timing record
+# names, from the last timed run
+plan = {'order': [], 'deps': {}, 'keys': {}}
+
 def get_time():
     return time.perf_counter()
 
@@ -41,6 +51,40 @@ def add_time(name):
 def start_timing():
     if timings is not None:
         timings.clear()
+    memory.clear()
+
+def set_plan(dag_list, socket_links):
+    plan['order'] = list(dag_list)
+    plan['keys'] = {node: node.bl_idname + ": " + node.name for node in dag_list}
+    plan['deps'] = node_dependencies(socket_links)
+
+def start_memory():
+    tracemalloc.start()
+
+def stop_memory(name):
+    if tracemalloc.is_tracing():
+        memory[name] = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+def node_times():
+    """
+    seconds spent in each node of the last timed run, {node: seconds}.
+    Virtual nodes can share a record name, so the records are matched
+    to the nodes in execution order
+    """
+    times = {}
+    records = iter(timings)
+    for node in plan['order']:
+        key = plan['keys'][node]
+        ts = []
+        for name, t in records:
+            if name == key:
+                ts.append(t)
+                if len(ts) == 2:
+                    break
+        if len(ts) == 2:
+            times[node] = ts[1] - ts[0]
+    return times
 
 def time_func(func):
     def inner(*args):
@@ -57,6 +101,90 @@ def show_timings(ng):
     if ng.do_timings_graphics:
         show_timings_graphics(ng)
 
+    if ng.do_timings_heatmap:
+        show_heatmap(ng)
+
+
+def show_heatmap(ng):
+    bgl_callback.callback_disable("heatmap:" + ng.name)
+    times = node_times()
+    path, _ = critical_path(plan['order'], plan['deps'], times)
+    # drawn on the real nodes, found by name
+    times = {node.name: t for node, t in times.items() if node.bl_idname != "SvRxVirtualNode"}
+    path = {node.name for node in path}
+    draw_data = {
+        'tree_name': ng.name,
+        'custom_function': heatmap,
+        'args': (ng.name, ng.heatmap_mode, times, dict(memory), path)
+    }
+    bgl_callback.callback_enable("heatmap:" + ng.name, draw_data)
+
+
+def node_location(node):
+    """location of node in the tree, node.location is relative to its frame"""
+    x, y = node.location
+    parent = node.parent
+    while parent:
+        x += parent.location.x
+        y += parent.location.y
+        parent = parent.parent
+    return x, y
+
+
+def heatmap(x, y, args):
+    """
+    tint node headers from blue to red by their share of the largest
+    time or memory value, and outline the nodes on the critical path
+    """
+    ng_name, mode, times, mem, path = args
+    ng = bpy.data.node_groups.get(ng_name)
+    values = mem if mode == 'MEMORY' else times
+    if ng is None or not values:
+        return
+
+    top = max(values.values()) or 1.0
+    total = sum(values.values()) or 1.0
+    header = 20
+
+    bgl.glEnable(bgl.GL_BLEND)
+    blf.size(0, 12, 72)
+    for name, value in values.items():
+        node = ng.nodes.get(name)
+        if node is None:
+            continue
+        nx, ny = node_location(node)
+        width = node.width
+        share = value / top
+
+        bgl.glColor4f(share, 0.3 * (1 - share), 1 - share, 0.6)
+        draw_rect(nx, ny, width, header)
+        if name in path:
+            bgl.glLineWidth(3)
+            bgl.glColor4f(1.0, 0.8, 0.1, 1.0)
+            bgl.glBegin(bgl.GL_LINE_LOOP)
+            for co in ((nx, ny), (nx + width, ny), (nx + width, ny - header), (nx, ny - header)):
+                bgl.glVertex2f(*co)
+            bgl.glEnd()
+            bgl.glLineWidth(1)
+
+        text = "{:.2f} ms".format(times.get(name, 0.0) * 1000)
+        if name in mem:
+            text += "  {:.2f} MB".format(mem[name] / 2**20)
+        text += "  {:.0%}".format(value / total)
+        bgl.glColor4f(0.9, 0.9, 0.9, 1.0)
+        blf.position(0, nx, ny + 6, 0)
+        blf.draw(0, text)
+    bgl.glDisable(bgl.GL_BLEND)
+
+
+def draw_rect(x=0, y=0, w=30, h=10):
+    bgl.glBegin(bgl.GL_TRIANGLE_STRIP)
+    bgl.glVertex2f(x, y)
+    bgl.glVertex2f(x + w, y)
+    bgl.glVertex2f(x, y-h)
+    bgl.glVertex2f(w+x, y-h)
+    bgl.glEnd()
+
 
 def show_timings_graphics(ng):
     bgl_callback.callback_disable("timings:" + ng.name)
@@ -21,11 +21,15 @@ import time
 import cProfile
 import pstats
 import io
+import json
 
 import bpy
-from bpy.props import BoolProperty
+from bpy.props import BoolProperty, EnumProperty, FloatProperty
 
 from svrx.core.execution import exec_node_group, DAG
+from svrx.core.serialize import layout_as_json, layout_from_json
+from svrx.core import timings
+from svrx.core.analysis import analyze, report_text
 from svrx.util import bgl_callback
 
 
@@ -45,9 +49,18 @@ class SverchokReduxTree(bpy.types.NodeTree):
     def turn_graphics_off(self, context):
         bgl_callback.callback_disable("timings:" + self.name)
 
+    def turn_heatmap_off(self, context):
+        bgl_callback.callback_disable("heatmap:" + self.name)
+
     has_changed = BoolProperty(default=False)
     do_timings_text = BoolProperty(default=False)
     do_timings_graphics = BoolProperty(default=False, update=turn_graphics_off)
+    do_timings_heatmap = BoolProperty(default=False, update=turn_heatmap_off,
+                                      name="Heatmap",
+                                      description="Tint nodes by their cost in the last run")
+    heatmap_mode = EnumProperty(items=[('TIME', 'Time', 'Share of execution time', 0),
+                                       ('MEMORY', 'Memory', 'Share of peak allocated memory', 1)],
+                                default='TIME', name="Heatmap mode")
 
     rx_animate = BoolProperty(default=True,
                               name="Animate",
@@ -57,6 +70,26 @@ class SverchokReduxTree(bpy.types.NodeTree):
                                  name="Explict conversion",
                                  description="Create type conversion nodes")
 
+    rx_compact_vertices = BoolProperty(default=False,
+                                       name="Compact vertices",
+                                       description="Generators make (N, 3) float32 vertices "
+                                                   "instead of (N, 4) float64")
+
+    rx_check_contracts = BoolProperty(default=False,
+                                      name="Check data",
+                                      description="Verify that links and node outputs match the "
+                                                  "dtype and shape their socket types declare")
+
+    rx_memory_budget = FloatProperty(default=0, min=0,
+                                     name="Memory budget (MB)",
+                                     description="Refuse to execute if the estimated output "
+                                                 "of the generators is larger, 0 is unlimited")
+
+    rx_time_budget = FloatProperty(default=0, min=0,
+                                   name="Time budget (s)",
+                                   description="Refuse to execute if the estimated time "
+                                               "of the generators is longer, 0 is unlimited")
+
     def update(self):
         self.has_changed = True
 
@@ -71,6 +104,12 @@ class SverchokReduxTree(bpy.types.NodeTree):
     def update_list(self):
         return DAG(self)
 
+    def as_json(self):
+        return layout_as_json(self)
+
+    def from_json(self, layout):
+        return layout_from_json(self, layout)
+
     def profile_execute(self, pstat_file=None):
         pr = cProfile.Profile()
         pr.enable()
@@ -94,3 +133,28 @@ class SverchokReduxTree(bpy.types.NodeTree):
         else:
             text = bpy.data.texts.new(text_name)
         text.from_string(s.getvalue())
+
+    def analyze_execution(self, as_json=False):
+        """
+        execute with timings and write the critical path and parallelism
+        analysis, see svrx.core.analysis, to a text block
+        """
+        do_timings_text = self.do_timings_text
+        self.do_timings_text = True
+        try:
+            exec_node_group(self)
+        finally:
+            self.do_timings_text = do_timings_text
+        plan = timings.plan
+        result = analyze(plan['order'], plan['deps'], timings.node_times())
+
+        text_name = self.name + " Analysis"
+        if text_name in bpy.data.texts:
+            text = bpy.data.texts[text_name]
+        else:
+            text = bpy.data.texts.new(text_name)
+        if as_json:
+            text.from_string(json.dumps(result, indent=2, sort_keys=True))
+        else:
+            text.from_string(report_text(result))
+        return result
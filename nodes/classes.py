@@ -7,6 +7,7 @@ from bpy.props import EnumProperty, StringProperty, BoolProperty
 import importlib
 from svrx.util.importers import get_sn_template_path, text_remap
 from svrx.ui import error
+from svrx.core.serialize import json_value
 
 _node_funcs = {}
 
@@ -74,11 +75,38 @@ class NodeBase:
             for bl_id, name in outputs_template[diff:]:
                 self.outputs.new(bl_id, name)
 
-    def as_json(self):
-        pass
+    def property_names(self):
+        func = self.compile()
+        if func is None:
+            return []
+        return list(func.properties.keys())
 
-    def from_json(self, json):
-        pass
+    def as_json(self):
+        """
+        Serialize node settings, see svrx.core.serialize for the format
+        """
+        data = {
+            'bl_idname': self.bl_idname,
+            'location': self.location[:],
+            'properties': {name: json_value(getattr(self, name)) for name in self.property_names()},
+            'inputs': [socket.as_json() for socket in self.inputs],
+            'outputs': [socket.as_json() for socket in self.outputs],
+        }
+        if hasattr(self, 'mode'):
+            data['mode'] = self.mode
+        return data
+
+    def from_json(self, data):
+        if 'mode' in data and hasattr(self, 'mode'):
+            self.mode = data['mode']
+        for name, value in data.get('properties', {}).items():
+            if hasattr(self, name):
+                setattr(self, name, value)
+        self.adjust_sockets()
+        for socket, socket_data in zip(self.inputs, data.get('inputs', [])):
+            socket.from_json(socket_data)
+        for socket, socket_data in zip(self.outputs, data.get('outputs', [])):
+            socket.from_json(socket_data)
 
 
 class MultiInputNode(NodeBase):
@@ -143,6 +171,9 @@ class NodeStateful(NodeBase):
         for name in props.keys():
             layout.prop(self, name)
 
+    def property_names(self):
+        return list(self.get_cls(self.bl_idname).properties.keys())
+
     def adjust_sockets(self):
         func = self.get_cls(self.bl_idname)
         if func is None:
@@ -336,6 +367,15 @@ class NodeScript(NodeBase):
     def add(func):
         _node_scripts[func.module] = func
 
+    def as_json(self):
+        data = super().as_json()
+        data['text_file'] = self.text_file
+        return data
+
+    def from_json(self, data):
+        self.text_file = data.get('text_file', '')
+        super().from_json(data)
+
 
     def reset(self):
         self.text_file = ''
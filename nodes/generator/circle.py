@@ -2,15 +2,19 @@
 from svrx.nodes.node_base import node_func
 from svrx.typing import Int, Float, Vertices, Edges, Faces
 
-from svrx.util.geom import circle
+import numpy as np
+
+from svrx.util.geom import circle_batch
 from svrx.util.function import generator
+from svrx.util.smesh import mesh_nbytes
 
 
-@node_func(bl_idname="SvRxNodeCircle", label="Circle")
-@generator
+@node_func(bl_idname="SvRxNodeCircle", label="Circle",
+           out_bytes=lambda n, radius: mesh_nbytes(n, n, 1, n))
+@generator(batched=True)
 def circle_(nr_verts: Int = 24,
             radius: Float = 1.0
             ) -> ([Vertices],
                   [Edges],
                   [Faces]):
-    return circle(radius, 0, nr_verts)
+    return circle_batch(radius, np.zeros(len(radius)), nr_verts)
@@ -3,12 +3,32 @@ from svrx.typing import Float, Int, Vertices, Edges, Faces, BoolP
 
 import numpy as np
 from svrx.util.function import generator
-from svrx.util.smesh import SvPolygon
+from svrx.util.smesh import SvPolygon, mesh_nbytes
 from svrx.util.topology import cylinder_edges, cylinder_faces
 from svrx.util.function import array_as
+from svrx.util.vertices import new_vertices
 
 
-@node_func(bl_idname="SvRxNodeGenCylinder", multi_label="Cylinder", id=0)
+def cylinder_verts(z, scale, verts):
+    """rings at height z (rings,) scaled by scale (rings,) with verts each"""
+    t = np.linspace(0, np.pi * 2 * (verts - 1 / verts), verts)
+    cylinder = new_vertices((len(z), verts))
+    cylinder[:, :, 0] = np.cos(t) * scale[:, np.newaxis]
+    cylinder[:, :, 1] = np.sin(t) * scale[:, np.newaxis]
+    cylinder[:, :, 2] = z[:, np.newaxis]
+    cylinder.shape = (-1, cylinder.shape[-1])
+    return cylinder
+
+
+def cylinder_nbytes(*args):
+    verts, rings, caps = args[-3:]
+    faces = (rings - 1) * verts
+    return mesh_nbytes(rings * verts, 2 * rings * verts - verts,
+                       faces + 2 * caps, 4 * faces + 2 * verts * caps)
+
+
+@node_func(bl_idname="SvRxNodeGenCylinder", multi_label="Cylinder", id=0,
+           out_bytes=cylinder_nbytes)
 @generator
 def cylinder(r_top: Float = 1.0,
              r_bot: Float = 1.0,
@@ -16,35 +36,23 @@ def cylinder(r_top: Float = 1.0,
              verts: Int =20,
              rings: Int = 10,
              caps: BoolP = False) -> ([Vertices], [Edges], [Faces]):
-    z = np.zeros((rings, 4))
-    z[:, 2] = np.linspace(0, h, rings)
+    z = np.linspace(0, h, rings)
     scale = np.linspace(r_bot, r_top, rings)
-    t = np.linspace(0, np.pi * 2 * (verts - 1 / verts), verts)
-    circle = np.array([np.cos(t), np.sin(t), np.zeros(verts), np.ones(verts)]).T
-    cylinder = np.empty((rings, verts, 4))
-    cylinder[:] = z[:, np.newaxis, :] + circle
-    cylinder[:, :, :2] *= scale[:, np.newaxis, np.newaxis]
-    cylinder.shape = (-1, 4)
+    cylinder = cylinder_verts(z, scale, verts)
     return cylinder, cylinder_edges(rings, verts), cylinder_faces(rings, verts, caps)
 
 
-@node_func(id=1, label="Scale control")
+@node_func(id=1, label="Scale control", out_bytes=cylinder_nbytes)
 @generator
 def cylinder(xy_scale: Float(iterable=False) = 1.0,
              z_scale: Float(iterable=False) = 1.0,
              verts: Int = 20,
              rings: Int = 10,
              caps: BoolP = False) -> ([Vertices], [Edges], [Faces]):
-    z = np.zeros((rings, 4))
     if len(z_scale) == 1:
-        z[:, 2] = np.linspace(0, z_scale[0] * rings, rings)
+        z = np.linspace(0, z_scale[0] * rings, rings)
     else:
-        z[:, 2] = array_as(z_scale, (rings,))
+        z = array_as(z_scale, (rings,))
     xy_scale = array_as(xy_scale, (rings,))
-    t = np.linspace(0, np.pi * 2 * (verts - 1 / verts), verts)
-    circle = np.array([np.cos(t), np.sin(t), np.zeros(verts), np.ones(verts)]).T
-    cylinder = np.empty((rings, verts, 4))
-    cylinder[:] = z[:, np.newaxis, :] + circle
-    cylinder[:, :, :2] *= xy_scale[:, np.newaxis, np.newaxis]
-    cylinder.shape = (-1, 4)
+    cylinder = cylinder_verts(z, xy_scale, verts)
     return cylinder, cylinder_edges(rings, verts), cylinder_faces(rings, verts, caps)
@@ -4,21 +4,26 @@ from svrx.typing import Float, Int, Vertices, Edges, Faces
 import numpy as np
 from svrx.util.function import generator
 from svrx.util.topology import plane_edges, plane_faces
+from svrx.util.smesh import mesh_nbytes
+from svrx.util.vertices import new_vertices
 
 def plane_verts(t_x, t_y):
     """
     make plane from grid in x coord and y coord
     """
-    verts = np.empty((t_y.size, t_x.size, 4))
-    x_l, y_l = np.meshgrid(t_x, t_y)
-    verts[:,:,0] = x_l
-    verts[:,:,1] = y_l
+    verts = new_vertices((t_y.size, t_x.size))
+    verts[:,:,0] = t_x
+    verts[:,:,1] = t_y[:, np.newaxis]
     verts[:,:,2] = 0
-    verts[:,:,3] = 1
-    verts.shape = (-1, 4)
+    verts.shape = (-1, verts.shape[-1])
     return verts
 
-@node_func(bl_idname="SvRxNodeGenPlane", multi_label="Plane", id=0)
+
+def plane_nbytes(x, y, *args):
+    faces = (x - 1) * (y - 1)
+    return mesh_nbytes(x * y, x * (y - 1) + (x - 1) * y, faces, faces * 4)
+
+@node_func(bl_idname="SvRxNodeGenPlane", multi_label="Plane", id=0, out_bytes=plane_nbytes)
 @generator
 def grid(x: Int = 10,
          y: Int = 10,
@@ -28,7 +33,7 @@ def grid(x: Int = 10,
     return plane_verts(t_x, t_y), plane_edges(x, y), plane_faces(y, x)
 
 
-@node_func(bl_idname="SvRxNodeGenPlane", multi_label="Plane", id=1)
+@node_func(bl_idname="SvRxNodeGenPlane", multi_label="Plane", id=1, out_bytes=plane_nbytes)
 @generator
 def plane(x: Int = 10,
           y: Int = 10,
@@ -3,6 +3,7 @@ import numpy as np
 from svrx.typing import Vertices, Edges, Faces, Required
 from svrx.nodes.node_base import node_func
 from svrx.util.smesh import SvPolygon
+from svrx.util.polygon import face_edges
 from svrx.util.topology import (plane_edges, plane_faces,
                                 cylinder_edges, cylinder_faces,
                                 torus_edges, torus_faces)
@@ -11,7 +12,7 @@ from svrx.util.topology import (plane_edges, plane_faces,
 @node_func(bl_idname="SvRxNodeGeneratorTopology", multi_label="Topology", id=0)
 def line(verts: Vertices = Required) -> (Vertices, Edges, Faces):
     count = len(verts)
-    edges = np.array([np.arange(0, count - 1), np.arange(1, count)]).T
+    edges = np.array([np.arange(0, count - 1), np.arange(1, count)], dtype=np.uint32).T
     return verts, edges, None
 
 
@@ -20,8 +21,8 @@ def cirle(verts: Vertices = Required) -> (Vertices, Edges, Faces):
     count = len(verts)
     edges = np.array([np.arange(0, count), np.arange(1, count + 1) % count], dtype=np.uint32).T
     faces = SvPolygon(np.array([0], dtype=np.uint32),
-                      np.array([verts], dtype=np.uint32),
-                      np.arange(0, verts, dtype=np.uint32))
+                      np.array([count], dtype=np.uint32),
+                      np.arange(0, count, dtype=np.uint32))
     return verts, edges, faces
 
 
@@ -52,7 +53,7 @@ def line_connect(verts: [Vertices] = Required) -> (Vertices, Edges, Faces):
     obj_count = len(verts)
     e_start = np.arange(0, obj_count * count - count)
     e_stop = np.arange(count, obj_count * count)
-    edges = np.array((e_start, e_stop)).T
+    edges = np.array((e_start, e_stop), dtype=np.uint32).T
     return vertices, edges, None
 
 
@@ -64,3 +65,9 @@ def torus(verts: [Vertices] = Required) -> (Vertices, Edges, Faces):
     edges = torus_edges(height, vert_count)
     faces = torus_faces(height, vert_count)
     return vertices, edges, faces
+
+
+@node_func(id=6)
+def edges_from_faces(verts: Vertices = Required, faces: Faces = Required) -> (Vertices, Edges, Faces):
+    edges, _ = face_edges(faces)
+    return verts, edges, faces
@@ -2,12 +2,13 @@
 from svrx.typing import Vertices, Edges, Object, Faces
 from svrx.nodes.node_base import node_func
 from svrx.util.smesh import SMesh
+from svrx.util.vertices import compact_mode
 
 
 @node_func(bl_idname="SvRxNodeInObject")
 def object_in(obj: Object = None) -> (Vertices, Edges, Faces):
     if obj and obj.type == 'MESH':
-        sm = SMesh.from_mesh(obj.data)
+        sm = SMesh.from_mesh(obj.data, compact=compact_mode())
         return sm.as_pydata()
     else:
         return None, None, None
@@ -9,6 +9,7 @@ from svrx.nodes.node_base import node_func
 from svrx.nodes.classes import MultiInputNode
 
 from svrx.util.function import make_compatible
+from svrx.util.vertices import match_layout, vertices_like
 
 
 @node_func(bl_idname="SvRxNodeListJoin")
@@ -34,10 +35,11 @@ def merge(a: Vertices = None,
         return b
     if b is None:
         return a
+    b = match_layout(a, b)
     if mix:
         a, b = make_compatible(a, b, broadcast=False)
         new_l = len(a) + len(b)
-        out = np.empty((new_l, 4))
+        out = vertices_like(a, new_l)
         out[::2] = a
         out[1::2] = b
         return out
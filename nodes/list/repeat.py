@@ -5,13 +5,18 @@ from svrx.typing import Number, Int
 from svrx.util.function import generator
 
 
-@node_func(bl_idname='SvRxNodeListRepeat', multi_label="Repeat", id=0, cls_bases=(NodeMathBase,))
+def repeat_nbytes(values, repeat):
+    return np.size(values) * repeat * np.asarray(values).itemsize
+
+
+@node_func(bl_idname='SvRxNodeListRepeat', multi_label="Repeat", id=0, cls_bases=(NodeMathBase,),
+           out_bytes=repeat_nbytes)
 @generator
 def np_repeat(Values: Number(iterable=False) = 0.0, Repeat: Int = 2) -> [Number]:
     return np.repeat(Values, Repeat)
 
 
-@node_func(id=1)
+@node_func(id=1, out_bytes=repeat_nbytes)
 @generator
 def np_tile(Values: Number(iterable=False) = 0.0, Repeat: Int = 2) -> [Number]:
     return np.tile(Values, Repeat)
@@ -10,7 +10,7 @@ from svrx.typing import Vector, Float, Matrix
 
 
 @node_func(bl_idname="SvRxNodeCreateMatrix")
-@generator
+@generator(batched=True)
 def create_matrix(location: Vector = (0.0, 0.0, 0.0, 1.0),
                   scale: Vector = (1.0, 1.0, 1.0, 0.0),
                   rotation: Vector = (0.0, 0.0, 1.0, 0.0),
@@ -18,12 +18,13 @@ def create_matrix(location: Vector = (0.0, 0.0, 0.0, 1.0),
                   ) -> [Matrix]:
 
     #t = translation_matrix(location)
-    s = np.identity(4)
+    s = np.zeros((len(angle), 4, 4))
     for i in range(3):
-        s[i,i] = scale[i]
-        s[i, 3] = location[i]
-    r = rotation_matrix(math.radians(angle), rotation)
-    return s.dot(r)
+        s[:, i, i] = scale[:, i]
+        s[:, i, 3] = location[:, i]
+    s[:, 3, 3] = 1
+    r = rotation_matrices(np.radians(angle), rotation)
+    return np.matmul(s, r)
 
 
 def rotation_matrix(theta, axis):
@@ -43,3 +44,20 @@ def rotation_matrix(theta, axis):
                      [2*(bc-ad), aa+cc-bb-dd, 2*(cd+ab), 0],
                      [2*(bd+ac), 2*(cd-ab), aa+dd-bb-cc, 0],
                      [0,         0,         0,           1]])
+
+
+def rotation_matrices(theta, axis):
+    """
+    rotation_matrix for arrays of theta (n,) and axis (n, 3+)
+    """
+    axis = axis[:, :3] / np.sqrt((axis[:, :3] ** 2).sum(axis=1))[:, np.newaxis]
+    a = np.cos(theta / 2.0)
+    b, c, d = (-axis * np.sin(theta / 2.0)[:, np.newaxis]).T
+    aa, bb, cc, dd = a*a, b*b, c*c, d*d
+    bc, ad, ac, ab, bd, cd = b*c, a*d, a*c, a*b, b*d, c*d
+    r = np.zeros((len(theta), 4, 4))
+    r[:, 0, 0], r[:, 0, 1], r[:, 0, 2] = aa+bb-cc-dd, 2*(bc+ad), 2*(bd-ac)
+    r[:, 1, 0], r[:, 1, 1], r[:, 1, 2] = 2*(bc-ad), aa+cc-bb-dd, 2*(cd+ab)
+    r[:, 2, 0], r[:, 2, 1], r[:, 2, 2] = 2*(bd+ac), 2*(cd-ab), aa+dd-bb-cc
+    r[:, 3, 3] = 1
+    return r
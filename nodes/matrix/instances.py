@@ -0,0 +1,21 @@
+from svrx.typing import Vertices, Edges, Faces, Matrix, Instances, Required
+from svrx.nodes.node_base import node_func
+from svrx.util.instances import SvInstances
+
+
+@node_func(bl_idname="SvRxNodeInstances", multi_label="Instances", id=0)
+def instances(verts: Vertices = Required,
+              edges: Edges = None,
+              faces: Faces = None,
+              matrices: [Matrix] = Required) -> Instances:
+    return SvInstances(verts, edges, faces, matrices)
+
+
+@node_func(id=1)
+def transform(instances: Instances = Required, matrix: Matrix = Matrix.identity) -> Instances:
+    return instances.transform(matrix)
+
+
+@node_func(id=2)
+def realize(instances: Instances = Required) -> (Vertices, Edges, Faces):
+    return instances.realize()
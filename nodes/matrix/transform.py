@@ -3,6 +3,8 @@ from svrx.nodes.node_base import node_func
 
 import numpy as np
 
+from svrx.util.vertices import transform as transform_vertices
+
 
 @node_func(bl_idname="SvRxNodeMatrixTransform")
 def transform(vertices: Vertices = Required,
@@ -11,4 +13,4 @@ def transform(vertices: Vertices = Required,
     if matrix is None:
         return vertices
     else:
-        return vertices.dot(matrix.T)
+        return transform_vertices(vertices, matrix)
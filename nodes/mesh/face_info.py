@@ -0,0 +1,29 @@
+import numpy as np
+
+from svrx.typing import Float, Vertices, Vector, Faces, Required
+from svrx.nodes.node_base import node_func
+from svrx.util.polygon import face_info as poly_face_info, face_normals
+
+
+def _homogeneous(co, w=1.0):
+    """(N, 4) from (N, 3), w = 1 for points and w = 0 for directions"""
+    out = np.empty((len(co), 4))
+    out[:, :3] = co
+    out[:, 3] = w
+    return out
+
+
+@node_func(bl_idname="SvRxNodeFaceInfo", multi_label="Face info", id=0)
+def face_info(verts: Vertices = Required,
+              faces: Faces = Required
+              ) -> (Float("Area"),
+                    Vertices("Center"),
+                    Vector("Normal"),
+                    Float("Perimeter")):
+    areas, centers, normals, perimeters = poly_face_info(verts, faces)
+    return areas, _homogeneous(centers), _homogeneous(normals, 0.0), perimeters
+
+
+@node_func(id=1)
+def normals(verts: Vertices = Required, faces: Faces = Required) -> Vector("Normal"):
+    return _homogeneous(face_normals(verts, faces), 0.0)
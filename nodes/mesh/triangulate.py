@@ -0,0 +1,17 @@
+import numpy as np
+
+from svrx.typing import Vertices, Faces, Int, Required
+from svrx.nodes.node_base import node_func
+from svrx.util.smesh import SvPolygon
+
+
+@node_func(bl_idname="SvRxNodeTriangulate", label="Triangulate")
+def triangulate(verts: Vertices = Required,
+                faces: Faces = Required
+                ) -> (Vertices, Faces, Int("Face index")):
+    tris, tri_face = faces.triangulate(verts)
+    count = len(tris)
+    tri_faces = SvPolygon(np.arange(0, 3 * count, 3, dtype=np.uint32),
+                          np.full(count, 3, dtype=np.uint32),
+                          tris.ravel())
+    return verts, tri_faces, tri_face
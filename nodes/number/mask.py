@@ -3,16 +3,9 @@ import numpy as np
 
 from svrx.typing import Bool, Number, Required
 from svrx.nodes.node_base import node_func
+from svrx.util.function import array_as_cycle
 
 
-def array_as_cycle(a, shape):
-    if a.shape == shape:
-        return a
-    new_a = np.empty(shape, dtype=a.dtype)
-    for i in range(shape[0]):
-        new_a[i] = a[i % len(a)]
-    return new_a
-
 @node_func(bl_idname="SvRxNodeMask")
 def mask(mask: Bool = True, data: Number = Required
          ) -> (
@@ -4,17 +4,14 @@ from collections import namedtuple
 import bgl
 import blf
 
-import bpy
-import bmesh
-import time
-
-from mathutils import Matrix as bMatrix
-from mathutils import Vector as bVector
+import numpy as np
 
 from svrx.nodes.node_base import stateful
 from svrx.nodes.classes import NodeID, NodeStateful
 from svrx.util import bgl_callback_3dview as bgl_callback
-from svrx.typing import Required, BoolP, ColorAP, BMesh, Matrix
+from svrx.typing import Required, BoolP, IntP, EnumP, ColorAP, BMesh, Matrix, Int
+from svrx.util.draw_buffers import subsample, project_points, label_anchors, SUBSAMPLE_MODES
+from svrx.util.mesh import rxdata_from_bm
 
 
 # pylint: disable=C0326
@@ -22,14 +19,8 @@ from svrx.typing import Required, BoolP, ColorAP, BMesh, Matrix
 
 point_dict = {}
 
-
-def NOT_IMPLEMENTED_YET_identity_epsilon(matrix):
-    #  reduces all values below threshold (+ or -) to 0.0, to avoid meaningless
-    #  wandering floats.
-    # coord_strip = lambda c: 0.0 if (-1.6e-5 <= c <= 1.6e-5) else c
-    # san = lambda v: Vector((coord_strip(c) for c in v[:]))
-    # return Matrix([san(v) for v in matrix]) == Matrix()
-    return False
+# node_id: {'verts': (drawn, on screen), ...} from the last redraw
+label_counts = {}
 
 
 def adjust_list(in_list, x, y):
@@ -86,53 +77,49 @@ def draw_index_viz(context, args):
     region = context.region
     region3d = context.space_data.region_3d
 
-    # vars for projection
-    perspective_matrix = region3d.perspective_matrix.copy()
-
     font_id = 0
     text_height = 13
     blf.size(font_id, text_height, 72)  # should check prefs.dpi
 
-    region_mid_width = region.width / 2.0
-    region_mid_height = region.height / 2.0
-
-    def draw_index(rgb, rgb2, index, vec):
-
-        vec_4d = perspective_matrix * vec.to_4d()
-        if vec_4d.w <= 0.0:
-            return
-
-        x = region_mid_width + region_mid_width * (vec_4d.x / vec_4d.w)
-        y = region_mid_height + region_mid_height * (vec_4d.y / vec_4d.w)
-        index = str(index)
-
-        ''' draw polygon if requested'''
-        if fx.draw_bg:
-            polyline = get_points(index)
-
-            bgl.glColor4f(*rgb2)
-            bgl.glBegin(bgl.GL_POLYGON)
-            for pointx, pointy in polyline:
-                bgl.glVertex2f(pointx+x, pointy+y)
-            bgl.glEnd()
-
-        ''' draw text '''
-        txt_width, txt_height = blf.dimensions(0, index)
-        bgl.glColor4f(*rgb)
-        blf.position(0, x - (txt_width / 2), y - (txt_height / 2), 0)
-        blf.draw(0, index)
-
-    for instructions in args.data.vert_indices:
-        for instruct in instructions:
-            draw_index(fx.vert_idx_color, fx.vert_bg_color, *instruct)
-
-    for instructions in args.data.edge_indices:
-        for instruct in instructions:
-            draw_index(fx.edge_idx_color, fx.edge_bg_color, *instruct)
+    colors = {
+        'verts': (fx.vert_idx_color, fx.vert_bg_color),
+        'edges': (fx.edge_idx_color, fx.edge_bg_color),
+        'faces': (fx.face_idx_color, fx.face_bg_color),
+    }
 
-    for instructions in args.data.face_indices:
-        for instruct in instructions:
-            draw_index(fx.face_idx_color, fx.face_bg_color, *instruct)
+    perspective = np.array(region3d.perspective_matrix)
+
+    counts = {}
+    for kind, indices, anchors in args.data.labels:
+        rgb, rgb2 = colors[kind]
+        # one projection for all labels, only the visible ones reach blf,
+        # culled before subsampling so max labels is spent on screen
+        pixels, visible = project_points(anchors, perspective,
+                                         region.width, region.height, margin=20)
+        keep = subsample(len(visible), fx.max_labels, fx.subsample_mode, fx.seed)
+        counts[kind] = len(visible), len(visible)
+        if keep is not None:
+            counts[kind] = len(keep), len(visible)
+            pixels, visible = pixels[keep], visible[keep]
+        for (x, y), index in zip(pixels.tolist(), indices[visible].tolist()):
+            index = str(index)
+
+            ''' draw polygon if requested'''
+            if fx.draw_bg:
+                polyline = get_points(index)
+
+                bgl.glColor4f(*rgb2)
+                bgl.glBegin(bgl.GL_POLYGON)
+                for pointx, pointy in polyline:
+                    bgl.glVertex2f(pointx+x, pointy+y)
+                bgl.glEnd()
+
+            ''' draw text '''
+            txt_width, txt_height = blf.dimensions(0, index)
+            bgl.glColor4f(*rgb)
+            blf.position(0, x - (txt_width / 2), y - (txt_height / 2), 0)
+            blf.draw(0, index)
+    label_counts[args.n_id] = counts
 
 
 
@@ -168,9 +155,24 @@ class NodeIndexView(NodeID, NodeStateful):
         if self.draw_bg:
             row.prop(self, "face_bg_color", text="")
 
+        col = column_all.column(align=True)
+        col.prop(self, "max_labels")
+        row = col.row(align=True)
+        row.prop(self, "subsample_mode", text="")
+        if self.subsample_mode == 'RANDOM':
+            row.prop(self, "seed")
+
+        counts = label_counts.get(self.node_id)
+        if counts:
+            for kind in ('verts', 'edges', 'faces'):
+                drawn, total = counts[kind]
+                if drawn < total:
+                    column_all.label("{}: {} of {} on screen drawn".format(
+                        kind.title(), drawn, total))
 
     def free(self):
         bgl_callback.callback_disable(self.node_id)
+        label_counts.pop(self.node_id, None)
 
 
 
@@ -192,7 +194,11 @@ class SvRxIndexView():
         "face_bg_color": ColorAP(default=(.2, .2, .2, 1.)),
         "display_vert_index": BoolP(name='show_verts', default=True),
         "display_edge_index": BoolP(name='show_edges', default=True),
-        "display_face_index": BoolP(name='show_faces', default=True)
+        "display_face_index": BoolP(name='show_faces', default=True),
+        "max_labels": IntP(name="Max labels", default=1000, min=0,
+                           description="Draw at most this many labels of each kind, 0 draws all"),
+        "subsample_mode": EnumP(name="Subsample", items=SUBSAMPLE_MODES, default='STRIDE'),
+        "seed": IntP(name="Seed", default=0, min=0),
     }
 
     def __init__(self, node=None):
@@ -200,10 +206,13 @@ class SvRxIndexView():
             self.node = node
             self.activate = node.activate
             self.n_id = node.node_id
+            # an unlinked Mask still gives its default, which isn't a mask
+            self.use_mask = any(s.is_linked for s in node.inputs if s.name == 'Mask')
 
     def start(self):
         self.bms = []
         self.mats = []
+        self.masks = []
 
 
     @property
@@ -213,7 +222,7 @@ class SvRxIndexView():
         fx = namedtuple('fx', params)
         for param_name in params:
             param_value = getattr(self.node, param_name)
-            if not isinstance(param_value, (bool, )):
+            if not isinstance(param_value, (bool, int, float, str)):
                 param_value = getattr(self.node, param_name)[:]
             setattr(fx, param_name, param_value)
         return fx
@@ -221,64 +230,42 @@ class SvRxIndexView():
 
     @property
     def get_data(self):
-        vert_indices = []
-        face_indices = []
-        edge_indices = []
-        vert_indices_add = vert_indices.append
-        face_indices_add = face_indices.append
-        edge_indices_add = edge_indices.append
-
-        for obj_index, (bm, matrix) in enumerate(zip(self.bms, self.mats)):
-
-            # yes ultra lazy, but think of it like this.. we never use idx viewer to see tonnes of indices
-            # we should offer an index mask
-
-            if not matrix is None and not NOT_IMPLEMENTED_YET_identity_epsilon(matrix):
-                bmat = bMatrix(matrix)
-                bm2 = bm.copy()
-                bmesh.ops.transform(bm2, verts=bm2.verts, matrix=bmat)
-                final_verts = bm2.verts
-                final_edges = bm2.edges
-                final_faces = bm2.faces
-                final_verts.ensure_lookup_table()
+        """
+        label indices and (K, 4) anchor positions per kind, vertices,
+        edge midpoints and face centers, limited by mask. max labels is
+        applied when drawing, to the labels on screen
+        """
+        node = self.node
+        found = {'verts': [], 'edges': [], 'faces': []}
+
+        for bm, matrix, mask in zip(self.bms, self.mats, self.masks):
+            verts, edges, faces = rxdata_from_bm(bm)
+            if matrix is not None:
+                verts = verts.dot(matrix.T)
+
+            kinds = [kind for kind, show in (('verts', node.display_vert_index),
+                                             ('edges', node.display_edge_index),
+                                             ('faces', node.display_face_index)) if show]
+            for kind, labels in label_anchors(verts, edges, faces, kinds, mask).items():
+                found[kind].append(labels)
+
+        labels = []
+        for kind in ('verts', 'edges', 'faces'):
+            if found[kind]:
+                indices = np.concatenate([i for i, _ in found[kind]])
+                anchors = np.concatenate([a for _, a in found[kind]])
             else:
-                final_verts = bm.verts
-                final_edges = bm.edges
-                final_faces = bm.faces
-
-            VI = []
-            add_vert_instruct = VI.append
-            if self.node.display_vert_index:
-                for idx, v in enumerate(final_verts):
-                    add_vert_instruct([idx, v.co])
-                vert_indices_add(VI)
-
-            EI = []
-            add_edge_instruct = EI.append
-            if bm.edges and self.node.display_edge_index:
-                for edge_index, (idx1, idx2) in enumerate([e.verts[0].index, e.verts[1].index] for e in final_edges):
-                    v1 = final_verts[idx1].co
-                    v2 = final_verts[idx2].co
-                    loc = v1 + ((v2 - v1) / 2)
-                    add_edge_instruct([edge_index, loc])
-                edge_indices_add(EI)
-
-            FI = []
-            add_face_instruct = FI.append
-            if bm.faces and self.node.display_face_index:
-                for face_index, f in enumerate(final_faces):
-                    median = f.calc_center_median()
-                    add_face_instruct([face_index, median])
-                face_indices_add(FI)
-
-        return type('', (), {'vert_indices': vert_indices, 'edge_indices': edge_indices, 'face_indices': face_indices})
+                indices, anchors = np.empty(0, dtype=np.int64), np.empty((0, 4))
+            labels.append((kind, indices, anchors))
+
+        return type('', (), {'labels': labels})
 
     @property
     def current_draw_data(self):
         return {
             'tree_name': self.node.id_data.name[:],
             'custom_function': draw_index_viz,
-            'args': type('', (), {'fx': self.get_fx, 'data': self.get_data})
+            'args': type('', (), {'fx': self.get_fx, 'data': self.get_data, 'n_id': self.n_id})
         }
 
 
@@ -288,6 +275,7 @@ class SvRxIndexView():
             bgl_callback.callback_enable(self.n_id, self.current_draw_data, overlay='POST_PIXEL')
 
 
-    def __call__(self, bm: BMesh = Required, matrix: Matrix = None):
+    def __call__(self, bm: BMesh = Required, matrix: Matrix = None, mask: Int = None):
         self.bms.append(bm)
         self.mats.append(matrix)
+        self.masks.append(mask if self.use_mask else None)
@@ -4,26 +4,30 @@ import bpy
 import bmesh
 
 from svrx.nodes.node_base import stateful
-from svrx.typing import Vertices, Required, Faces, Edges, StringP, IntP, Matrix, BMesh
-from svrx.util.mesh import bmesh_from_pydata
+from svrx.typing import (Vertices, Required, Faces, Edges, StringP, IntP, BoolP, EnumP,
+                         Matrix, BMesh, Instances)
+from svrx.util.mesh import write_mesh, rxdata_from_bm, fingerprint, mesh_key, forget
+from svrx.util import object_index
 
 
 # pylint: disable=C0326
 
+# fingerprint of the last data written to each mesh, see write_to_mesh
+_written = {}
+
 class Mesh_out_common:
     def __init__(self, node=None):
         if node:
             self.base_name = node.mesh_name
             self.max_mesh_count = node.max_mesh_count
+            self.validate = node.validate
 
     def get_children(self, basename, kind='MESH'):
         """
         This finds those objects that are associated with the basename provided by
         the node's interface. kind can be MESH / CURVE
         """
-        objects = bpy.data.objects
-        objs = [obj for obj in objects if obj.type == kind]
-        return [o for o in objs if o.get('basename') == basename]
+        return object_index.children(basename, kind)
 
 
     def remove_non_updated_objects(self, obj_index, kind='MESH'):
@@ -46,25 +50,27 @@ class Mesh_out_common:
         objects = bpy.data.objects
         scene = bpy.context.scene
 
-        # remove excess objects
+        # remove excess objects, and their data unless still shared
         for object_name in objs:
             obj = objects[object_name]
+            data = obj.data
+            object_index.remove(self.base_name, obj['idx'])
             obj.hide_select = False
             scene.objects.unlink(obj)
             objects.remove(obj, do_unlink=True)
+            if data.users == 0:
+                if kind == 'MESH':
+                    remove_mesh(data)
+                else:
+                    data_kind.remove(data)
 
-        # delete associated meshes
-        for object_name in objs:
-            data_kind.remove(data_kind[object_name])
-
-@stateful
-class MeshOut(Mesh_out_common):
 
-    bl_idname = "SvRxNodeMeshOut"
-    label = "Mesh out"
+class MeshOutBase(Mesh_out_common):
+    """write path shared by Mesh out and RxMesh out"""
 
     properties = {'mesh_name': StringP(name='Mesh name', default="svrx_mesh"),
-                  'max_mesh_count': IntP(name="Max count", default=100)}
+                  'max_mesh_count': IntP(name="Max count", default=100),
+                  'validate': BoolP(name="Validate", default=False)}
 
     def start(self):
         self.verts = []
@@ -78,10 +84,8 @@ class MeshOut(Mesh_out_common):
         param = zip(range(self.max_mesh_count), self.verts, self.edges, self.faces, self.mats)
         for idx, verts, edges, faces, mat in param:
             obj_index = idx
-            bm = bmesh_from_pydata(verts[:, :3].tolist(), edges, faces, normal_update=False)
-            obj = make_bmesh_geometry(bm,
-                                      name=self.base_name,
-                                      idx=idx,)
+            obj = get_obj_for(self.base_name, obj_index)
+            write_to_mesh(obj, verts, edges, faces, self.validate)
             if mat is not None:
                 obj.matrix_world = mat.T
 
@@ -100,6 +104,12 @@ class MeshOut(Mesh_out_common):
         self.mats.append(matrix)
 
 
+@stateful
+class MeshOut(MeshOutBase):
+
+    bl_idname = "SvRxNodeMeshOut"
+    label = "Mesh out"
+
 
 @stateful
 class BMesh_out(Mesh_out_common):
@@ -107,164 +117,196 @@ class BMesh_out(Mesh_out_common):
     label = "BMesh out"
 
     properties = {'mesh_name': StringP(name='Mesh name', default="svrx_bm"),
-                  'max_mesh_count': IntP(name="Max count", default=100)}
+                  'max_mesh_count': IntP(name="Max count", default=100),
+                  'validate': BoolP(name="Validate", default=False)}
     def start(self):
         self.meshes = []
         self.mats = []
 
     def __call__(self, bm: BMesh = Required, mat: Matrix = None):
-        self.meshes.append(bm.copy())
+        self.meshes.append(rxdata_from_bm(bm))
         self.mats.append(mat)
 
     def stop(self):
         obj_index = 0
-        for idx, bm, mat in zip(range(self.max_mesh_count), self.meshes, self.mats):
+        for idx, rxdata, mat in zip(range(self.max_mesh_count), self.meshes, self.mats):
             obj_index = idx
-            obj = make_bmesh_geometry(bm, name=self.base_name, idx=idx, free=False)
+            obj = get_obj_for(self.base_name, obj_index)
+            write_to_mesh(obj, *rxdata, validate=self.validate)
             if mat is not None:
                 obj.matrix_world = mat.T
 
         self.remove_non_updated_objects(obj_index)
 
 
+# same node as Mesh out, kept so layouts using it still load
 @stateful
-class RxMeshOut(Mesh_out_common):
+class RxMeshOut(MeshOutBase):
 
     bl_idname = "SvRxNodeRxMeshOut"
     label = "RxMesh out"
 
+
+@stateful
+class InstancesOut(Mesh_out_common):
+
+    bl_idname = "SvRxNodeInstancesOut"
+    label = "Instances out"
+
+    modes = [
+        ('LINKED', 'Linked', 'One object per instance sharing one mesh', 0),
+        ('JOINED', 'Joined', 'All instances joined in one mesh', 1),
+    ]
+
     properties = {
-        'mesh_name': StringP(name='Mesh name', default="svrx_mesh"),
-        'max_mesh_count': IntP(name="Max count", default=100)
+        'mesh_name': StringP(name='Mesh name', default="svrx_instances"),
+        'max_mesh_count': IntP(name="Max count", default=1000),
+        'validate': BoolP(name="Validate", default=False),
+        'instance_mode': EnumP(name="Mode", items=modes, default='LINKED')
     }
 
+    def __init__(self, node=None):
+        super().__init__(node)
+        if node:
+            self.instance_mode = node.instance_mode
+
     def start(self):
-        self.verts = []
-        self.edges = []
-        self.faces = []
-        self.mats = []
+        self.instances = []
 
     def stop(self):
         obj_index = 0
+        mesh_count = 0
+        if self.instance_mode == 'JOINED':
+            param = zip(range(self.max_mesh_count), self.instances)
+            for idx, instances in param:
+                obj_index = idx
+                obj = get_obj_for(self.base_name, obj_index)
+                write_to_mesh(obj, *instances.realize(), validate=self.validate)
+                obj.matrix_world = np.identity(4)
+        else:
+            idx = 0
+            for instances in self.instances:
+                if idx >= self.max_mesh_count:
+                    break
+                mesh = get_mesh_for(self.base_name, mesh_count)
+                mesh_count += 1
+                write_to_mesh_data(mesh, instances.vertices, instances.edges, instances.faces,
+                                   self.validate)
+                for matrix in instances.matrices[:self.max_mesh_count - idx]:
+                    obj_index = idx
+                    obj = get_obj_for(self.base_name, obj_index, mesh)
+                    obj.matrix_world = matrix.T
+                    idx += 1
 
-        #  using range to limit object number for now during testing
-        param = zip(range(self.max_mesh_count), self.verts, self.edges, self.faces, self.mats)
-        for idx, verts, edges, faces, mat in param:
-
-            obj_index = idx
-
-            obj = get_obj_for(self.base_name, obj_index)
-            res = write_to_mesh(obj, verts, edges, faces)
-            obj.update_tag(refresh={'OBJECT', 'DATA'})
-            obj.hide_select = False
-
-            if mat is not None:
-                obj.matrix_world = mat.T
-
-        # cleanup
         self.remove_non_updated_objects(obj_index)
+        remove_unused_meshes(self.base_name, mesh_count)
 
+    def __call__(self, instances: Instances = Required):
+        self.instances.append(instances)
 
-    def __call__(self,
-                 verts: Vertices = Required,
-                 edges: Edges = None,
-                 faces: Faces = None,
-                 matrix: Matrix = None):
-        self.verts.append(verts)
-        self.edges.append(edges)
-        self.faces.append(faces)
-        self.mats.append(matrix)
 
+def shared_mesh_name(name, idx):
+    return name + ".mesh." + str(idx).zfill(4)
 
-def make_bmesh_geometry(bm, name="svrx_mesh", idx=0, free=True):
-    obj = get_obj_for(name, idx)
 
-    ''' get bmesh, write bmesh to obj, free bmesh'''
-    bm.to_mesh(obj.data)
-    if free:
-        bm.free()
-
-    obj.update_tag(refresh={'OBJECT', 'DATA'})
-    obj.hide_select = False
-    return obj
+def get_mesh_for(name="svrx", idx=0):
+    """mesh shared by linked objects"""
+    mesh_name = shared_mesh_name(name, idx)
+    mesh = bpy.data.meshes.get(mesh_name)
+    if mesh is None:
+        mesh = bpy.data.meshes.new(mesh_name)
+    return mesh
 
 
-def get_obj_for(name="svrx", idx=0):
+def remove_unused_meshes(name="svrx", start=0):
+    """remove the shared meshes of name from index start on that have no users left"""
+    meshes = bpy.data.meshes
+    idx = start
+    while True:
+        mesh = meshes.get(shared_mesh_name(name, idx))
+        if mesh is None:
+            return
+        remove_mesh(mesh)
+        idx += 1
+
+
+def remove_mesh(mesh):
+    """remove mesh and what is stored about it, if nothing uses it"""
+    if mesh is None or mesh.users:
+        return
+    _written.pop(mesh_key(mesh), None)
+    forget(mesh)
+    bpy.data.meshes.remove(mesh)
+
+
+def relink(obj, mesh):
+    """point obj at mesh, its previous mesh is removed when left without users"""
+    old = obj.data
+    if old == mesh:
+        return
+    obj.data = mesh
+    remove_mesh(old)
+
+
+def get_obj_for(name="svrx", idx=0, mesh=None):
+    """
+    object for name and idx, created if needed
+    mesh, link the object to this mesh instead of its own. Without it
+    an object still on a shared mesh of name gets a mesh of its own again
+    """
     scene = bpy.context.scene
     meshes = bpy.data.meshes
     objects = bpy.data.objects
 
     rx_name = name + "." + str(idx).zfill(4)
 
-    if rx_name in objects:
+    obj = object_index.lookup(name, idx)
+    if obj is None and rx_name in objects:
         obj = objects[rx_name]
-    else:
-        # this is only executed once, upon the first run.
-        mesh = meshes.new(rx_name)
-        obj = objects.new(rx_name, mesh)
-        scene.objects.link(obj)
+        object_index.add(obj, name, idx)
 
-        obj['idx'] = idx
-        obj['basename'] = name
+    if obj is not None:
+        if mesh is not None:
+            relink(obj, mesh)
+        elif obj.data.name.startswith(name + ".mesh."):
+            relink(obj, meshes.new(rx_name))
+        return obj
 
-    # at this point the mesh is always fresh and empty
+    # this is only executed once, upon the first run.
+    if mesh is None:
+        mesh = meshes.new(rx_name)
+    obj = objects.new(rx_name, mesh)
+    scene.objects.link(obj)
 
+    obj['idx'] = idx
+    obj['basename'] = name
+
+    object_index.add(obj, name, idx)
     return obj
 
-def write_to_mesh(obj, vertices, edges=None, faces=None):
-    mesh = obj.data
-    vert_diff = len(vertices) - len(mesh.vertices)
-    if edges is not None and faces is None:
-        edge_diff = len(edges) - len(mesh.edges)
-    elif faces is not None:
-        #   we have faces, edges will be updated using calc_edges
-        edge_diff = 0
-    else: #  no incoming faces or edges
-        edge_diff = - len(mesh.edges)
-
-    if faces is not None:
-        face_diff = len(faces) - len(mesh.polygons)
-        loop_diff = len(faces.vertex_indices) - len(mesh.loops)
-    else:
-        face_diff = -len(mesh.polygons)
-        loop_diff = -len(mesh.loops)
-    diffs = (vert_diff, edge_diff, face_diff, loop_diff)
-
-    if any(n < 0 for n in diffs):
-        print("giving up fast path, bmesh it is", diffs)
-        bm = bmesh_from_pydata(vertices[:, :3].tolist(), edges, faces, normal_update=False)
-        bm.to_mesh(mesh)
-        return True
-    elif any(n > 0 for n in diffs):
-        print("adding vertices")
-        mesh.vertices.add(vert_diff)
-        mesh.edges.add(edge_diff)
-        mesh.loops.add(loop_diff)
-        mesh.polygons.add(face_diff)
-
-    vert_out = vertices[:,:3].flatten()
-    #vert_out.shape = (3 * len(vert_out))
-    mesh.vertices.foreach_set('co', vert_out)
-
-    if edges is not None:
-        edges.shape = -1
-        mesh.edges.foreach_set('vertices', edges)
-        # temporary falten
-        edges.shape = (-1, 2)
-
-    if faces is not None:
-        mesh.polygons.foreach_set("loop_total", faces.loop_total)
-        mesh.polygons.foreach_set("loop_start", faces.loop_start)
-        mesh.loops.foreach_set("vertex_index", faces.vertex_indices)
-
-    if faces is not None and edges is None:
-        print("updating edges")
-        mesh.update(calc_edges=True)
-
-    fail = mesh.validate(verbose=False)
-    if not fail:
-        print("managed to update mesh for: ", obj.name)
-    else:
-        print("horrible failue for mesh for: ", obj.name)
 
+def write_to_mesh_data(mesh, vertices, edges=None, faces=None, validate=False):
+    """
+    write rx data to mesh, see svrx.util.mesh.write_mesh
+    returns None if the data is the same as the last write to this mesh
+    """
+    key = mesh_key(mesh)
+    current = fingerprint(vertices, edges, faces)
+    if _written.get(key) == current and len(mesh.vertices) == len(vertices):
+        return None
+
+    fail = write_mesh(mesh, vertices, edges, faces, validate, topology=current[1])
+    _written[key] = current
+    return fail
+
+
+def write_to_mesh(obj, vertices, edges=None, faces=None, validate=False):
+    """
+    write rx data to the mesh of obj, skipped if unchanged since the last write
+    """
+    fail = write_to_mesh_data(obj.data, vertices, edges, faces, validate)
+    if fail is None:
+        return False
+    obj.update_tag(refresh={'OBJECT', 'DATA'})
+    obj.hide_select = False
     return fail
@@ -1,16 +1,11 @@
-import textwrap
-import pprint
-
 import bgl
 import blf
 
-import bpy
-import bmesh
-
 from svrx.nodes.node_base import stateful
 from svrx.nodes.classes import NodeID, NodeStateful
-from svrx.typing import Required, StringP, Anytype, BoolP
+from svrx.typing import Required, Anytype, BoolP, IntP
 from svrx.util import bgl_callback
+from svrx.util.summary import summarize_tree
 # pylint: disable=C0326
 
 
@@ -22,6 +17,9 @@ class NodeStethoscope(NodeID, NodeStateful):
         row = layout.row()
         row.prop(self, "activate")
         row.prop(self, "shape")
+        col = layout.column(align=True)
+        col.prop(self, "max_children")
+        col.prop(self, "max_lines")
 
 def simple_grid_xy(x, y, args):
     # func = args[0]
@@ -49,7 +47,11 @@ class SvRxStethoscope():
 
     properties = {
         'activate': BoolP(name='Activate', default=True),
-        'shape': BoolP(name="Shape", default=True)
+        'shape': BoolP(name="Shape", default=True,
+                       description="Only show statistics, no array rows"),
+        'max_children': IntP(name="Max children", default=5, min=1,
+                             description="Items shown on each level of the data"),
+        'max_lines': IntP(name="Max lines", default=60, min=1),
     }
 
     def __init__(self, node=None):
@@ -57,6 +59,8 @@ class SvRxStethoscope():
             self.node = node
             self.activate = node.activate
             self.shape = node.shape
+            self.max_children = node.max_children
+            self.max_lines = node.max_lines
             self.n_id = node.node_id
 
     @property
@@ -70,8 +74,8 @@ class SvRxStethoscope():
         if self.activate:
             dt = self.node.inputs[0].data_tree
             lines = ["total depth: {} object count: {}".format(dt.level, dt.count()), ""]
-            structure = parse_tree(dt, self.shape)
-            lines.extend(pprint.pformat(structure).splitlines())
+            lines.extend(summarize_tree(dt, self.shape, max_children=self.max_children,
+                                        max_lines=self.max_lines))
             draw_data = {
                 'tree_name': self.node.id_data.name[:],
                 'custom_function': draw_text,
@@ -107,15 +111,3 @@ def draw_text(x, y, args):
         blf.draw(font_id, line)
         ypos -= int(line_height * 1.3)
 
-
-def parse_tree(dt, shape=False):
-    if dt.level == 0:
-        if shape:
-            return dt.data.shape
-        else:
-            return dt.data
-    else:
-        out = []
-        for child in dt.children:
-            out.append(parse_tree(child, shape))
-        return out
@@ -1,26 +1,32 @@
 
+import ctypes
+
 import bgl
 
 from svrx.nodes.node_base import stateful
 from svrx.nodes.classes import NodeID, NodeStateful
-from svrx.typing import (Required, BoolP, ColorP,
+from svrx.typing import (Required, BoolP, ColorP, IntP, EnumP,
                          BMesh, Matrix, Vertices, Faces, Edges)
 from svrx.util import bgl_callback_3dview as bgl_callback
-import itertools
-import mathutils as mu
-import bmesh
 import numpy as np
 
-from svrx.util.mesh import bmesh_from_pydata
+from svrx.util.mesh import rxdata_from_bm
+from svrx.util.smesh import SvPolygon
+from svrx.util.draw_buffers import (draw_arrays, face_shading, apply_budget,
+                                    SUBSAMPLE_MODES)
+from svrx.util.polygon import face_normals, face_edges
+from svrx.util.vertices import transform
 
 
 _callback_cache = {}
 
+# node_id: {'points': (drawn, total), ...} from the last execution
+draw_counts = {}
+
 
 class NodeView(NodeID, NodeStateful):
 
     def draw_buttons(self, context, layout):
-        layout.prop(self, "use_ops_trans")
         view_icon = 'RESTRICT_VIEW_' + ('OFF' if self.activate else 'ON')
         layout.prop(self, "activate", text="Show", toggle=True, icon=view_icon)
         col = layout.column()
@@ -36,49 +42,128 @@ class NodeView(NodeID, NodeStateful):
         row.prop(self, "display_face", toggle=True, icon='FACESEL', text='')
         row.prop(self, "face_color", text="")
 
+        col = layout.column(align=True)
+        col.prop(self, "max_points")
+        col.prop(self, "max_edges")
+        col.prop(self, "max_tris")
+        row = col.row(align=True)
+        row.prop(self, "subsample_mode", text="")
+        if self.subsample_mode == 'RANDOM':
+            row.prop(self, "seed")
+
+        counts = draw_counts.get(self.node_id)
+        if counts:
+            for kind in ('points', 'edges', 'tris'):
+                drawn, total = counts[kind]
+                if drawn < total:
+                    layout.label("{}: {} of {} drawn".format(kind.title(), drawn, total))
 
 
     def free(self):
         bgl_callback.callback_disable(self.node_id)
+        draw_counts.pop(self.node_id, None)
+
+
+# offset of the data pointer in the C struct of a bgl.Buffer, after
+# PyObject_VAR_HEAD (3 words), parent, type, ndimensions and dimensions
+_BUFFER_DATA_OFFSET = 5 * ctypes.sizeof(ctypes.c_void_p) + 2 * ctypes.sizeof(ctypes.c_int)
+
+# values per chunk when the buffer has to be filled from python lists
+CHUNK_SIZE = 2**16
 
+_direct = {}
 
-def draw_bmesh(context, args):
-    """Draw mesh from formatted data
 
-    Better passing of arguments
-    Display list/vertex buffer
+def _buffer_address(buf):
+    return ctypes.c_void_p.from_address(id(buf) + _BUFFER_DATA_OFFSET).value
+
+
+def _can_copy_direct():
+    """check once that the data pointer is where _buffer_address expects"""
+    if 'ok' not in _direct:
+        probe = np.array([1.5, -2.25, 3.125], dtype=np.float32)
+        buf = bgl.Buffer(bgl.GL_FLOAT, 3, probe.tolist())
+        try:
+            address = _buffer_address(buf)
+            ok = bool(address) and np.array_equal(
+                np.ctypeslib.as_array((ctypes.c_float * 3).from_address(address)), probe)
+        except (ValueError, OSError):
+            ok = False
+        _direct['ok'] = ok
+    return _direct['ok']
+
+
+def gl_buffer(gl_type, array):
+    """
+    bgl.Buffer with the contents of array, float32 for GL_FLOAT and
+    (u)int32 for GL_INT. The memory is copied in one go, without making
+    a python number of every value
+    """
+    dtype = np.float32 if gl_type == bgl.GL_FLOAT else np.int32
+    array = np.ascontiguousarray(array).ravel()
+    if array.dtype == np.uint32:
+        array = array.view(np.int32)
+    array = array.astype(dtype, copy=False)
+    buf = bgl.Buffer(gl_type, max(array.size, 1))
+    if not array.size:
+        return buf
+    if _can_copy_direct():
+        ctypes.memmove(_buffer_address(buf), array.ctypes.data, array.nbytes)
+    else:
+        for start in range(0, array.size, CHUNK_SIZE):
+            stop = min(start + CHUNK_SIZE, array.size)
+            buf[start:stop] = array[start:stop].tolist()
+    return buf
+
+
+def gl_buffers(arrays):
+    """
+    wrap the arrays from util.draw_buffers.draw_arrays in bgl.Buffers,
+    done once per execution and reused on every redraw
     """
-    obj_list = args[0]
-    face_list = args[1]
-    col_list = args[2]
-    edg_list = args[3]
-    edge_col, vert_col = args[4]
-
-    for verts, vert_index, colors, edges in zip(obj_list, face_list, col_list, edg_list):
-        if vert_index:
-            bgl.glBegin(bgl.GL_TRIANGLES)
-            for idx in range(0, len(vert_index), 3):
-                p0 = verts[vert_index[idx]]
-                p1 = verts[vert_index[idx + 1]]
-                p2 = verts[vert_index[idx + 2]]
-                bgl.glColor3f(*colors[idx//3])
-                bgl.glVertex3f(*p0)
-                bgl.glVertex3f(*p1)
-                bgl.glVertex3f(*p2)
-            bgl.glEnd()
-        if vert_col:
-            bgl.glBegin(bgl.GL_POINTS)
-            bgl.glColor3f(*vert_col)
-            for vert in verts:
-                bgl.glVertex3f(*vert)
-            bgl.glEnd()
-        if edge_col:
-            bgl.glBegin(bgl.GL_LINES)
-            bgl.glColor3f(*edge_col)
-            for x, y in edges:
-                bgl.glVertex3f(*verts[x])
-                bgl.glVertex3f(*verts[y])
-            bgl.glEnd()
+    return {
+        'points': gl_buffer(bgl.GL_FLOAT, arrays['points']),
+        'point_count': len(arrays['points']),
+        'tri_co': gl_buffer(bgl.GL_FLOAT, arrays['tri_co']),
+        'tri_color': gl_buffer(bgl.GL_FLOAT, arrays['tri_color']),
+        'tri_count': len(arrays['tri_co']),
+        # values fit in a signed int, drawn as GL_UNSIGNED_INT
+        'edge_index': gl_buffer(bgl.GL_INT, arrays['edge_index']),
+        'edge_count': len(arrays['edge_index']),
+        'point_index': (gl_buffer(bgl.GL_INT, arrays['point_index'])
+                        if 'point_index' in arrays else None),
+        'point_index_count': len(arrays.get('point_index', ())),
+    }
+
+
+def draw_buffers(context, args):
+    """Draw cached vertex arrays, see gl_buffers"""
+    buffers = args[0]
+    edge_col, vert_col = args[1]
+
+    bgl.glEnableClientState(bgl.GL_VERTEX_ARRAY)
+
+    if buffers['tri_count']:
+        bgl.glEnableClientState(bgl.GL_COLOR_ARRAY)
+        bgl.glVertexPointer(3, bgl.GL_FLOAT, 0, buffers['tri_co'])
+        bgl.glColorPointer(3, bgl.GL_FLOAT, 0, buffers['tri_color'])
+        bgl.glDrawArrays(bgl.GL_TRIANGLES, 0, buffers['tri_count'])
+        bgl.glDisableClientState(bgl.GL_COLOR_ARRAY)
+
+    bgl.glVertexPointer(3, bgl.GL_FLOAT, 0, buffers['points'])
+    if vert_col and buffers['point_index'] is not None:
+        bgl.glColor3f(*vert_col)
+        bgl.glDrawElements(bgl.GL_POINTS, buffers['point_index_count'], bgl.GL_UNSIGNED_INT,
+                           buffers['point_index'])
+    elif vert_col and buffers['point_count']:
+        bgl.glColor3f(*vert_col)
+        bgl.glDrawArrays(bgl.GL_POINTS, 0, buffers['point_count'])
+    if edge_col and buffers['edge_count']:
+        bgl.glColor3f(*edge_col)
+        bgl.glDrawElements(bgl.GL_LINES, buffers['edge_count'], bgl.GL_UNSIGNED_INT,
+                           buffers['edge_index'])
+
+    bgl.glDisableClientState(bgl.GL_VERTEX_ARRAY)
 
 
 @stateful
@@ -96,7 +181,14 @@ class BMViewNode():
         "display_vert": BoolP(name='show_verts', default=True),
         "display_edge": BoolP(name='show_edges', default=True),
         "display_face": BoolP(name='show_faces', default=True),
-        "use_ops_trans": BoolP(default=False)
+        "max_points": IntP(name="Max points", default=100000, min=0,
+                           description="Draw at most this many points, 0 draws all"),
+        "max_edges": IntP(name="Max edges", default=200000, min=0,
+                          description="Draw at most this many edges, 0 draws all"),
+        "max_tris": IntP(name="Max triangles", default=500000, min=0,
+                         description="Draw at most this many triangles, 0 draws all"),
+        "subsample_mode": EnumP(name="Subsample", items=SUBSAMPLE_MODES, default='STRIDE'),
+        "seed": IntP(name="Seed", default=0, min=0),
     }
 
     def __init__(self, node=None):
@@ -113,12 +205,17 @@ class BMViewNode():
 
     @property
     def current_draw_data(self):
-        args = (self.vertices, self.faces, self.colors, self.edges,
+        node = self.node
+        arrays = draw_arrays(self.vertices, self.faces, self.colors, self.edges)
+        arrays, draw_counts[self.n_id] = apply_budget(
+            arrays, node.max_points, node.max_edges, node.max_tris,
+            node.subsample_mode, node.seed)
+        args = (gl_buffers(arrays),
                 (self.node.edge_color[:] if self.node.display_edge else None,
                  self.node.vert_color[:] if self.node.display_vert else None))
         return {
             'tree_name': self.node.id_data.name[:],
-            'custom_function': draw_bmesh,
+            'custom_function': draw_buffers,
             'args': args
         }
 
@@ -130,46 +227,31 @@ class BMViewNode():
             _callback_cache[self.n_id] = draw_data
             bgl_callback.callback_enable(self.n_id, draw_data, overlay="POST_VIEW")
 
-    def __call__(self, bm: BMesh = Required,
-                 mat: Matrix = None):
-        color = self.node.face_color[:]
+    def add_mesh(self, verts, edges, faces, mat):
+        """
+        verts (V, 4) or (V, 3) array, edges (E, 2) or None, faces SvPolygon or None
+        """
         if mat is not None:
-            if self.node.use_ops_trans:
-                bm = bm.copy()
-                matrix = mu.Matrix(mat)
-                bmesh.ops.transform(bm, matrix=matrix, verts=bm.verts)
-                verts = [v.co[:] for v in bm.verts]
-                bm.normal_update()
-                normals = [f.normal[:] for f in bm.faces]
-            else:
-                matrix = mu.Matrix(mat)
-                verts = [matrix * v.co for v in bm.verts]
-                bm.normal_update()
-                mat33 = matrix.to_3x3()
-                normals = [(mat33 * f.normal)[:] for f in bm.faces]
+            verts = transform(verts, mat)
+        if faces is not None and not isinstance(faces, SvPolygon):
+            faces = SvPolygon.from_pydata(faces)
+        if faces is not None and len(faces):
+            normals = face_normals(verts, faces)
+            tris, tri_face = faces.triangulate(verts)
+            colors = face_shading(normals, self.node.face_color)[tri_face]
+            edges, _ = face_edges(faces, edges)
         else:
-            verts = [v.co[:] for v in bm.verts]
-            bm.normal_update()
-            normals = [f.normal[:] for f in bm.faces]
-
-        tess_faces = bm.calc_tessface()
-        vert_index = [l.vert.index for l in itertools.chain(*bm.calc_tessface())]
-
-        face_index = [t_f[0].face.index for t_f in tess_faces]
-        edges_index = [(e.verts[0].index, e.verts[1].index) for e in bm.edges]
-        colors = []
-        for idx in face_index:
-            normal = mu.Vector(normals[idx])
-            normal_nu = normal.angle((0, 0, 1), 0) / np.pi
-            r = (normal_nu * color[0]) + 0.1
-            g = (normal_nu * color[1]) + 0.1
-            b = (normal_nu * color[2]) + 0.1
-            colors.append((r, g, b))
-
-        self.vertices.append(verts)
-        self.faces.append(vert_index if self.node.display_face else [])
+            tris, colors = [], []
+
+        self.vertices.append(verts[:, :3])
+        self.faces.append(tris if self.node.display_face else [])
         self.colors.append(colors)
-        self.edges.append(edges_index)
+        self.edges.append(edges)
+
+    def __call__(self, bm: BMesh = Required,
+                 mat: Matrix = None):
+        verts, edges, faces = rxdata_from_bm(bm)
+        self.add_mesh(verts, edges, faces, mat)
 
 
 @stateful
@@ -182,5 +264,4 @@ class ViewNode(BMViewNode):
                  edges: Edges = None,
                  faces: Faces = None,
                  mat: Matrix = None):
-        bm = bmesh_from_pydata(verts[:, :3].tolist(), edges, faces)
-        super().__call__(bm, mat)
+        self.add_mesh(verts, edges, faces, mat)
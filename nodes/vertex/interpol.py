@@ -5,6 +5,7 @@ from svrx.typing import Vertices, Float, Int, Required, FloatP
 from svrx.util.geom import CubicSpline, LinearSpline
 from svrx.util.function import generator
 from svrx.nodes.node_base import node_func
+from svrx.util.vertices import vertices_like
 
 
 @node_func(bl_idname="SvRxNodeVertexInterpol", multi_label="Interpolation", id=0)
@@ -13,10 +14,12 @@ def cubic_spline(verts: Vertices = Required,
                  h: FloatP = 0.001,
                  ) -> (Vertices, Vertices("Tanget")):
     spl = CubicSpline(verts[:, :3])
-    points_out = np.ones((len(t), 4), dtype=np.float64)
-    tangents_out = np.zeros((len(t), 4), dtype=np.float64)
+    points_out = vertices_like(verts, len(t))
+    tangents_out = vertices_like(verts, len(t))
     points_out[:, :3] = spl.eval(t)
     tangents_out[:, :3] = spl.tangent(t, h)
+    if tangents_out.shape[1] == 4:
+        tangents_out[:, 3] = 0
     return points_out, tangents_out
 
 
@@ -34,7 +37,7 @@ def linear_spline(verts: Vertices = Required,
                   t: Float = 0.5,
                   ) -> Vertices:
     spl = LinearSpline(verts[:, :3])
-    points_out = np.ones((len(t), 4), dtype=np.float64)
+    points_out = vertices_like(verts, len(t))
     points_out[:, :3] = spl.eval(t)
     return points_out
 
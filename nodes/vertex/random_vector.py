@@ -21,6 +21,7 @@ from svrx.typing import Float, Int, Vertices, BoolP
 from svrx.nodes.node_base import node_func
 
 from svrx.util.function import generator
+from svrx.util.vertices import new_vertices
 
 
 def gen_rand_vecs(dims, number):
@@ -37,9 +38,10 @@ def random_unit_vector(size: Int =1,
                        point: BoolP = False
                        ) -> [Vertices]:
     np.random.seed(seed)
-    if point:
-        res = np.ones((size, 4))
-    else:
-        res = np.zeros((size, 4))
+    # directions need w = 0, which the compact layout can't hold,
+    # so they are always made in the full layout
+    res = new_vertices(size, compact=None if point else False)
     res[:, :3] = scale * gen_rand_vecs(3, size)
+    if not point:
+        res[:, 3] = 0
     return res
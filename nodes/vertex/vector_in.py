@@ -3,6 +3,8 @@ from svrx.typing import Float, Vertices
 
 import numpy as np
 
+from svrx.util.vertices import new_vertices
+
 @node_func(bl_idname="SvRxNodeVectorIn")
 def vector_in(x: Float = 0.0,
               y: Float = 0.0,
@@ -12,8 +14,8 @@ def vector_in(x: Float = 0.0,
     """create vertices from inputs"""
     data = (x, y, z, w)
     counts = [len(x) for x in data]
-    verts = np.empty((max(counts), 4))
-    for i, count in zip(range(4), counts):
+    verts = new_vertices(max(counts))
+    for i, count in zip(range(verts.shape[1]), counts):
         verts[:count, i] = data[i]
         verts[count:, i] = data[i][-1]
     return verts
@@ -4,6 +4,7 @@ from svrx.typing import Vector, Float, Int, Vertices
 from svrx.nodes.node_base import node_func
 
 from svrx.util.function import make_compatible
+from svrx.util.vertices import match_layout, vertices_like
 
 X_AXIS = (1, 0, 0, 1)
 Y_AXIS = (0, 1, 0, 1)
@@ -23,30 +24,34 @@ ONES = (1, 1, 1, 1)
 
 @node_func(bl_idname="SvRxNodeVectorMath", multi_label="Vector Math", id=0)
 def add(u: Vector = ZEROS, v: Vector = ZEROS) -> Vertices:
-    u, v = make_compatible(u, v)
+    u, v = make_compatible(u, match_layout(u, v))
     max_len = max(u.shape[0], v.shape[0])
-    out = np.zeros((max_len, 4))
+    out = vertices_like(u, max_len)
     out[:, :3] = u[:, :3] + v[:, :3]
-    out[:, 3] = max(u[0, 3], v[0, 3])
+    if out.shape[1] == 4:
+        out[:, 3] = max(u[0, 3], v[0, 3])
     return out
 
 
 @node_func(id=6)
 def sub(u: Vector = ZEROS, v: Vector = ZEROS) -> Vertices:
     # return add(u, opposite(v))
-    u, v = make_compatible(u, v)
+    u, v = make_compatible(u, match_layout(u, v))
     max_len = max(u.shape[0], v.shape[0])
-    out = np.zeros((max_len, 4))
+    out = vertices_like(u, max_len)
     out[:, :3] = u[:, :3] - v[:, :3]
-    out[:, 3] = max(u[0, 3], v[0, 3])
+    if out.shape[1] == 4:
+        out[:, 3] = max(u[0, 3], v[0, 3])
     return out
 
 @node_func(id=12)
 def cross(u: Vector = X_AXIS, v: Vector = Y_AXIS) -> Vertices:
-    u, v = make_compatible(u, v)
+    u, v = make_compatible(u, match_layout(u, v))
     max_len = max(u.shape[0], v.shape[0])
-    out = np.zeros((max_len, 4))
+    out = vertices_like(u, max_len)
     out[:, :3] = np.cross(u[:, :3], v[:, :3])
+    if out.shape[1] == 4:
+        out[:, 3] = 0
     return out
 
 
@@ -71,7 +76,7 @@ def length(u: Vector = ZEROS) -> Float:
 
 @node_func(id=32)
 def dot(u: Vector = ZEROS, v: Vector = ZEROS) -> Float:
-    u, v = make_compatible(u, v)
+    u, v = make_compatible(u, match_layout(u, v))
     return np.sum(u[:, :3] * v[:, :3], axis=1)  # .. not sure
 
 
@@ -87,7 +92,7 @@ def distance(u: Vector = ZEROS, v: Vector = ZEROS) -> Float:
     # speed!?  http://stackoverflow.com/a/9184560/1243487
     # return length(sub(u, v))
 
-    u, v = make_compatible(u, v)
+    u, v = make_compatible(u, match_layout(u, v))
     x = u[:, :3] - v[:, :3]
     return np.sqrt((x * x).sum(axis=1))
 
@@ -109,5 +114,5 @@ def normalize(u: Vector = ZEROS) -> Vertices:
 
 @node_func(id=60)
 def component_mul(u: Vector = ONES, v: Vector = ONES) -> Vertices:
-    u, v = make_compatible(u, v)
+    u, v = make_compatible(u, match_layout(u, v))
     return u * v
@@ -6,4 +6,5 @@ import numpy as np
 @node_func(bl_idname="SvRxNodeVectorOut")
 def vector_out(verts: Point = (0.0, 0.0, 0.0, 1.0)
               ) -> (Float("x"), Float("y"), Float("z"), Float("w")):
-    return verts[:, 0], verts[:, 1], verts[:, 2], verts[:, 3]
+    w = verts[:, 3] if verts.shape[1] == 4 else np.ones(len(verts))
+    return verts[:, 0], verts[:, 1], verts[:, 2], w
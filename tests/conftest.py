@@ -0,0 +1,42 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; either version 2
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+#
+# Tests for the parts of svrx that only need numpy, run from the
+# repository root with
+#
+#     pytest tests
+#
+# not python -m pytest, that puts the root on sys.path where typing.py
+# hides the standard library module.
+#
+# The add-on is installed as the svrx package and its __init__ registers
+# with blender, so only the package path is set up here.
+#
+
+import os
+import sys
+import types
+
+
+_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+if 'svrx' not in sys.modules:
+    _svrx = types.ModuleType('svrx')
+    _svrx.__path__ = [_root]
+    sys.modules['svrx'] = _svrx
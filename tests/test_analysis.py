@@ -0,0 +1,73 @@
+from svrx.core.analysis import (analyze, critical_path, node_dependencies,
+                                node_levels, report_text)
+
+
+class Node:
+    def __init__(self, name):
+        self.name = name
+
+
+class Socket:
+    def __init__(self, node):
+        self.node = node
+
+
+def small_dag():
+    """
+    A -> C -> E, B -> C, A -> D -> E, B -> V1 -> E, A -> V2 -> E
+    with V1 and V2 virtual nodes sharing a name
+    """
+    names = "ABCDE"
+    nodes = {n: Node(n) for n in names}
+    v1, v2 = Node("VNode<Add>"), Node("VNode<Add>")
+    edges = [("A", "C"), ("B", "C"), ("A", "D"), ("C", "E"), ("D", "E")]
+    links = [(nodes[a], nodes[b]) for a, b in edges]
+    links += [(nodes["B"], v1), (v1, nodes["E"]), (nodes["A"], v2), (v2, nodes["E"])]
+    # one socket link per dependency
+    socket_links = {Socket(to_node): Socket(from_node) for from_node, to_node in links}
+    order = [nodes["A"], nodes["B"], nodes["C"], nodes["D"], v1, v2, nodes["E"]]
+    cost = {nodes["A"]: 1.0, nodes["B"]: 2.0, nodes["C"]: 5.0, nodes["D"]: 1.0,
+            v1: 10.0, v2: 0.5, nodes["E"]: 1.0}
+    return order, node_dependencies(socket_links), cost, nodes, (v1, v2)
+
+
+def test_dependencies_by_node():
+    order, deps, _, nodes, (v1, v2) = small_dag()
+    assert deps[nodes["E"]] == {nodes["C"], nodes["D"], v1, v2}
+    assert deps[v1] == {nodes["B"]} and deps[v2] == {nodes["A"]}
+    assert nodes["A"] not in deps
+
+
+def test_critical_path():
+    order, deps, cost, nodes, (v1, v2) = small_dag()
+    path, length = critical_path(order, deps, cost)
+    assert path == [nodes["B"], v1, nodes["E"]]
+    assert length == 13.0
+
+
+def test_levels():
+    order, deps, _, nodes, (v1, v2) = small_dag()
+    levels = node_levels(order, deps)
+    assert [levels[node] for node in order] == [0, 0, 1, 1, 1, 1, 2]
+
+
+def test_analyze():
+    order, deps, cost, _, _ = small_dag()
+    result = analyze(order, deps, cost)
+    assert result['node_count'] == 7
+    assert result['total_work'] == 20.5
+    assert result['critical_path'] == [["B", 2.0], ["VNode<Add>", 10.0], ["E", 1.0]]
+    assert result['critical_path_time'] == 13.0
+    assert [w['width'] for w in result['levels']] == [2, 4, 1]
+    assert [w['span'] for w in result['levels']] == [2.0, 10.0, 1.0]
+    assert result['level_bound'] == 13.0
+    assert result['max_width'] == 4
+    assert result['levels'][1]['nodes'] == ["C", "D", "VNode<Add>", "VNode<Add>"]
+    assert sum(c for _, c in result['nodes']) == 20.5
+    assert "VNode<Add>" in report_text(result)
+
+
+def test_analyze_empty():
+    result = analyze([], {}, {})
+    assert result['critical_path'] == [] and result['critical_path_time'] == 0.0
+    assert result['max_speedup'] == 1.0 and result['max_width'] == 0
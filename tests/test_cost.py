@@ -0,0 +1,87 @@
+#
+# Needs blender with the add-on enabled, skipped otherwise.
+#
+
+import numpy as np
+import pytest
+
+bpy = pytest.importorskip("bpy")
+
+import svrx.core.cost as cost
+import svrx.core.execution as execution
+from svrx.core.offline import LayoutBuilder
+from svrx.core.serialize import layout_from_json
+from svrx.nodes.generator.plane import plane_nbytes, plane_verts
+from svrx.nodes.generator.torus import torus_nbytes, make_torus
+from svrx.util.topology import plane_edges, plane_faces, torus_edges, torus_faces
+from svrx.util.vertices import layout_scope
+
+
+def mesh_bytes(verts, edges, faces):
+    return (verts.nbytes + edges.nbytes + faces.loop_start.nbytes +
+            faces.loop_total.nbytes + faces.vertex_indices.nbytes)
+
+
+@pytest.mark.parametrize("compact", [False, True])
+@pytest.mark.parametrize("x, y", [(2, 2), (4, 3), (10, 7)])
+def test_plane_out_bytes(compact, x, y):
+    with layout_scope(compact):
+        verts = plane_verts(np.linspace(0, 1, x), np.linspace(0, 1, y))
+        real = mesh_bytes(verts, plane_edges(x, y), plane_faces(y, x))
+        assert plane_nbytes(x, y, 1.0) == real
+
+
+@pytest.mark.parametrize("compact", [False, True])
+@pytest.mark.parametrize("n1, n2", [(3, 3), (22, 15), (8, 5)])
+def test_torus_out_bytes(compact, n1, n2):
+    with layout_scope(compact):
+        verts = make_torus(2.0, 0.6, n1, n2)
+        real = mesh_bytes(verts, torus_edges(n2, n1), torus_faces(n2, n1))
+        assert torus_nbytes(2.0, 0.6, n1, n2) == real
+
+
+@pytest.fixture
+def budget_tree():
+    b = LayoutBuilder("Budget")
+    plane = b.add("SvRxNodeGenPlane", mode="Grid", name="Plane", X=1000, Y=1000)
+    out = b.add("SvRxNodeRxMeshOut", name="Out",
+                properties={'mesh_name': "svrx_budget_test"})
+    for i in range(3):
+        b.link(plane, i, out, i)
+    ng = bpy.data.node_groups.new("BudgetTest", 'SvRxTree')
+    layout_from_json(ng, b.layout)
+    yield ng
+    bpy.data.node_groups.remove(ng)
+    for obj in list(bpy.data.objects):
+        if obj.name.startswith("svrx_budget_test"):
+            bpy.data.objects.remove(obj, do_unlink=True)
+
+
+def test_over_budget_raises_before_running(budget_tree, monkeypatch):
+    shown = []
+    monkeypatch.setattr(execution.error, "show", lambda node, err: shown.append((node, err)))
+    learned = []
+    monkeypatch.setattr(cost, "learn", lambda *args: learned.append(args))
+
+    budget_tree.rx_memory_budget = 1.0
+    execution._exec_node_group(budget_tree)
+
+    assert len(shown) == 1
+    node, err = shown[0]
+    assert isinstance(err, MemoryError)
+    assert node.name == "Plane"
+    assert not learned
+    assert "svrx_budget_test.0000" not in bpy.data.objects
+
+
+def test_no_budget_no_estimate(budget_tree, monkeypatch):
+    def fail(*args):
+        raise AssertionError("estimated without a budget")
+
+    for name in ("estimate", "remember", "learn"):
+        monkeypatch.setattr(cost, name, fail)
+    monkeypatch.setattr(execution.error, "show", lambda node, err: fail())
+    budget_tree.nodes["Plane"].inputs["X"].default_value = 3
+    budget_tree.nodes["Plane"].inputs["Y"].default_value = 3
+    execution._exec_node_group(budget_tree)
+    assert budget_tree.name not in cost.last_estimate
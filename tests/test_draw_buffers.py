@@ -0,0 +1,145 @@
+import numpy as np
+
+from svrx.util.smesh import SvPolygon
+from svrx.util.draw_buffers import label_anchors, draw_arrays, apply_budget, project_points
+
+
+def grid():
+    verts = np.ones((6, 4))
+    verts[:, :3] = [[0, 0, 0], [1, 0, 0], [2, 0, 0], [0, 1, 0], [1, 1, 0], [2, 1, 0]]
+    edges = np.array([[0, 1], [1, 2], [3, 4]], dtype=np.uint32)
+    faces = SvPolygon.from_pydata([[0, 1, 4, 3], [1, 2, 5, 4]])
+    return verts, edges, faces
+
+
+def test_label_anchors_without_mask():
+    # what the Index View gets when nothing is linked to Mask
+    verts, edges, faces = grid()
+    found = label_anchors(verts, edges, faces)
+    assert list(found['verts'][0]) == list(range(6))
+    assert list(found['edges'][0]) == [0, 1, 2]
+    assert list(found['faces'][0]) == [0, 1]
+    assert np.allclose(found['edges'][1][0, :3], [0.5, 0, 0])
+    assert np.allclose(found['faces'][1][1, :3], [1.5, 0.5, 0])
+
+
+def test_label_anchors_mask():
+    verts, edges, faces = grid()
+    found = label_anchors(verts, edges, faces, mask=np.array([0, 2]))
+    assert list(found['verts'][0]) == [0, 2]
+    assert list(found['edges'][0]) == [0, 2]
+    assert list(found['faces'][0]) == [0]
+    assert np.allclose(found['verts'][1], verts[[0, 2]])
+
+
+def test_label_anchors_kinds():
+    verts, edges, faces = grid()
+    assert set(label_anchors(verts, edges, faces, kinds=('faces',))) == {'faces'}
+    assert set(label_anchors(verts, None, None)) == {'verts'}
+
+
+def mixed_mesh():
+    """a triangle, a quad and a pentagon side by side"""
+    co = [[0, 0, 0], [1, 0, 0], [0, 1, 0],
+          [2, 0, 0], [3, 0, 0], [3, 1, 0], [2, 1, 0],
+          [4, 0, 0], [5, 0, 0], [5.5, 1, 0], [4.5, 2, 0], [3.5, 1, 0]]
+    verts = np.ones((len(co), 4))
+    verts[:, :3] = co
+    faces = SvPolygon.from_pydata([[0, 1, 2], [3, 4, 5, 6], [7, 8, 9, 10, 11]])
+    return verts, faces
+
+
+def test_draw_arrays_triangles():
+    verts, faces = mixed_mesh()
+    tris, tri_face = faces.triangulate(verts)
+    colors = np.array([[1, 0, 0], [0, 1, 0], [0, 0, 1]], dtype=np.float32)[tri_face]
+    edges = np.array([[0, 1], [3, 4]], dtype=np.uint32)
+    arrays = draw_arrays([verts, verts[:2]], [tris.ravel(), None], [colors, None],
+                         [edges, np.array([[0, 1]])])
+
+    assert len(tris) == 1 + 2 + 3
+    assert arrays['points'].shape == (len(verts) + 2, 3)
+    assert arrays['points'].dtype == np.float32
+    assert arrays['tri_co'].shape == (3 * len(tris), 3)
+    assert np.array_equal(arrays['tri_co'], verts[tris.ravel(), :3])
+    # flat color, the same for the three corners of a triangle
+    tri_color = arrays['tri_color'].reshape(-1, 3, 3)
+    assert np.all(tri_color == tri_color[:, :1])
+    assert np.array_equal(tri_color[:, 0], colors)
+    # edges of the second mesh are offset by the points of the first
+    assert list(arrays['edge_index']) == [0, 1, 3, 4, len(verts), len(verts) + 1]
+    assert arrays['edge_index'].dtype == np.uint32
+
+
+def test_draw_arrays_empty():
+    arrays = draw_arrays([], [], [], [])
+    assert arrays['points'].shape == (0, 3) and arrays['edge_index'].shape == (0,)
+
+
+def budget_arrays(points=1000, edges=800, tris=600):
+    return {
+        'points': np.random.random((points, 3)).astype(np.float32),
+        'edge_index': np.arange(edges * 2, dtype=np.uint32) % points,
+        'tri_co': np.arange(tris * 9, dtype=np.float32).reshape(-1, 3),
+        'tri_color': np.arange(tris * 9, dtype=np.float32).reshape(-1, 3),
+    }
+
+
+def test_apply_budget():
+    arrays = budget_arrays()
+    for mode in ('STRIDE', 'RANDOM'):
+        out, counts = apply_budget(arrays, 100, 50, 25, mode=mode, seed=3)
+        assert counts == {'points': (100, 1000), 'edges': (50, 800), 'tris': (25, 600)}
+        assert len(out['point_index']) == 100
+        assert len(set(out['point_index'].tolist())) == 100
+        assert len(out['edge_index']) == 2 * 50
+        assert len(out['tri_co']) == 3 * 25 and len(out['tri_color']) == 3 * 25
+        # whole triangles are kept, the corners stay together
+        tri_co = out['tri_co'].reshape(-1, 9)
+        assert np.all(tri_co[:, 0] % 9 == 0)
+        assert np.all(np.diff(tri_co, axis=1) == 1)
+        assert np.array_equal(out['tri_co'], out['tri_color'])
+        # every point is still there for the edges
+        assert len(out['points']) == 1000
+
+
+def test_apply_budget_seed():
+    arrays = budget_arrays()
+    a, _ = apply_budget(arrays, 100, mode='RANDOM', seed=1)
+    b, _ = apply_budget(arrays, 100, mode='RANDOM', seed=1)
+    c, _ = apply_budget(arrays, 100, mode='RANDOM', seed=2)
+    assert np.array_equal(a['point_index'], b['point_index'])
+    assert not np.array_equal(a['point_index'], c['point_index'])
+
+
+def test_apply_budget_fits():
+    arrays = budget_arrays(10, 10, 10)
+    out, counts = apply_budget(arrays, 100, 100, 100)
+    assert 'point_index' not in out
+    assert counts['tris'] == (10, 10)
+    out, counts = apply_budget(arrays)
+    assert counts['points'] == (10, 10)
+
+
+def test_project_points():
+    # camera at the origin looking down -z, 90 degree field of view
+    near, far = 0.1, 100.0
+    perspective = np.array([
+        [1, 0, 0, 0],
+        [0, 1, 0, 0],
+        [0, 0, -(far + near) / (far - near), -2 * far * near / (far - near)],
+        [0, 0, -1, 0]])
+    points = np.array([
+        [0, 0, -5, 1],        # center
+        [2.5, 0, -5, 1],      # right, inside
+        [0, 0, 5, 1],         # behind the camera
+        [6, 0, -5, 1],        # far outside on the right
+        [5.1, 0, -5, 1],      # just outside, inside the margin
+    ], dtype=np.float64)
+    pixels, visible = project_points(points, perspective, 200, 100)
+    assert list(visible) == [0, 1]
+    assert np.allclose(pixels[0], [100, 50])
+    assert np.allclose(pixels[1], [150, 50])
+
+    pixels, visible = project_points(points, perspective, 200, 100, margin=5)
+    assert list(visible) == [0, 1, 4]
@@ -0,0 +1,60 @@
+from svrx.util.draw_handlers import DrawHandlers
+
+
+class Space:
+    """records draw handlers like a bpy.types.Space"""
+
+    def __init__(self):
+        self.handlers = set()
+        self.added = 0
+
+    def draw_handler_add(self, func, args, region, overlay):
+        self.added += 1
+        handle = object()
+        self.handlers.add(handle)
+        return handle
+
+    def draw_handler_remove(self, handle, region):
+        self.handlers.remove(handle)
+
+
+def make():
+    space = Space()
+    redraws = []
+    handlers = DrawHandlers(space, None, lambda: redraws.append(1))
+    return space, handlers, redraws
+
+
+def test_enable_disable():
+    space, handlers, redraws = make()
+    handlers.enable(('a', {'x': 1}))
+    handlers.disable('a')
+    assert not space.handlers and not handlers.callback_dict
+    assert len(redraws) == 2
+
+
+def test_batch_updates_in_place():
+    space, handlers, redraws = make()
+    data = {'x': 1}
+    handlers.enable(('a', data))
+    handlers.begin_batch()
+    handlers.disable('a')
+    handlers.enable(('a', {'x': 2}))
+    handlers.end_batch()
+    assert space.added == 1 and len(space.handlers) == 1
+    assert data == {'x': 2}
+    assert len(redraws) == 2
+
+
+def test_batch_removes_disabled_once():
+    space, handlers, redraws = make()
+    handlers.enable(('a', {}))
+    handlers.enable(('b', {}))
+    del redraws[:]
+    handlers.begin_batch()
+    handlers.disable('a')
+    handlers.disable('b')
+    assert len(space.handlers) == 2
+    handlers.end_batch()
+    assert not space.handlers
+    assert len(redraws) == 1
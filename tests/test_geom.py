@@ -0,0 +1,57 @@
+import numpy as np
+
+from svrx.util.geom import circle, circle_batch
+from svrx.util.smesh import SvPolygon
+
+
+def batch():
+    radius = np.array([1.0, 2.0, 0.5, 1.5])
+    phase = np.array([0.0, 0.3, 0.0, 1.0])
+    nverts = np.array([6, 6, 4, 6])
+    return circle_batch(radius, phase, nverts)
+
+
+def test_batch_matches_circle():
+    radius = np.array([1.0, 2.0, 0.5])
+    phase = np.array([0.0, 0.3, 0.1])
+    nverts = np.array([6, 4, 6])
+    verts, edges, faces = circle_batch(radius, phase, nverts)
+    for i in range(3):
+        v, e, f = circle(radius[i], phase[i], nverts[i])
+        np.testing.assert_allclose(verts[i], v, atol=1e-12)
+        assert np.array_equal(edges[i], e)
+        assert np.array_equal(faces[i].vertex_indices, f.vertex_indices)
+        assert np.array_equal(faces[i].loop_total, f.loop_total)
+
+
+def test_outputs_are_independent():
+    verts, edges, faces = batch()
+    same = [0, 1, 3]
+    for i in same:
+        for j in same:
+            if i != j:
+                assert edges[i] is not edges[j]
+                assert faces[i] is not faces[j]
+                assert not np.shares_memory(edges[i], edges[j])
+                assert not np.shares_memory(faces[i].vertex_indices, faces[j].vertex_indices)
+                assert not np.shares_memory(verts[i], verts[j])
+
+
+def test_mutating_one_output_leaves_the_others():
+    verts, edges, faces = batch()
+    edges[0][0] = (5, 5)
+    verts[0][:] = 0
+    faces[0].vertex_indices[0] = 5
+    faces[0].normals = np.zeros((1, 4))
+    faces[0] += SvPolygon(np.array([0], dtype=np.uint32),
+                          np.array([3], dtype=np.uint32),
+                          np.arange(3, dtype=np.uint32))
+
+    assert len(faces[0]) == 2
+    for i in (1, 3):
+        assert np.array_equal(edges[i][0], (0, 1))
+        assert np.array_equal(faces[i].vertex_indices, np.arange(6))
+        assert len(faces[i]) == 1
+        assert not hasattr(faces[i], 'normals')
+        assert np.all(verts[i][:, 3] == 1)
+        assert np.any(verts[i][:, :2] != 0)
@@ -0,0 +1,31 @@
+import numpy as np
+
+from svrx.core.inference import dtype_fits, shape_fits
+
+
+def test_dtype_fits_kind():
+    contract = (np.dtype(np.float64), None, False)
+    assert dtype_fits(np.dtype(np.float32), contract)
+    assert dtype_fits(np.dtype(np.int64), contract)
+    assert not dtype_fits(np.dtype(np.complex128), contract)
+
+
+def test_dtype_fits_bool():
+    contract = (np.dtype(bool), None, False)
+    for dtype in (bool, np.int64, np.uint32, np.float64):
+        assert dtype_fits(np.dtype(dtype), contract)
+    assert not dtype_fits(np.dtype(np.complex128), contract)
+
+
+def test_dtype_fits_exact():
+    contract = (np.dtype(np.uint32), (None, 2), True)
+    assert dtype_fits(np.dtype(np.uint32), contract)
+    assert not dtype_fits(np.dtype(np.int64), contract)
+
+
+def test_shape_fits():
+    contract = (None, (None, 4), False)
+    assert shape_fits((10, 4), contract)
+    assert not shape_fits((10, 3), contract)
+    assert not shape_fits((10,), contract)
+    assert shape_fits(None, contract)
@@ -0,0 +1,41 @@
+import numpy as np
+
+from svrx.util.function import match_short, match_long_repeat, match_long_cycle, match_arrays
+
+
+def test_match_short():
+    res = list(match_short(np.arange(3), np.arange(5)))
+    assert [tuple(r) for r in res] == [(0, 0), (1, 1), (2, 2)]
+
+
+def test_match_short_mask():
+    b = np.arange(5)
+    res = list(match_short(np.arange(3), b, mask=[False, True]))
+    assert len(res) == 3
+    assert [r[0] for r in res] == [0, 1, 2]
+    assert all(r[1] is b for r in res)
+
+
+def test_match_short_mask_longer():
+    res = list(match_short(np.arange(4), np.arange(2), mask=[False, True]))
+    assert len(res) == 4
+
+
+def test_match_long_mask():
+    b = np.arange(5)
+    for match in (match_long_repeat, match_long_cycle):
+        res = list(match(np.arange(3), np.arange(2), b, mask=[False, False, True]))
+        assert len(res) == 3
+        assert all(r[2] is b for r in res)
+
+
+def test_match_arrays_short_mask():
+    a, b, c = np.arange(3), np.arange(5), np.arange(7)
+    out = match_arrays([a, b, c], mask=[False, False, True], mode='SHORT')
+    assert len(out[0]) == 3 and len(out[1]) == 3
+    assert out[2] is c
+
+
+def test_match_arrays_repeat():
+    out = match_arrays([np.arange(3), np.arange(5)], mode='REPEAT')
+    assert list(out[0]) == [0, 1, 2, 2, 2]
@@ -0,0 +1,113 @@
+import pytest
+
+from svrx.util import object_index
+
+
+class FakeObject:
+    def __init__(self, name, basename=None, idx=None, kind='MESH'):
+        self.name = name
+        self.type = kind
+        self.props = {}
+        if basename is not None:
+            self.props['basename'] = basename
+            self.props['idx'] = idx
+
+    def get(self, key, default=None):
+        return self.props.get(key, default)
+
+
+class FakeObjects:
+    """what object_index uses of bpy.data.objects"""
+    def __init__(self, *objects):
+        self.by_name = {obj.name: obj for obj in objects}
+
+    def __iter__(self):
+        return iter(list(self.by_name.values()))
+
+    def get(self, name, default=None):
+        return self.by_name.get(name, default)
+
+    def rename(self, old, new):
+        obj = self.by_name.pop(old)
+        obj.name = new
+        self.by_name[new] = obj
+
+    def remove(self, name):
+        del self.by_name[name]
+
+
+@pytest.fixture
+def objects(monkeypatch):
+    objects = FakeObjects(FakeObject("svrx.0000", "svrx", 0),
+                          FakeObject("svrx.0001", "svrx", 1),
+                          FakeObject("svrx.0002", "svrx", 2, kind='CURVE'),
+                          FakeObject("Cube"))
+    monkeypatch.setattr(object_index, "_objects", lambda: objects)
+    object_index.invalidate()
+    yield objects
+    object_index.invalidate()
+
+
+def names(objs):
+    return [obj.name for obj in objs]
+
+
+def test_scan(objects):
+    assert object_index.lookup("svrx", 1) is objects.get("svrx.0001")
+    assert names(object_index.children("svrx")) == ["svrx.0000", "svrx.0001", "svrx.0002"]
+    assert names(object_index.children("svrx", 'MESH')) == ["svrx.0000", "svrx.0001"]
+    assert object_index.lookup("svrx", 5) is None
+
+
+def test_renamed(objects):
+    object_index.children("svrx")
+    objects.rename("svrx.0001", "Renamed")
+    # an other object takes the old name, it isn't tagged as ours
+    objects.by_name["svrx.0001"] = FakeObject("svrx.0001")
+    assert object_index.lookup("svrx", 1) is None
+    assert names(object_index.children("svrx")) == ["svrx.0000", "svrx.0002"]
+
+    # an object with the tags of an other index under the name
+    objects.remove("svrx.0001")
+    objects.rename("svrx.0000", "svrx.0001")
+    assert object_index.lookup("svrx", 1) is None
+    assert object_index.lookup("svrx", 0) is None
+    assert names(object_index.children("svrx")) == ["svrx.0002"]
+
+
+def test_deleted(objects):
+    assert object_index.lookup("svrx", 0) is not None
+    objects.remove("svrx.0000")
+    assert names(object_index.children("svrx")) == ["svrx.0001", "svrx.0002"]
+    assert object_index.lookup("svrx", 0) is None
+    objects.remove("svrx.0002")
+    assert object_index.lookup("svrx", 2) is None
+    assert names(object_index.children("svrx")) == ["svrx.0001"]
+
+
+def test_add_remove(objects):
+    new = FakeObject("other.0000", "other", 0)
+    objects.by_name[new.name] = new
+    object_index.add(new, "other", 0)
+    assert object_index.lookup("other", 0) is new
+    object_index.remove("other", 0)
+    assert object_index.lookup("other", 0) is None
+
+
+def test_invalidate_rescans(objects, monkeypatch):
+    assert object_index.lookup("svrx", 0) is not None
+    # a new file, the same names are other objects
+    loaded = FakeObjects(FakeObject("svrx.0000", "svrx", 3), FakeObject("svrx.0007", "svrx", 0))
+    monkeypatch.setattr(object_index, "_objects", lambda: loaded)
+    object_index.invalidate()
+    assert object_index.lookup("svrx", 0) is loaded.get("svrx.0007")
+    assert names(object_index.children("svrx")) == ["svrx.0007", "svrx.0000"]
+
+
+def test_invalidated_on_file_load(monkeypatch):
+    pytest.importorskip("bpy")
+    from svrx.core import handler
+    calls = []
+    monkeypatch.setattr(object_index, "invalidate", lambda: calls.append(True))
+    handler.sv_file_load(None)
+    assert calls
@@ -0,0 +1,69 @@
+#
+# Needs blender with the add-on enabled for the node functions,
+# skipped otherwise.
+#
+
+import json
+import tracemalloc
+
+import numpy as np
+import pytest
+
+pytest.importorskip("bpy")
+
+from svrx.core.offline import Plan, LayoutBuilder
+from svrx.core.serialize import load_layout
+
+
+def small_layout():
+    b = LayoutBuilder("RoundTrip")
+    plane = b.add("SvRxNodeGenPlane", mode="Grid", X=4, Y=3)
+    out = b.add("SvRxNodeRxMeshOut", name="Out")
+    for i in range(3):
+        b.link(plane, i, out, i)
+    numbers = b.add("SvRxNodeNumberRangeInt", mode="Count", Start=1, Count=5)
+    add = b.add("SvRxNodeMath", mode="Add")
+    probe = b.add("SvRxNodeStethoscope", name="Probe")
+    b.link(numbers, 0, add, 0)
+    b.link(add, 0, probe, 0)
+    return b.layout
+
+
+def leaves(sinks):
+    return {(node, socket): list(tree)
+            for node, trees in sinks.items() for socket, tree in trees.items()}
+
+
+def same_leaf(a, b):
+    if hasattr(a, 'vertex_indices'):
+        return all(np.array_equal(getattr(a, k), getattr(b, k))
+                   for k in ('loop_start', 'loop_total', 'vertex_indices'))
+    return np.array_equal(np.asarray(a), np.asarray(b))
+
+
+def test_round_trip(tmp_path):
+    layout = small_layout()
+    before = leaves(Plan(layout).execute())
+
+    path = str(tmp_path / "layout.json")
+    with open(path, 'w') as layout_file:
+        json.dump(layout, layout_file)
+    after = leaves(Plan(load_layout(path)).execute())
+
+    assert set(before) == set(after)
+    assert ('Out', 'Verts') in before and ('Probe', 'Data') in before
+    for key, data in before.items():
+        assert len(data) == len(after[key])
+        assert all(same_leaf(a, b) for a, b in zip(data, after[key]))
+
+
+def test_trace_memory_stops_on_error(monkeypatch):
+    plan = Plan(small_layout())
+
+    def fail(*args):
+        raise RuntimeError("node failed")
+
+    monkeypatch.setattr(plan, "_run_node", fail)
+    with pytest.raises(RuntimeError):
+        plan.execute(trace_memory=True)
+    assert not tracemalloc.is_tracing()
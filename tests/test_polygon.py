@@ -0,0 +1,245 @@
+import numpy as np
+
+from svrx.util.smesh import SvPolygon
+from svrx.util.polygon import (triangulate, face_edges, face_offsets, next_loop,
+                               face_info, face_normals, face_areas, face_perimeters,
+                               face_centers)
+
+
+def rotation():
+    a, b = 0.7, 0.4
+    rx = np.array([[1, 0, 0], [0, np.cos(a), -np.sin(a)], [0, np.sin(a), np.cos(a)]])
+    ry = np.array([[np.cos(b), 0, np.sin(b)], [0, 1, 0], [-np.sin(b), 0, np.cos(b)]])
+    return ry.dot(rx)
+
+
+def star(n, r0=1.0, r1=0.4):
+    t = np.linspace(0, 2 * np.pi, 2 * n, endpoint=False)
+    r = np.where(np.arange(2 * n) % 2, r1, r0)
+    return np.column_stack((r * np.cos(t), r * np.sin(t)))
+
+
+def outlines():
+    """mixed tris, quads and concave n-gons as 2d outlines, counter clockwise"""
+    return [
+        np.array([[0, 0], [1, 0], [0, 1]]),
+        np.array([[0, 0], [2, 0], [2, 1], [0, 1]]),
+        # concave quad, the reflex corner is the first one
+        np.array([[0.5, 0.4], [0, 0], [1, 0.5], [0, 1]]),
+        # L shape
+        np.array([[0, 0], [2, 0], [2, 1], [1, 1], [1, 2], [0, 2]]),
+        # arrow, reflex corner first so a fan from it fails
+        np.array([[1, 0.5], [0, 0], [2, 1], [0, 2]]),
+        star(5),
+        # convex pentagon
+        np.array([[0, 0], [2, 0], [3, 1], [1, 2], [-1, 1]]),
+    ]
+
+
+def make_mesh(outlines, order=None):
+    """
+    vertices (N, 4) of the outlines tilted out of the xy plane and the faces,
+    with order the faces are stored in the loop array in that order
+    """
+    rot = rotation()
+    verts, faces, start = [], [], 0
+    for i, outline in enumerate(outlines):
+        co = np.column_stack((outline, np.zeros(len(outline)))).dot(rot.T) + (i, 0, 0)
+        verts.append(co)
+        faces.append(np.arange(start, start + len(co), dtype=np.uint32))
+        start += len(co)
+    co = np.concatenate(verts)
+    vertices = np.column_stack((co, np.ones(len(co))))
+
+    if order is None:
+        return vertices, SvPolygon.from_pydata(faces)
+    loop_total = np.array([len(f) for f in faces], dtype=np.uint32)
+    loop_start = np.empty(len(faces), dtype=np.uint32)
+    pos = 0
+    for f in order:
+        loop_start[f] = pos
+        pos += len(faces[f])
+    vertex_indices = np.concatenate([faces[f] for f in order])
+    return vertices, SvPolygon(loop_start, loop_total, vertex_indices)
+
+
+def polygon_area(outline):
+    x, y = outline[:, 0], outline[:, 1]
+    return 0.5 * np.sum(x * np.roll(y, -1) - np.roll(x, -1) * y)
+
+
+def tri_normals(vertices, tris):
+    co = vertices[:, :3]
+    return np.cross(co[tris[:, 1]] - co[tris[:, 0]], co[tris[:, 2]] - co[tris[:, 0]])
+
+
+def check(vertices, poly, shapes):
+    tris, tri_face = triangulate(poly, vertices)
+    normals = tri_normals(vertices, tris)
+    up = rotation().dot((0, 0, 1))
+    for f, outline in enumerate(shapes):
+        mine = tri_face == f
+        # reference tessellation of a simple n-gon, n - 2 triangles
+        # covering exactly its area, all facing the same way as the face
+        assert mine.sum() == len(outline) - 2
+        face = set(poly[f].tolist())
+        assert set(tris[mine].ravel().tolist()) <= face
+        facing = normals[mine].dot(up)
+        assert np.all(facing > 0)
+        area = 0.5 * np.sqrt((normals[mine] ** 2).sum(axis=1)).sum()
+        assert np.isclose(area, polygon_area(outline))
+
+
+def test_triangulate_mixed():
+    shapes = outlines()
+    vertices, poly = make_mesh(shapes)
+    check(vertices, poly, shapes)
+
+
+def test_triangulate_not_packed():
+    shapes = outlines()
+    order = list(reversed(range(len(shapes))))
+    vertices, poly = make_mesh(shapes, order)
+    assert poly.loop_start[0] != 0
+    check(vertices, poly, shapes)
+
+
+def test_triangulate_fan_without_vertices():
+    shapes = outlines()
+    vertices, poly = make_mesh(shapes)
+    tris, tri_face = triangulate(poly)
+    assert len(tris) == sum(len(s) - 2 for s in shapes)
+    assert tris.dtype == np.uint32
+    assert np.array_equal(np.bincount(tri_face), [len(s) - 2 for s in shapes])
+
+
+def test_triangulate_empty():
+    tris, tri_face = triangulate(SvPolygon.from_pydata([]))
+    assert tris.shape == (0, 3) and len(tri_face) == 0
+
+
+def grid_quads():
+    """2 x 1 quads sharing the edge (1, 4)
+        3 - 4 - 5
+        |   |   |
+        0 - 1 - 2
+    """
+    return SvPolygon.from_pydata([[0, 1, 4, 3], [1, 2, 5, 4]])
+
+
+def test_face_edges_shared_edge_once():
+    edges, loop_edge = face_edges(grid_quads())
+    assert edges.dtype == np.uint32
+    assert edges.tolist() == [[0, 1], [0, 3], [1, 2], [1, 4], [2, 5], [3, 4], [4, 5]]
+    # both faces point their loop at the same shared edge
+    shared = edges.tolist().index([1, 4])
+    assert loop_edge[1] == shared and loop_edge[7] == shared
+
+
+def test_face_edges_reversed_duplicates():
+    # the same triangle twice with opposite winding
+    poly = SvPolygon.from_pydata([[0, 1, 2], [2, 1, 0]])
+    edges, loop_edge = face_edges(poly, np.array([[1, 0], [0, 1]]))
+    assert edges.tolist() == [[0, 1], [0, 2], [1, 2]]
+    assert sorted(loop_edge[:3].tolist()) == sorted(loop_edge[3:].tolist())
+
+
+def test_face_edges_loose_kept():
+    loose = np.array([[6, 7], [5, 6], [4, 1]])
+    edges, loop_edge = face_edges(grid_quads(), loose)
+    assert len(edges) == 9
+    found = edges.tolist()
+    assert [5, 6] in found and [6, 7] in found
+    assert len(loop_edge) == 8
+    assert loop_edge.max() < len(edges)
+
+
+def test_face_edges_loop_to_next_loop():
+    shapes = outlines()
+    for order in (None, list(reversed(range(len(shapes))))):
+        vertices, poly = make_mesh(shapes, order)
+        edges, loop_edge = face_edges(poly)
+        for f in range(len(poly)):
+            start, total = int(poly.loop_start[f]), int(poly.loop_total[f])
+            for i in range(total):
+                a = poly.vertex_indices[start + i]
+                b = poly.vertex_indices[start + (i + 1) % total]
+                assert sorted(edges[loop_edge[start + i]].tolist()) == sorted((a, b))
+
+    # packed faces, loop i and next_loop(i) are the ends of edge loop_edge[i]
+    poly = grid_quads()
+    edges, loop_edge = face_edges(poly)
+    total = poly.loop_total.astype(np.int64)
+    nxt = next_loop(face_offsets(total), total)
+    v = poly.vertex_indices
+    ends = np.sort(np.column_stack((v, v[nxt])), axis=1)
+    assert np.array_equal(edges[loop_edge], ends)
+
+
+def test_face_edges_empty():
+    edges, loop_edge = face_edges(SvPolygon.from_pydata([]), np.array([[2, 3]]))
+    assert edges.tolist() == [[2, 3]]
+    assert len(loop_edge) == 0
+
+
+def reference_faces():
+    """
+    faces with hand computed area, center, normal and perimeter
+        unit quad, counter clockwise seen from +z
+        the same quad wound the other way
+        non-planar quad, corner 2 lifted to z = 1, Newell vector
+            (v2 - v0) x (v3 - v1) = (1, 1, 1) x (-1, 1, 0) = (-1, -1, 2)
+        concave L shaped hexagon at z = 5
+        degenerate, three points on a line, zero length normal
+    """
+    faces = [
+        [(0, 0, 0), (1, 0, 0), (1, 1, 0), (0, 1, 0)],
+        [(0, 1, 0), (1, 1, 0), (1, 0, 0), (0, 0, 0)],
+        [(0, 0, 0), (1, 0, 0), (1, 1, 1), (0, 1, 0)],
+        [(0, 0, 5), (2, 0, 5), (2, 1, 5), (1, 1, 5), (1, 2, 5), (0, 2, 5)],
+        [(0, 0, 0), (1, 0, 0), (2, 0, 0)],
+    ]
+    s6 = np.sqrt(6.0)
+    s2 = np.sqrt(2.0)
+    areas = [1.0, 1.0, s6 / 2, 3.0, 0.0]
+    centers = [(0.5, 0.5, 0), (0.5, 0.5, 0), (0.5, 0.5, 0.25), (1, 1, 5), (1, 0, 0)]
+    normals = [(0, 0, 1), (0, 0, -1), (-1 / s6, -1 / s6, 2 / s6), (0, 0, 1), (0, 0, 0)]
+    perimeters = [4.0, 4.0, 2 + 2 * s2, 8.0, 4.0]
+
+    co = np.array([c for face in faces for c in face], dtype=np.float64)
+    vertices = np.column_stack((co, np.ones(len(co))))
+    indices, start = [], 0
+    for face in faces:
+        indices.append(list(range(start, start + len(face))))
+        start += len(face)
+    expected = [np.array(a, dtype=np.float64) for a in (areas, centers, normals, perimeters)]
+    return vertices, SvPolygon.from_pydata(indices), expected
+
+
+def test_face_kernels_reference():
+    vertices, poly, (areas, centers, normals, perimeters) = reference_faces()
+    np.testing.assert_allclose(face_areas(vertices, poly), areas, atol=1e-12)
+    np.testing.assert_allclose(face_centers(vertices, poly), centers, atol=1e-12)
+    np.testing.assert_allclose(face_normals(vertices, poly), normals, atol=1e-12)
+    np.testing.assert_allclose(face_perimeters(vertices, poly), perimeters, atol=1e-12)
+
+
+def test_face_info_reference():
+    vertices, poly, expected = reference_faces()
+    for found, ref in zip(face_info(vertices, poly), expected):
+        np.testing.assert_allclose(found, ref, atol=1e-12)
+
+
+def test_face_normals_unnormalized():
+    vertices, poly, (areas, _, normals, _) = reference_faces()
+    newell = face_normals(vertices, poly, normalize=False)
+    # twice the area, along the normal
+    np.testing.assert_allclose(newell, normals * (2 * areas)[:, np.newaxis], atol=1e-12)
+    assert np.all(newell[4] == 0)
+
+
+def test_face_info_empty():
+    vertices, _, _ = reference_faces()
+    areas, centers, normals, perimeters = face_info(vertices, SvPolygon.from_pydata([]))
+    assert areas.shape == (0,) and perimeters.shape == (0,)
+    assert centers.shape == (0, 3) and normals.shape == (0, 3)
@@ -0,0 +1,31 @@
+import types
+
+import pytest
+
+from svrx.core.serialize import json_value, layout_as_json
+
+
+def fake_link(from_node, to_node, valid=True):
+    return types.SimpleNamespace(
+        from_node=types.SimpleNamespace(name=from_node),
+        from_socket=types.SimpleNamespace(name="Vertices", index=0),
+        to_node=types.SimpleNamespace(name=to_node),
+        to_socket=types.SimpleNamespace(name="Vertices", index=0),
+        is_valid=valid)
+
+
+def test_invalid_link_refused():
+    ng = types.SimpleNamespace(name="Tree", nodes=[],
+                               links=[fake_link("Plane", "Out"),
+                                      fake_link("Circle", "Viewer", valid=False)])
+    with pytest.raises(ValueError) as err:
+        layout_as_json(ng)
+    assert "Circle:Vertices -> Viewer:Vertices" in str(err.value)
+    assert "Plane" not in str(err.value)
+
+
+def test_json_value():
+    assert json_value({'B', 'A'}) == ['A', 'B']
+    assert json_value((1.0, 2.0)) == [1.0, 2.0]
+    assert json_value(types.SimpleNamespace(name="Cube")) == "Cube"
+    assert json_value(None) is None
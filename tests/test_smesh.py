@@ -0,0 +1,61 @@
+import numpy as np
+
+from svrx.util.smesh import SvPolygon, topology_key, fingerprint
+from svrx.util.topology import plane_edges, plane_faces
+from svrx.util.vertices import new_vertices
+
+
+def grid(x=4, y=3):
+    verts = new_vertices((x * y,))
+    verts[:, 0] = np.tile(np.arange(x), y)
+    verts[:, 1] = np.repeat(np.arange(y), x)
+    verts[:, 2] = 0
+    return verts, plane_edges(x, y), plane_faces(y, x)
+
+
+def test_vertex_change_keeps_topology():
+    verts, edges, faces = grid()
+    before = fingerprint(verts, edges, faces)
+    moved = verts.copy()
+    moved[:, 2] = np.sin(moved[:, 0])
+    after = fingerprint(moved, edges, faces)
+    assert after[1] == before[1] == topology_key(edges, faces)
+    assert after[0] != before[0]
+    assert fingerprint(verts.copy(), edges.copy(), faces) == before
+
+
+def test_partition_changes_key():
+    loops = np.arange(6, dtype=np.uint32)
+    two_tris = SvPolygon(np.array([0, 3], dtype=np.uint32), np.array([3, 3], dtype=np.uint32),
+                         loops)
+    quad_and_edge = SvPolygon(np.array([0, 4], dtype=np.uint32), np.array([4, 2], dtype=np.uint32),
+                              loops.copy())
+    hexagon = SvPolygon(np.array([0], dtype=np.uint32), np.array([6], dtype=np.uint32),
+                        loops.copy())
+    keys = {topology_key(None, poly) for poly in (two_tris, quad_and_edge, hexagon)}
+    assert len(keys) == 3
+
+
+def test_topology_changes_key():
+    verts, edges, faces = grid()
+    key = topology_key(edges, faces)
+    changed = faces.vertex_indices.copy()
+    changed[[0, 1]] = changed[[1, 0]]
+    flipped = SvPolygon(faces.loop_start, faces.loop_total, changed)
+    assert topology_key(edges, flipped) != key
+    assert topology_key(edges[:-1], faces) != key
+    assert topology_key(None, faces) != key
+    assert topology_key(edges, None) != key
+
+
+def test_pydata_faces_same_key():
+    faces = [[0, 1, 4, 3], [1, 2, 5, 4]]
+    assert topology_key(None, faces) == topology_key(None, SvPolygon.from_pydata(faces))
+    assert topology_key() == (None,)
+    assert fingerprint(None) == (None, (None,))
+
+
+def test_not_contiguous():
+    verts, edges, faces = grid()
+    strided = edges[::2]
+    assert topology_key(strided, faces) == topology_key(strided.copy(), faces)
@@ -0,0 +1,65 @@
+import numpy as np
+
+from svrx.util.smesh import SvPolygon
+from svrx.util.summary import summarize_tree, leaf_stats
+
+
+class Tree:
+    """the parts of SvDataTree summarize_tree looks at"""
+    def __init__(self, data=None, children=()):
+        self.data = data
+        self.children = list(children)
+        self.level = max((c.level + 1 for c in self.children), default=0)
+
+
+def deep_tree():
+    leaf = lambda: Tree(np.arange(10, dtype=np.int32))
+    return Tree(children=[Tree(children=[leaf() for _ in range(3)]) for _ in range(4)])
+
+
+LEAF = [
+    "int32 (10,) min 0 max 9 mean 4.5",
+    "  0",
+    "  1",
+    "  ... 6 rows ...",
+    "  8",
+    "  9",
+]
+
+
+def test_children_and_head_truncated():
+    lines = summarize_tree(deep_tree(), max_children=2, head=2, max_lines=100, max_time=10)
+    branch = ["  [3 items, level 1]"] + ["    " + l for l in LEAF] * 2 + ["    ... 1 more"]
+    assert lines == ["[4 items, level 2]"] + branch * 2 + ["  ... 2 more"]
+
+
+def test_max_lines():
+    lines = summarize_tree(deep_tree(), max_children=2, head=2, max_lines=5, max_time=10)
+    assert len(lines) == 6
+    assert lines[:5] == ["[4 items, level 2]", "  [3 items, level 1]"] + ["    " + l for l in LEAF[:3]]
+    assert lines[-1] == "... output cut at 5 lines"
+
+
+def test_shape_only():
+    lines = summarize_tree(deep_tree(), shape=True, max_children=1, max_time=10)
+    assert lines == ["[4 items, level 2]", "  [3 items, level 1]", "    " + LEAF[0],
+                     "    ... 2 more", "  ... 3 more"]
+
+
+def test_huge_leaf_summarized():
+    data = np.arange(10**6, dtype=np.float64)
+    data[5] = np.nan
+    lines = summarize_tree(Tree(data), head=3, max_time=10)
+    assert lines[0] == leaf_stats(data)
+    assert lines[0] == "float64 (1000000,) min 0 max 1e+06 mean 5e+05 NaN 1"
+    assert len(lines) == 8
+    assert lines[4] == "  ... 999994 rows ..."
+
+
+def test_leaf_kinds():
+    poly = SvPolygon.from_pydata([[0, 1, 2], [0, 2, 3, 4]])
+    assert summarize_tree(Tree(poly)) == ["2 faces, 7 loops",
+                                          "face size uint32 (2,) min 3 max 4 mean 3.5"]
+    assert leaf_stats(np.full(3, np.nan)) == "float64 (3,) all NaN"
+    assert leaf_stats(np.array(["a"])) == "<U1 (1,)"
+    assert summarize_tree(Tree([1, 2])) == ["list len 2"]
@@ -0,0 +1,75 @@
+#
+# Needs blender with the add-on enabled for the node functions,
+# skipped otherwise.
+#
+
+import os
+
+import numpy as np
+import pytest
+
+pytest.importorskip("bpy")
+
+from svrx.core.offline import Plan, LayoutBuilder
+from svrx.core.sweep import sweep, grid_variants, write_npz
+
+
+GRID = {"Plane:X": [2, 3], "Add:Y": [1.0, 5.0]}
+
+
+def small_layout():
+    b = LayoutBuilder("Sweep")
+    plane = b.add("SvRxNodeGenPlane", mode="Grid", name="Plane", Y=2)
+    out = b.add("SvRxNodeRxMeshOut", name="Out")
+    for i in range(3):
+        b.link(plane, i, out, i)
+    numbers = b.add("SvRxNodeNumberRangeInt", mode="Count", name="Numbers", Start=1, Count=4)
+    add = b.add("SvRxNodeMath", mode="Add", name="Add")
+    probe = b.add("SvRxNodeStethoscope", name="Probe")
+    b.link(numbers, 0, add, 0)
+    b.link(add, 0, probe, 0)
+    return b.layout
+
+
+def load(path):
+    with np.load(path) as npz:
+        return {key: npz[key] for key in npz.files}
+
+
+def test_sweep_matches_serial(tmp_path):
+    out_dir = str(tmp_path / "sweep")
+    report = sweep(small_layout(), GRID, out_dir=out_dir, processes=1)
+
+    variants = grid_variants(GRID)
+    assert report['variants'] == len(variants) == 4
+    assert os.path.exists(os.path.join(out_dir, "sweep.json"))
+
+    for result, values in zip(report['results'], variants):
+        assert result['params'] == dict(values)
+        plan = Plan(small_layout())
+        for key, value in values:
+            plan.set_param(key, value)
+        serial_path = str(tmp_path / "serial.npz")
+        write_npz(serial_path, plan.execute())
+
+        swept, serial = load(result['file']), load(serial_path)
+        assert sorted(swept) == sorted(serial)
+        for key in serial:
+            assert np.array_equal(swept[key], serial[key]), key
+
+        x = dict(values)["Plane:X"]
+        assert len(swept["Out.Verts.0"]) == x * 2
+        y = dict(values)["Add:Y"]
+        probe = sorted((k for k in swept if k.startswith("Probe.Data.")),
+                       key=lambda k: int(k.rpartition(".")[2]))
+        found = np.concatenate([np.atleast_1d(swept[k]) for k in probe])
+        assert np.allclose(found, np.arange(1, 5) + y)
+
+
+def test_set_param_refuses_linked():
+    plan = Plan(small_layout())
+    with pytest.raises(ValueError):
+        plan.set_param("Add:X", 3.0)
+    with pytest.raises(KeyError):
+        plan.set_param("Add:Nothing", 3.0)
+    plan.set_param("Add:Y", 3.0)
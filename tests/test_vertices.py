@@ -0,0 +1,40 @@
+import numpy as np
+
+from svrx.util.vertices import (layout_scope, compact_mode, new_vertices, transform,
+                                homogeneous, as_layout)
+
+
+def test_layout_scope():
+    assert not compact_mode()
+    with layout_scope(True):
+        assert new_vertices(4).shape == (4, 3)
+        with layout_scope(False):
+            assert new_vertices(4).dtype == np.float64
+        assert compact_mode()
+    assert not compact_mode()
+    verts = new_vertices(2)
+    assert verts.shape == (2, 4) and np.all(verts[:, 3] == 1)
+
+
+def test_layout_scope_error():
+    try:
+        with layout_scope(True):
+            raise ValueError
+    except ValueError:
+        pass
+    assert not compact_mode()
+
+
+def test_transform_compact():
+    mat = np.eye(4)
+    mat[:3, :3] *= 2.0
+    mat[:3, 3] = (1, 2, 3)
+    full = homogeneous(np.arange(15, dtype=np.float64).reshape(5, 3))
+    compact = as_layout(full, True)
+    out = transform(compact, mat)
+    assert out.dtype == np.float32 and out.shape == (5, 3)
+    assert np.allclose(out, transform(full, mat)[:, :3])
+
+    mat[3] = (0, 0, 1, 1)
+    co = transform(full, mat)
+    assert np.allclose(transform(compact, mat), co[:, :3] / co[:, 3:])
@@ -8,6 +8,12 @@ from bpy.props import (BoolProperty, EnumProperty,
 
 class SvRxBaseType:
     iterable = False
+    # data contract, the numpy dtype and shape of each item on the socket.
+    # None means anything, a None in shape is a free dimension.
+    # If exact_dtype is False only the kind (int, float) has to match
+    dtype = None
+    shape = None
+    exact_dtype = True
 
     def __init__(self, name=None, iterable=None):
         if name is None:
@@ -42,6 +48,8 @@ class Anytype(SvRxBaseType):
 class Number(SvRxBaseType):
     bl_idname = "SvRxSocketFloat"
     iterable = True
+    shape = (None,)
+    exact_dtype = False
 
     def __init__(self, name=None, iterable=None, min=None, max=None):
         super().__init__(name, iterable)
@@ -58,6 +66,8 @@ class Number(SvRxBaseType):
 
 
 class Int(Number):
+    dtype = np.dtype(np.int64)
+
     @property
     def bl_idname(self):
         if self.max is not None or self.min is not None:
@@ -67,10 +77,12 @@ class Int(Number):
 
 
 class Bool(Int):
-    pass
+    dtype = np.dtype(bool)
 
 
 class Float(Number):
+    dtype = np.dtype(np.float64)
+
     @property
     def bl_idname(self):
         if self.max is not None or self.min is not None:
@@ -81,6 +93,10 @@ class Float(Number):
 
 class Number4f(SvRxBaseType):
     iterable = True
+    dtype = np.dtype(np.float64)
+    shape = (None, 4)
+    # also accepted, the compact vertex layout, see svrx.util.vertices
+    compact = (np.dtype(np.float32), (None, 3), True)
 
 
 class Color(Number4f):
@@ -101,14 +117,19 @@ class Point(Number4f):
 
 class Edges(SvRxBaseType):
     bl_idname = "SvRxSocketTopo"
+    dtype = np.dtype(np.uint32)
+    shape = (None, 2)
 
 
 class Faces(SvRxBaseType):
     bl_idname = "SvRxSocketTopo"
+    # SvPolygon, the contract is for its index arrays
+    dtype = np.dtype(np.uint32)
 
 
 class TopoData(Edges, Faces):
     bl_idname = "SvRxSocketTopo"
+    shape = None
 
 
 class String(SvRxBaseType):
@@ -124,6 +145,8 @@ class Matrix(SvRxBaseType):
     bl_idname = "SvRxSocketMatrix"
     identity = np.identity(4)
     iterable = False
+    dtype = np.dtype(np.float64)
+    shape = (4, 4)
 
 
 class Mesh(SvRxBaseType):
@@ -141,6 +164,11 @@ class SMesh(Mesh):
     iterable = False
 
 
+class Instances(SvRxBaseType):
+    bl_idname = "SvRxSocketInstances"
+    iterable = False
+
+
 # Property types
 
 
@@ -234,7 +262,7 @@ class ObjectValue(Object):
     bl_idname = "SvRxSocketValueObject"
 
 
-bases = [Number, Number4f, Mesh, Object, String, Matrix, Anytype, Faces, Edges]
+bases = [Number, Number4f, Mesh, Object, String, Matrix, Anytype, Faces, Edges, Instances]
 _lookup = {}
 
 
@@ -20,6 +20,7 @@
 
 import bpy
 from svrx.core.tree import svrx_trees
+from svrx.core import cost, inference
 
 
 class SvRxPanelDebug(bpy.types.Panel):
@@ -43,8 +44,26 @@ class SvRxPanelDebug(bpy.types.Panel):
         layout.label("Timings")
         layout.prop(ng, "do_timings_text")
         layout.prop(ng, "do_timings_graphics")
+        row = layout.row(align=True)
+        row.prop(ng, "do_timings_heatmap")
+        row.prop(ng, "heatmap_mode", text="")
         layout.label("Options")
         layout.prop(ng, "rx_real_nodes")
+        layout.prop(ng, "rx_compact_vertices")
+        layout.prop(ng, "rx_check_contracts")
+        issues = inference.last_issues.get(ng.name)
+        if issues:
+            col = layout.column(align=True)
+            col.label("{} data issues".format(len(issues)), icon='ERROR')
+            for issue in issues[:5]:
+                col.label(issue)
+        layout.label("Budget")
+        col = layout.column(align=True)
+        col.prop(ng, "rx_memory_budget")
+        col.prop(ng, "rx_time_budget")
+        if ng.name in cost.last_estimate:
+            nbytes, seconds = cost.last_estimate[ng.name]
+            layout.label("Estimate: {:.1f} MB {:.2f} s".format(nbytes / 2**20, seconds))
 
 
 class SvRxPanelControl(bpy.types.Panel):
@@ -22,8 +22,9 @@ import bgl
 
 from bpy.types import SpaceNodeEditor
 
+from svrx.util.draw_handlers import DrawHandlers
+
 
-callback_dict = {}
 point_dict = {}
 
 
@@ -44,33 +45,29 @@ def tag_redraw_all_nodeviews():
                         region.tag_redraw()
 
 
-def callback_enable(*args):
-    n_id = args[0]
-    global callback_dict
-    if n_id in callback_dict:
-        return
+def begin_batch():
+    """see DrawHandlers.begin_batch"""
+    _handlers.begin_batch()
+
+
+def end_batch():
+    _handlers.end_batch()
 
-    handle_pixel = SpaceNodeEditor.draw_handler_add(draw_callback_px, args, 'WINDOW', 'POST_VIEW')
-    callback_dict[n_id] = handle_pixel
-    tag_redraw_all_nodeviews()
+
+def callback_enable(*args, overlay='POST_VIEW'):
+    """
+    args is (n_id, data), data a dict. If n_id is already enabled with
+    the same overlay its data is updated in place
+    """
+    _handlers.enable(args, overlay)
 
 
 def callback_disable(n_id):
-    global callback_dict
-    handle_pixel = callback_dict.get(n_id, None)
-    if not handle_pixel:
-        return
-    SpaceNodeEditor.draw_handler_remove(handle_pixel, 'WINDOW')
-    del callback_dict[n_id]
-    tag_redraw_all_nodeviews()
+    _handlers.disable(n_id)
 
 
 def callback_disable_all():
-    global callback_dict
-    temp_list = list(callback_dict.keys())
-    for n_id in temp_list:
-        if n_id:
-            callback_disable(n_id)
+    _handlers.disable_all()
 
 
 def restore_opengl_defaults():
@@ -99,5 +96,9 @@ def draw_callback_px(n_id, data):
     restore_opengl_defaults()
 
 
+_handlers = DrawHandlers(SpaceNodeEditor, draw_callback_px, tag_redraw_all_nodeviews)
+callback_dict = _handlers.callback_dict
+
+
 def unregister():
     callback_disable_all()
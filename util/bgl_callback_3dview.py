@@ -19,10 +19,10 @@
 import bpy
 import bgl
 
+from svrx.util.draw_handlers import DrawHandlers
 
-SpaceView3D = bpy.types.SpaceView3D
 
-callback_dict = {}
+SpaceView3D = bpy.types.SpaceView3D
 
 
 def tag_redraw_all_3dviews():
@@ -35,30 +35,29 @@ def tag_redraw_all_3dviews():
                         region.tag_redraw()
 
 
-def callback_enable(*args, overlay='POST_VIEW'):
-    n_id = args[0]
-    if n_id in callback_dict:
-        return
+def begin_batch():
+    """see DrawHandlers.begin_batch"""
+    _handlers.begin_batch()
 
-    handle_pixel = SpaceView3D.draw_handler_add(draw_callback_px, args, 'WINDOW', overlay)
-    callback_dict[n_id] = handle_pixel
-    tag_redraw_all_3dviews()
+
+def end_batch():
+    _handlers.end_batch()
+
+
+def callback_enable(*args, overlay='POST_VIEW'):
+    """
+    args is (n_id, data), data a dict. If n_id is already enabled with
+    the same overlay its data is updated in place
+    """
+    _handlers.enable(args, overlay)
 
 
 def callback_disable(n_id):
-    handle_pixel = callback_dict.get(n_id, None)
-    if not handle_pixel:
-        return
-    SpaceView3D.draw_handler_remove(handle_pixel, 'WINDOW')
-    del callback_dict[n_id]
-    tag_redraw_all_3dviews()
+    _handlers.disable(n_id)
 
 
 def callback_disable_all():
-    temp_list = list(callback_dict.keys())
-    for n_id in temp_list:
-        if n_id:
-            callback_disable(n_id)
+    _handlers.disable_all()
 
 
 def restore_opengl_defaults():
@@ -82,5 +81,9 @@ def draw_callback_px(n_id, data):
     ###
 
 
+_handlers = DrawHandlers(SpaceView3D, draw_callback_px, tag_redraw_all_3dviews)
+callback_dict = _handlers.callback_dict
+
+
 def unregister():
     callback_disable_all()
@@ -0,0 +1,188 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; either version 2
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+#
+# Flat arrays for drawing meshes with GL vertex arrays, built once per
+# execution and kept for every redraw. Only numpy here so it works without
+# Blender, the bgl.Buffer wrapping is done by the viewer.
+#
+
+import numpy as np
+
+from svrx.util.polygon import face_centers
+
+
+def _coords(vertices):
+    co = np.asarray(vertices, dtype=np.float32)
+    if not len(co):
+        return np.empty((0, 3), dtype=np.float32)
+    return co[:, :3]
+
+
+def draw_arrays(vertices, tri_index, tri_colors, edges):
+    """
+    vertices,   list of (V, 3) or (V, 4) coordinates, one per mesh
+    tri_index,  list of flat (3T,) triangle corner indices, can be empty
+    tri_colors, list of (T, 3) colors, one per triangle
+    edges,      list of (E, 2) vertex indices, can be empty
+
+    returns dict of contiguous arrays covering all meshes
+        points      (V, 3) float32 every vertex
+        tri_co      (3T, 3) float32 triangle corners, not indexed so the
+                    color stays flat over each triangle
+        tri_color   (3T, 3) float32
+        edge_index  (2E,) uint32 indices into points
+    """
+    points, tri_co, tri_color, edge_index = [], [], [], []
+    offset = 0
+    for verts, tris, colors, mesh_edges in zip(vertices, tri_index, tri_colors, edges):
+        co = _coords(verts)
+        points.append(co)
+        if tris is not None and len(tris):
+            tris = np.asarray(tris, dtype=np.int64).ravel()
+            tri_co.append(co[tris])
+            colors = np.asarray(colors, dtype=np.float32).reshape(-1, 3)
+            tri_color.append(np.repeat(colors[:len(tris) // 3], 3, axis=0))
+        if mesh_edges is not None and len(mesh_edges):
+            edge_index.append(np.asarray(mesh_edges, dtype=np.uint32).ravel() + offset)
+        offset += len(co)
+
+    def join(arrays, shape, dtype):
+        if not arrays:
+            return np.empty(shape, dtype=dtype)
+        return np.ascontiguousarray(np.concatenate(arrays), dtype=dtype)
+
+    return {
+        'points': join(points, (0, 3), np.float32),
+        'tri_co': join(tri_co, (0, 3), np.float32),
+        'tri_color': join(tri_color, (0, 3), np.float32),
+        'edge_index': join(edge_index, (0,), np.uint32),
+    }
+
+
+def face_shading(normals, color, up=(0.0, 0.0, 1.0)):
+    """
+    viewer face colors, color scaled by the angle between
+    the face normal and up, over pi, plus 0.1
+    """
+    normals = np.asarray(normals, dtype=np.float64)[:, :3]
+    length = np.sqrt((normals ** 2).sum(axis=1))
+    cos = normals.dot(up) / np.where(length == 0, 1.0, length)
+    angle = np.arccos(np.clip(cos, -1.0, 1.0))
+    angle[length == 0] = 0.0
+    return (angle / np.pi)[:, np.newaxis] * np.asarray(color[:3]) + 0.1
+
+
+SUBSAMPLE_MODES = [
+    ('STRIDE', 'Stride', 'Every n:th element', 0),
+    ('RANDOM', 'Random', 'Random elements, same for the same seed', 1),
+]
+
+
+def subsample(count, budget, mode='STRIDE', seed=0):
+    """
+    sorted indices of at most budget out of count elements,
+    None if everything fits, a budget of 0 means no limit
+    """
+    if budget <= 0 or count <= budget:
+        return None
+    if mode == 'RANDOM':
+        indices = np.random.RandomState(seed).choice(count, budget, replace=False)
+        indices.sort()
+        return indices
+    return (np.arange(budget) * (count / budget)).astype(np.int64)
+
+
+def apply_budget(arrays, max_points=0, max_edges=0, max_tris=0, mode='STRIDE', seed=0):
+    """
+    limit the arrays from draw_arrays to the budgets, points over budget
+    get a 'point_index' into points so edges can still use every point.
+    returns arrays, {'points': (drawn, total), 'edges': ..., 'tris': ...}
+    """
+    arrays = dict(arrays)
+    point_count = len(arrays['points'])
+    edge_count = len(arrays['edge_index']) // 2
+    tri_count = len(arrays['tri_co']) // 3
+    counts = {'points': (point_count, point_count),
+              'edges': (edge_count, edge_count),
+              'tris': (tri_count, tri_count)}
+
+    keep = subsample(point_count, max_points, mode, seed)
+    if keep is not None:
+        arrays['point_index'] = keep.astype(np.uint32)
+        counts['points'] = len(keep), point_count
+
+    keep = subsample(edge_count, max_edges, mode, seed)
+    if keep is not None:
+        arrays['edge_index'] = arrays['edge_index'].reshape(-1, 2)[keep].ravel()
+        counts['edges'] = len(keep), edge_count
+
+    keep = subsample(tri_count, max_tris, mode, seed)
+    if keep is not None:
+        arrays['tri_co'] = arrays['tri_co'].reshape(-1, 3, 3)[keep].reshape(-1, 3)
+        arrays['tri_color'] = arrays['tri_color'].reshape(-1, 3, 3)[keep].reshape(-1, 3)
+        counts['tris'] = len(keep), tri_count
+
+    return arrays, counts
+
+
+def project_points(points, perspective, width, height, margin=0.0):
+    """
+    project (K, 4) world points with the (4, 4) view perspective matrix
+    into a width * height region in one go
+
+    returns (M, 2) pixel positions and the indices of the M points that
+    are in front of the view and inside the region plus margin pixels
+    """
+    clip = points.dot(np.asarray(perspective, dtype=np.float64).T)
+    w = clip[:, 3]
+    front = w > 0.0
+    ndc = clip[:, :2] / np.where(front, w, 1.0)[:, np.newaxis]
+    half = np.array([width / 2.0, height / 2.0])
+    pixel = half + half * ndc
+    inside = (front &
+              (pixel[:, 0] >= -margin) & (pixel[:, 0] <= width + margin) &
+              (pixel[:, 1] >= -margin) & (pixel[:, 1] <= height + margin))
+    visible = np.flatnonzero(inside)
+    return pixel[visible], visible
+
+
+def label_anchors(verts, edges, faces, kinds=('verts', 'edges', 'faces'), mask=None):
+    """
+    label indices and (K, 4) anchor positions of the kinds asked for,
+    vertices, edge midpoints and face centers, {kind: (indices, anchors)}
+    mask, indices to keep, None keeps every label
+    """
+    anchors = {}
+    if 'verts' in kinds:
+        anchors['verts'] = verts
+    if 'edges' in kinds and edges is not None and len(edges):
+        anchors['edges'] = (verts[edges[:, 0]] + verts[edges[:, 1]]) * 0.5
+    if 'faces' in kinds and faces is not None and len(faces):
+        centers = np.ones((len(faces), 4))
+        centers[:, :3] = face_centers(verts, faces)
+        anchors['faces'] = centers
+
+    found = {}
+    for kind, points in anchors.items():
+        indices = np.arange(len(points))
+        if mask is not None:
+            keep = np.isin(indices, mask)
+            indices, points = indices[keep], points[keep]
+        found[kind] = indices, points
+    return found
@@ -0,0 +1,113 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; either version 2
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+#
+# Bookkeeping of draw handlers shared by bgl_callback (node editor)
+# and bgl_callback_3dview, which only differ in the space, the draw
+# function and which views are redrawn.
+#
+
+
+class DrawHandlers:
+    """
+    draw handlers of one space by node id
+
+    space, the bpy.types.Space class the handlers are added to
+    draw_func, called by blender with (n_id, data)
+    redraw_all, tags all views of the space for redraw
+    """
+
+    def __init__(self, space, draw_func, redraw_all):
+        self.space = space
+        self.draw_func = draw_func
+        self.redraw_all = redraw_all
+        # {n_id: (handle, overlay, data)}
+        self.callback_dict = {}
+        # see begin_batch
+        self.depth = 0
+        self.disabled = set()
+        self.redraw = False
+
+    def tag_redraw(self):
+        if self.depth:
+            self.redraw = True
+        else:
+            self.redraw_all()
+
+    def begin_batch(self):
+        """
+        until the matching end_batch, disabled callbacks are kept so enabling
+        them again only updates their data, and the redraw is tagged once
+        """
+        self.depth += 1
+
+    def end_batch(self):
+        self.depth = max(self.depth - 1, 0)
+        if self.depth:
+            return
+        disabled = self.disabled
+        for n_id in disabled:
+            self.remove(n_id)
+        if disabled or self.redraw:
+            self.redraw_all()
+        self.disabled = set()
+        self.redraw = False
+
+    def remove(self, n_id):
+        entry = self.callback_dict.pop(n_id, None)
+        if entry:
+            self.space.draw_handler_remove(entry[0], 'WINDOW')
+
+    def enable(self, args, overlay='POST_VIEW'):
+        """
+        args is (n_id, data), data a dict. If n_id is already enabled with
+        the same overlay its data is updated in place
+        """
+        n_id, data = args[0], args[1]
+        self.disabled.discard(n_id)
+        entry = self.callback_dict.get(n_id)
+        if entry:
+            _, old_overlay, old_data = entry
+            if old_overlay == overlay:
+                if old_data is not data:
+                    old_data.clear()
+                    old_data.update(data)
+                self.tag_redraw()
+                return
+            self.remove(n_id)
+
+        handle = self.space.draw_handler_add(self.draw_func, args, 'WINDOW', overlay)
+        self.callback_dict[n_id] = handle, overlay, data
+        self.tag_redraw()
+
+    def disable(self, n_id):
+        if n_id not in self.callback_dict:
+            return
+        if self.depth:
+            self.disabled.add(n_id)
+            return
+        self.remove(n_id)
+        self.redraw_all()
+
+    def disable_all(self):
+        if not self.callback_dict:
+            return
+        for n_id in list(self.callback_dict.keys()):
+            self.remove(n_id)
+        self.disabled = set()
+        self.redraw_all()
@@ -29,11 +29,18 @@ import itertools
 
 import numpy as np
 
+from svrx.util.match import match_length, match_indices, take, gather_as, repeat_last, cycle
 
-def generator(func=None, match=None, limit=None):
+
+def generator(func=None, match=None, limit=None, batched=False):
     '''
     Will create a yeilding vectorized generator of the
     function it is applied to.
+
+    batched, the function is called once with every iterable parameter
+    matched to the same length instead of once per element. It should
+    return, per output, a stacked array or a list with one item per element,
+    ragged outputs are simply lists.
     '''
     def wrapper(func):
         sig = inspect.signature(func)
@@ -41,6 +48,7 @@ def generator(func=None, match=None, limit=None):
         for name, parameter in sig.parameters.items():
             m = getattr(parameter.annotation, "iterable", False)
             func.mask.append(not m)
+        multi_output = isinstance(sig.return_annotation, tuple)
 
         @wraps(func)
         def inner(*args, match=match):
@@ -51,6 +59,11 @@ def generator(func=None, match=None, limit=None):
                 parameters = [np.atleast_1d(arg) for arg in args]
             else:
                 parameters = [arg if m else np.atleast_1d(arg) for arg, m in zip(args, mask)]
+            if batched:
+                res = func(*match_arrays(parameters, mask, _match_modes.get(match, 'REPEAT'), limit))
+                if multi_output:
+                    return list(zip(*res))
+                return list(res)
             out = []
             for param in match(*parameters, limit=limit, mask=mask):
                 out.append(func(*param))
@@ -62,49 +75,77 @@ def generator(func=None, match=None, limit=None):
         return wrapper
 
 
-def match_long_repeat(*parameters, limit=None, mask=None):
-    if mask is None:
-        counts = [len(p) for p in parameters]
-    else:
-        counts = [1 if m else len(p) for m, p in zip(mask, parameters)]
-    if limit is not None:
-        max_len = counts[limit]
-    else:
-        max_len = max(counts)
+def _counts(parameters, mask, mode):
+    """
+    length of each parameter, masked parameters are passed whole and
+    don't take part in the matching so they get the matched length
+    """
     if mask is None:
-        for i in range(max_len):
-            args = []
-            for c, parameter in zip(counts, parameters):
-                args.append(parameter[min(c - 1, i)])
-            yield args
-    else:
-        for i in range(max_len):
-            args = []
-            for c, m, parameter in zip(counts, mask, parameters):
-                if m:
-                    args.append(parameter)
-                else:
-                    args.append(parameter[min(c - 1, i)])
-            yield args
+        return [len(p) for p in parameters]
+    counts = [None if m else len(p) for m, p in zip(mask, parameters)]
+    free = [c for c in counts if c is not None]
+    length = match_length(free, mode) if free else 1
+    return [length if c is None else c for c in counts]
 
 
-def match_long_cycle(*parameters, limit=None, mask=None):
-    counts = [len(p) for p in parameters]
-    if limit is not None:
-        max_len = counts[limit]
-    else:
-        max_len = max(counts)
+def _match(parameters, mask, mode, limit):
+    """
+    gather parameters to equal length, mask marks parameters
+    that are passed as they are for every call
+    """
+    counts = _counts(parameters, mask, mode)
+    length = match_length(counts, mode, limit)
+    if mask is None:
+        mask = itertools.repeat(False)
     args = []
-    for c, p in zip(counts, parameters):
-        if c < max_len:
-            args.append(itertools.cycle(p))
+    for c, m, parameter in zip(counts, mask, parameters):
+        if m:
+            args.append(itertools.repeat(parameter, length))
+        elif c >= length:
+            args.append(parameter)
+        elif mode == 'CYCLE':
+            # reuses the element objects, faster than gathering when iterated
+            args.append(itertools.islice(itertools.cycle(parameter), length))
         else:
-            args.append(p)
-    yield from zip(*args)
+            args.append(take(parameter, repeat_last(c, length)))
+    return args
+
+
+def match_long_repeat(*parameters, limit=None, mask=None):
+    yield from zip(*_match(parameters, mask, 'REPEAT', limit))
+
+
+def match_long_cycle(*parameters, limit=None, mask=None):
+    yield from zip(*_match(parameters, mask, 'CYCLE', limit))
 
 
 def match_short(*parameters, limit=None, mask=None):
-    yield from zip(*parameters)
+    yield from zip(*_match(parameters, mask, 'SHORT', limit))
+
+
+_match_modes = {
+    match_long_repeat: 'REPEAT',
+    match_long_cycle: 'CYCLE',
+    match_short: 'SHORT',
+}
+
+
+def match_arrays(parameters, mask=None, mode='REPEAT', limit=None):
+    """
+    match parameters to the same length as whole arrays,
+    masked parameters are passed as they are
+    """
+    counts = _counts(parameters, mask, mode)
+    length, indices = match_indices(counts, mode, limit)
+    if mask is None:
+        mask = itertools.repeat(False)
+    args = []
+    for c, m, idx, parameter in zip(counts, mask, indices, parameters):
+        if m or c == length:
+            args.append(parameter)
+        else:
+            args.append(take(parameter, idx))
+    return args
 
 
 def constant(func):
@@ -151,12 +192,7 @@ def array_as(a, shape):
 
 
 def array_as_cycle(a, shape):
-    if a.shape == shape:
-        return a
-    new_a = np.empty(shape, dtype=a.dtype)
-    for i in range(shape[0]):
-        new_a[i] = a[i % len(a)]
-    return new_a
+    return gather_as(a, shape, cycle)
 
 
 def is_broadcastable(a, b):
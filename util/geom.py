@@ -22,6 +22,7 @@ from functools import wraps
 
 from svrx.util.smesh import SvPolygon
 from svrx.util.function import match_long_repeat
+from svrx.util.vertices import new_vertices
 
 
 def vectorize(func):
@@ -57,6 +58,36 @@ def circle(radius=1.0, phase=0, nverts=20):
 
 circles = vectorize(circle)
 
+
+def circle_batch(radius, phase, nverts):
+    """
+    circles for arrays of radius, phase and nverts of equal length,
+    computed once per distinct vertex count. Every circle gets its own
+    edges and faces so changing one output leaves the others alone
+    """
+    count = len(radius)
+    verts_out = [None] * count
+    edges_out = [None] * count
+    faces_out = [None] * count
+    for n in np.unique(nverts):
+        select = np.flatnonzero(nverts == n)
+        t = np.linspace(0, np.pi * 2, n, endpoint=False) + phase[select, np.newaxis]
+        verts = new_vertices((len(select), n))
+        verts[:, :, 0] = np.cos(t) * radius[select, np.newaxis]
+        verts[:, :, 1] = np.sin(t) * radius[select, np.newaxis]
+        verts[:, :, 2] = 0
+        edges = np.empty((n, 2), dtype=np.uint32)
+        edges[:, 0] = np.arange(n)
+        edges[:, 1] = np.roll(edges[:, 0], -1)
+        loop = np.arange(0, n, dtype=np.uint32)
+        for i, idx in enumerate(select):
+            verts_out[idx] = verts[i]
+            edges_out[idx] = edges.copy()
+            faces_out[idx] = SvPolygon(np.array([0], dtype=np.uint32),
+                                       np.array([n], dtype=np.uint32),
+                                       loop.copy())
+    return verts_out, edges_out, faces_out
+
 # ---------- Spline
 
 # spline function modifed from
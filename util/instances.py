@@ -0,0 +1,86 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; either version 2
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+import numpy as np
+
+from svrx.util.smesh import SvPolygon
+from svrx.util.vertices import is_compact
+
+
+def stack_matrices(matrices):
+    """(N, 4, 4) array from a matrix, a list of matrices or a stack"""
+    matrices = np.asarray(matrices, dtype=np.float64)
+    if matrices.ndim == 2:
+        matrices = matrices[np.newaxis]
+    return matrices
+
+
+class SvInstances:
+    """
+    One geometry placed by N matrices, the geometry is shared and
+    only realized when asked for
+
+    vertices (V, 4) or compact (V, 3), edges (E, 2) or None, faces SvPolygon or None
+    matrices (N, 4, 4)
+    """
+
+    def __init__(self, vertices, edges=None, faces=None, matrices=None):
+        self.vertices = vertices
+        self.edges = edges
+        self.faces = faces
+        if matrices is None:
+            matrices = np.identity(4)
+        self.matrices = stack_matrices(matrices)
+
+    def __len__(self):
+        return len(self.matrices)
+
+    def transform(self, matrices):
+        """new instances with matrices applied after the current ones"""
+        matrices = stack_matrices(matrices)
+        return SvInstances(self.vertices, self.edges, self.faces,
+                           np.matmul(matrices, self.matrices))
+
+    def realize(self):
+        """one joined mesh with every instance, returns vertices, edges, faces"""
+        count = len(self.matrices)
+        vert_count = len(self.vertices)
+        if is_compact(self.vertices):
+            # w = 1 is implicit, rotate / scale and translate
+            vertices = np.einsum('nij,vj->nvi', self.matrices[:, :3, :3], self.vertices)
+            vertices += self.matrices[:, np.newaxis, :3, 3]
+            vertices = vertices.astype(np.float32)
+        else:
+            vertices = np.einsum('nij,vj->nvi', self.matrices, self.vertices)
+        vertices.shape = (count * vert_count, vertices.shape[-1])
+
+        vert_offset = np.arange(count, dtype=np.uint32) * vert_count
+        edges = None
+        if self.edges is not None and len(self.edges):
+            edges = np.asarray(self.edges, dtype=np.uint32)
+            edges = (edges + vert_offset[:, np.newaxis, np.newaxis]).reshape(-1, 2)
+
+        faces = None
+        if self.faces is not None and len(self.faces):
+            loop_count = len(self.faces.vertex_indices)
+            loop_offset = np.arange(count, dtype=np.uint32) * loop_count
+            faces = SvPolygon(
+                (self.faces.loop_start + loop_offset[:, np.newaxis]).ravel(),
+                np.tile(self.faces.loop_total, count),
+                (self.faces.vertex_indices + vert_offset[:, np.newaxis]).ravel())
+        return vertices, edges, faces
@@ -0,0 +1,87 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; either version 2
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+#
+# Index kernels for list matching, instead of building the matched
+# lists element by element we compute which element of each input
+# goes where and let numpy gather them in one go.
+#
+# count = 3, length = 5
+# repeat_last -> [0 1 2 2 2]
+# cycle       -> [0 1 2 0 1]
+#
+
+import numpy as np
+
+
+def repeat_last(count, length):
+    """indices for matching count elements to length by repeating the last"""
+    return np.minimum(np.arange(length), count - 1)
+
+
+def cycle(count, length):
+    """indices for matching count elements to length by cycling"""
+    return np.mod(np.arange(length), count)
+
+
+def shortest(count, length):
+    """indices for the first length elements"""
+    return np.arange(min(count, length))
+
+
+MATCH_MODES = {
+    'REPEAT': (repeat_last, max),
+    'CYCLE': (cycle, max),
+    'SHORT': (shortest, min),
+}
+
+
+def match_length(counts, mode='REPEAT', limit=None):
+    """resulting length when matching lists with counts"""
+    if limit is not None:
+        return counts[limit]
+    return MATCH_MODES[mode][1](counts)
+
+
+def match_indices(counts, mode='REPEAT', limit=None):
+    """
+    returns length, [index array for each count]
+    """
+    index_func = MATCH_MODES[mode][0]
+    length = match_length(counts, mode, limit)
+    return length, [index_func(c, length) for c in counts]
+
+
+def take(data, indices):
+    """gather data at indices, works for lists as well as arrays"""
+    if isinstance(data, np.ndarray):
+        return data[indices]
+    return [data[i] for i in indices]
+
+
+def gather_as(a, shape, index_func=repeat_last):
+    """
+    make a have shape by gathering along the first axis,
+    the rest of the dimensions are broadcast
+    """
+    if a.shape == shape:
+        return a
+    new_a = a[index_func(len(a), shape[0])]
+    if new_a.shape != shape:
+        new_a = np.broadcast_to(new_a, shape).copy()
+    return new_a
@@ -22,43 +22,144 @@ from itertools import chain, islice, accumulate
 
 import numpy as np
 
+import bpy
 import bmesh
 
-from svrx.util.smesh import SvPolygon, SMesh, SvVertices, SvEdges
+from svrx.util.smesh import (SvPolygon, SMesh, SvVertices, SvEdges,
+                             topology_key, fingerprint)
+from svrx.util.polygon import unique_edges, face_edges
 
 
-def bmesh_from_pydata(verts, edges=None, faces=None, normal_update=False):
-    ''' verts is necessary, edges/faces are optional
-        normal_update, will update verts/edges/faces normals at the end
-    '''
+SCRATCH_MESH = "svrx_scratch_mesh"
 
-    bm = bmesh.new()
-    add_vert = bm.verts.new
 
-    for co in verts:
-        add_vert(co)
+def scratch_mesh():
+    """
+    Mesh datablock used to move data between numpy and bmesh with
+    foreach_set/foreach_get and bm.from_mesh/bm.to_mesh.
+    Looked up by name every time so it survives file loads
+    """
+    mesh = bpy.data.meshes.get(SCRATCH_MESH)
+    if mesh is None:
+        mesh = bpy.data.meshes.new(SCRATCH_MESH)
+    return mesh
 
-    bm.verts.index_update()
-    bm.verts.ensure_lookup_table()
 
-    if not faces is None:
-        add_face = bm.faces.new
-        for face in faces:
-            add_face(tuple(bm.verts[i] for i in face))
+def as_int32(a):
+    """int32 matches the rna int type, so foreach_set can copy the raw buffer"""
+    a = np.ascontiguousarray(a)
+    if a.dtype == np.uint32:
+        return a.view(np.int32)
+    return a.astype(np.int32)
+
 
-        bm.faces.index_update()
+def clear_mesh(mesh):
+    """remove all geometry from mesh"""
+    bm = bmesh.new()
+    bm.to_mesh(mesh)
+    bm.free()
+
+
+def fill_mesh(mesh, vertices, edges=None, faces=None):
+    """
+    write geometry into an empty mesh with foreach_set, the edges used
+    by faces are derived with util.polygon.face_edges
+    """
+    if len(vertices):
+        vertices = np.asarray(vertices)
+        mesh.vertices.add(len(vertices))
+        co = np.ascontiguousarray(vertices[:, :3], dtype=np.float32)
+        mesh.vertices.foreach_set("co", co.ravel())
+
+    loop_edge = None
+    if faces is not None and len(faces):
+        edges, loop_edge = face_edges(faces, edges)
+    elif edges is not None and len(edges):
+        edges = unique_edges(edges)
+
+    if edges is not None and len(edges):
+        mesh.edges.add(len(edges))
+        mesh.edges.foreach_set("vertices", as_int32(edges.ravel()))
+
+    if loop_edge is not None:
+        mesh.loops.add(len(faces.vertex_indices))
+        mesh.loops.foreach_set("vertex_index", as_int32(faces.vertex_indices))
+        mesh.loops.foreach_set("edge_index", as_int32(loop_edge))
+        mesh.polygons.add(len(faces))
+        mesh.polygons.foreach_set("loop_start", as_int32(faces.loop_start))
+        mesh.polygons.foreach_set("loop_total", as_int32(faces.loop_total))
+
+    mesh.update()
+
+
+# topology each mesh was last filled with by write_mesh,
+# {(mesh name, mesh pointer): topology_key}
+_topology = {}
+
+
+def mesh_key(mesh):
+    # the pointer is part of the key so a mesh with the same name in
+    # another file, or a new mesh reusing a name, never matches
+    return mesh.name, mesh.as_pointer()
+
+
+def forget(mesh):
+    """drop what is stored about mesh, call before removing it"""
+    _topology.pop(mesh_key(mesh), None)
+
+
+def same_topology(mesh, vertices, faces, topology):
+    """
+    True if mesh was last filled with topology and still has its size,
+    so only the coordinates need writing
+    """
+    if _topology.get(mesh_key(mesh)) != topology:
+        return False
+    face_count = 0 if faces is None else len(faces)
+    return len(mesh.vertices) == len(vertices) and len(mesh.polygons) == face_count
+
+
+def write_mesh(mesh, vertices, edges=None, faces=None, validate=False, topology=None):
+    """
+    Write rx data to mesh with foreach_set only. If the topology is unchanged
+    just the coordinates are written, else the mesh is cleared and refilled.
+    validate, run mesh.validate() and return its result
+    topology, topology_key of edges and faces if already known
+    """
+    if faces is not None and not isinstance(faces, SvPolygon):
+        faces = SvPolygon.from_pydata(faces)
+    if topology is None:
+        topology = topology_key(edges, faces)
+    if same_topology(mesh, vertices, faces, topology):
+        if len(vertices):
+            co = np.ascontiguousarray(vertices[:, :3], dtype=np.float32)
+            mesh.vertices.foreach_set("co", co.ravel())
+        mesh.update()
+    else:
+        clear_mesh(mesh)
+        fill_mesh(mesh, vertices, edges, faces)
+        _topology[mesh_key(mesh)] = topology
+    if validate:
+        return mesh.validate(verbose=False)
+    return False
 
-    if not edges is None:
-        add_edge = bm.edges.new
-        for edge in edges:
-            edge_seq = tuple(bm.verts[i] for i in edge)
-            try:
-                add_edge(edge_seq)
-            except ValueError:
-                # edge exists!
-                pass
 
-        bm.edges.index_update()
+def bmesh_from_pydata(verts, edges=None, faces=None, normal_update=False):
+    ''' verts is necessary, edges/faces are optional
+        normal_update, will update verts/edges/faces normals at the end
+
+        verts can be a (N, 3) or (N, 4) array, faces a SvPolygon
+    '''
+    if faces is not None and not isinstance(faces, SvPolygon):
+        faces = SvPolygon.from_pydata(faces)
+
+    mesh = scratch_mesh()
+    clear_mesh(mesh)
+    fill_mesh(mesh, verts, edges, faces)
+
+    bm = bmesh.new()
+    bm.from_mesh(mesh)
+    bm.verts.ensure_lookup_table()
 
     if normal_update:
         bm.normal_update()
@@ -66,13 +167,10 @@ def bmesh_from_pydata(verts, edges=None, faces=None, normal_update=False):
 
 
 def rxdata_from_bm(bm):
-    vert_count = len(bm.verts)
-    vertices = np.ones((vert_count, 4), dtype=np.float64)
-    for idx, v in enumerate(bm.verts):
-        vertices[idx,:3] = v.co
-    edges = np.array([(e.verts[0].index, e.verts[1].index) for e in bm.edges], dtype=np.uint32)
-    faces = SvPolygon.from_pydata([[i.index for i in p.verts] for p in bm.faces])
-    return vertices, edges, faces
+    mesh = scratch_mesh()
+    bm.to_mesh(mesh)
+    sm = SMesh.from_mesh(mesh)
+    return sm.vertices.vertices, sm.edges.edges, sm.faces
 
 def rxdata_from_pydata(verts, edges=None, faces=None):
     # v = SvVertices.from_pydata(verts)
@@ -0,0 +1,96 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; either version 2
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+#
+# Index of the objects created by output nodes, {basename: {idx: object name}}
+# The objects are tagged with 'basename' and 'idx' custom properties.
+# bpy.data.objects is scanned once after file load, after that entries are
+# checked when used, so objects deleted or renamed by the user just drop out.
+# Names are stored instead of objects since references to removed ID blocks
+# are not safe to touch.
+#
+
+_index = {}
+_scanned = False
+
+
+def _objects():
+    """bpy.data.objects, the only place the index looks at blender data"""
+    import bpy
+    return bpy.data.objects
+
+
+def invalidate():
+    """forget everything, next use scans bpy.data.objects again, called on file load"""
+    global _scanned
+    _index.clear()
+    _scanned = False
+
+
+def _scan():
+    global _scanned
+    for obj in _objects():
+        basename = obj.get('basename')
+        idx = obj.get('idx')
+        if basename is not None and idx is not None:
+            _index.setdefault(basename, {})[idx] = obj.name
+    _scanned = True
+
+
+def _valid(obj, basename, idx):
+    return obj is not None and obj.get('basename') == basename and obj.get('idx') == idx
+
+
+def add(obj, basename, idx):
+    if not _scanned:
+        _scan()
+    _index.setdefault(basename, {})[idx] = obj.name
+
+
+def remove(basename, idx):
+    _index.get(basename, {}).pop(idx, None)
+
+
+def lookup(basename, idx):
+    """object for basename and idx or None"""
+    if not _scanned:
+        _scan()
+    name = _index.get(basename, {}).get(idx)
+    if name is None:
+        return None
+    obj = _objects().get(name)
+    if not _valid(obj, basename, idx):
+        remove(basename, idx)
+        return None
+    return obj
+
+
+def children(basename, kind=None):
+    """objects created for basename, of type kind if given, sorted by idx"""
+    if not _scanned:
+        _scan()
+    objects = _objects()
+    entries = _index.get(basename, {})
+    result = []
+    for idx, name in sorted(entries.items()):
+        obj = objects.get(name)
+        if not _valid(obj, basename, idx):
+            del entries[idx]
+        elif kind is None or obj.type == kind:
+            result.append(obj)
+    return result
@@ -0,0 +1,269 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; either version 2
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+#
+# Per face kernels working directly on the SvPolygon loop arrays,
+# every face is a segment of the loop array and the per face results
+# are reduced with np.add.reduceat, so no python loop over faces.
+#
+
+import numpy as np
+
+
+def face_offsets(loop_total):
+    """start of each face when the loops are packed in face order"""
+    offsets = np.zeros(len(loop_total), dtype=np.int64)
+    np.cumsum(loop_total[:-1], out=offsets[1:])
+    return offsets
+
+
+def face_loops(poly):
+    """
+    vertex index of each loop, packed in face order, and the face offsets
+    into it. Usually just poly.vertex_indices since faces are stored in order
+    """
+    total = poly.loop_total.astype(np.int64)
+    offsets = face_offsets(total)
+    loop_count = int(total.sum())
+    if np.array_equal(poly.loop_start, offsets) and len(poly.vertex_indices) == loop_count:
+        return poly.vertex_indices, offsets
+    loops = np.arange(loop_count) + np.repeat(poly.loop_start.astype(np.int64) - offsets, total)
+    return poly.vertex_indices[loops], offsets
+
+
+def next_loop(offsets, loop_total):
+    """index of the following loop in the same face, wrapping around"""
+    total = np.asarray(loop_total, dtype=np.int64)
+    nxt = np.arange(1, int(total.sum()) + 1)
+    nxt[offsets + total - 1] = offsets
+    return nxt
+
+
+def loop_face_index(loop_total):
+    """face index for each loop, packed in face order"""
+    return np.repeat(np.arange(len(loop_total)), loop_total)
+
+
+def face_centers(vertices, poly):
+    """center median of each face, (F, 3)"""
+    if len(poly) == 0:
+        return np.empty((0, 3))
+    v_idx, offsets = face_loops(poly)
+    sums = np.add.reduceat(vertices[v_idx, :3], offsets, axis=0)
+    return sums / poly.loop_total[:, np.newaxis]
+
+
+def _face_vectors(vertices, poly):
+    """
+    Newell normal vector, length is twice the face area, and the
+    edge lengths of each face
+    """
+    v_idx, offsets = face_loops(poly)
+    # component wise (3, loops) is a lot faster than np.cross on (loops, 3)
+    x, y, z = (np.take(vertices[:, i], v_idx) for i in range(3))
+    total = poly.loop_total
+    centers = np.empty((len(poly), 3))
+    nxt = next_loop(offsets, total)
+    co, co_next = [], []
+    for i, c in enumerate((x, y, z)):
+        centers[:, i] = np.add.reduceat(c, offsets) / total
+        # relative to the center for precision far away from origin
+        c = c - np.repeat(centers[:, i], total)
+        co.append(c)
+        co_next.append(c[nxt])
+    (x, y, z), (xn, yn, zn) = co, co_next
+    newell = np.empty((len(poly), 3))
+    newell[:, 0] = np.add.reduceat(y * zn - z * yn, offsets)
+    newell[:, 1] = np.add.reduceat(z * xn - x * zn, offsets)
+    newell[:, 2] = np.add.reduceat(x * yn - y * xn, offsets)
+    edge_length = np.sqrt((xn - x) ** 2 + (yn - y) ** 2 + (zn - z) ** 2)
+    return centers, newell, edge_length, offsets
+
+
+def face_normals(vertices, poly, normalize=True):
+    """face normals, (F, 3), Newell's method so it works for n-gons"""
+    if len(poly) == 0:
+        return np.empty((0, 3))
+    _, newell, _, _ = _face_vectors(vertices, poly)
+    if normalize:
+        length = np.sqrt((newell ** 2).sum(axis=1))
+        length[length == 0] = 1.0
+        newell /= length[:, np.newaxis]
+    return newell
+
+
+def face_areas(vertices, poly):
+    if len(poly) == 0:
+        return np.empty(0)
+    _, newell, _, _ = _face_vectors(vertices, poly)
+    return np.sqrt((newell ** 2).sum(axis=1)) * 0.5
+
+
+def face_perimeters(vertices, poly):
+    if len(poly) == 0:
+        return np.empty(0)
+    _, _, edge_length, offsets = _face_vectors(vertices, poly)
+    return np.add.reduceat(edge_length, offsets)
+
+
+def face_info(vertices, poly):
+    """
+    returns areas (F,), centers (F, 3), normals (F, 3), perimeters (F,)
+    in one pass
+    """
+    if len(poly) == 0:
+        return np.empty(0), np.empty((0, 3)), np.empty((0, 3)), np.empty(0)
+    centers, newell, edge_length, offsets = _face_vectors(vertices, poly)
+    length = np.sqrt((newell ** 2).sum(axis=1))
+    areas = length * 0.5
+    length[length == 0] = 1.0
+    normals = newell / length[:, np.newaxis]
+    perimeters = np.add.reduceat(edge_length, offsets)
+    return areas, centers, normals, perimeters
+
+
+def concave_faces(vertices, poly, normals=None):
+    """
+    bool per face, True if any corner turns against the face normal
+    """
+    if len(poly) == 0:
+        return np.zeros(0, dtype=bool)
+    v_idx, offsets = face_loops(poly)
+    total = poly.loop_total
+    nxt = next_loop(offsets, total)
+    prv = np.empty_like(nxt)
+    prv[nxt] = np.arange(len(nxt))
+    if normals is None:
+        normals = face_normals(vertices, poly)
+    normals = np.repeat(normals, total, axis=0)
+    co = vertices[v_idx, :3]
+    corner = np.cross(co - co[prv], co[nxt] - co)
+    turn = (corner * normals).sum(axis=1)
+    # relative tolerance so collinear corners don't count as concave
+    tol = -1e-6 * np.sqrt((corner ** 2).sum(axis=1))
+    return np.logical_or.reduceat(turn < tol, offsets) & (total > 3)
+
+
+def _ear_clip(co, normal):
+    """
+    triangles as local corner indices for one simple polygon co (n, 3)
+    """
+    axis = np.argmax(np.abs(normal))
+    x, y = (axis + 1) % 3, (axis + 2) % 3
+    if normal[axis] < 0:
+        x, y = y, x
+    pts = co[:, (x, y)]
+
+    def area2(a, b, c):
+        return ((pts[b, 0] - pts[a, 0]) * (pts[c, 1] - pts[a, 1]) -
+                (pts[c, 0] - pts[a, 0]) * (pts[b, 1] - pts[a, 1]))
+
+    def inside(p, a, b, c):
+        return area2(a, b, p) >= 0 and area2(b, c, p) >= 0 and area2(c, a, p) >= 0
+
+    remaining = list(range(len(co)))
+    tris = []
+    while len(remaining) > 3:
+        n = len(remaining)
+        for i in range(n):
+            a, b, c = remaining[i - 1], remaining[i], remaining[(i + 1) % n]
+            if area2(a, b, c) <= 0:
+                continue
+            if any(inside(p, a, b, c) for p in remaining if p not in (a, b, c)):
+                continue
+            tris.append((a, b, c))
+            del remaining[i]
+            break
+        else:
+            # degenerate or self intersecting, fan the rest
+            tris.extend((remaining[0], remaining[k], remaining[k + 1])
+                        for k in range(1, len(remaining) - 1))
+            return tris
+    tris.append(tuple(remaining))
+    return tris
+
+
+def triangulate(poly, vertices=None):
+    """
+    returns triangles (M, 3) uint32 vertex indices and the face index
+    of each triangle (M,)
+
+    Faces are fan triangulated from their first corner, if vertices
+    are given concave faces are ear clipped instead.
+    """
+    if len(poly) == 0:
+        return np.empty((0, 3), dtype=np.uint32), np.empty(0, dtype=np.int64)
+    v_idx, offsets = face_loops(poly)
+    total = poly.loop_total.astype(np.int64)
+    tri_count = np.maximum(total - 2, 0)
+    tri_face = np.repeat(np.arange(len(poly)), tri_count)
+    tri_offsets = face_offsets(tri_count)
+    first = offsets[tri_face]
+    k = np.arange(len(tri_face)) - tri_offsets[tri_face] + 1
+    tris = np.empty((len(tri_face), 3), dtype=np.uint32)
+    tris[:, 0] = v_idx[first]
+    tris[:, 1] = v_idx[first + k]
+    tris[:, 2] = v_idx[first + k + 1]
+
+    if vertices is not None:
+        normals = face_normals(vertices, poly)
+        for f in np.flatnonzero(concave_faces(vertices, poly, normals)):
+            face = v_idx[offsets[f]:offsets[f] + total[f]]
+            corners = np.array(_ear_clip(vertices[face, :3], normals[f]))
+            start = tri_offsets[f]
+            tris[start:start + tri_count[f]] = face[corners]
+    return tris, tri_face
+
+
+def edge_keys(edges):
+    """undirected edges packed as one uint64 key, smaller index in the high bits"""
+    edges = np.asarray(edges, dtype=np.uint64).reshape(-1, 2)
+    return (edges.min(axis=1) << np.uint64(32)) | edges.max(axis=1)
+
+
+def keys_to_edges(keys):
+    edges = np.empty((len(keys), 2), dtype=np.uint32)
+    edges[:, 0] = keys >> np.uint64(32)
+    edges[:, 1] = keys & np.uint64(0xffffffff)
+    return edges
+
+
+def unique_edges(edges):
+    """sorted (E, 2) uint32 edges without duplicates, (a, b) and (b, a) are the same"""
+    return keys_to_edges(np.unique(edge_keys(edges)))
+
+
+def face_edges(poly, loose=None):
+    """
+    unique edges of the faces in poly plus the loose edges, sorted (E, 2) uint32,
+    and the edge index of every loop, aligned with poly.vertex_indices,
+    so loop_edge[poly.loop_start[f] + i] is the edge from corner i of face f
+    to the next corner
+    """
+    total = poly.loop_total.astype(np.int64)
+    offsets = face_offsets(total)
+    loops = np.arange(int(total.sum())) + np.repeat(poly.loop_start.astype(np.int64) - offsets, total)
+    v_idx = poly.vertex_indices[loops].astype(np.uint64)
+    v_next = v_idx[next_loop(offsets, total)]
+    keys = (np.minimum(v_idx, v_next) << np.uint64(32)) | np.maximum(v_idx, v_next)
+    if loose is not None and len(loose):
+        keys = np.concatenate((keys, edge_keys(loose)))
+    unique_keys, inverse = np.unique(keys, return_inverse=True)
+    loop_edge = np.zeros(len(poly.vertex_indices), dtype=np.uint32)
+    loop_edge[loops] = inverse[:len(loops)]
+    return keys_to_edges(unique_keys), loop_edge
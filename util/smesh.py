@@ -17,15 +17,19 @@
 # ##### END GPL LICENSE BLOCK #####
 
 
+import zlib
 from itertools import chain, islice, accumulate
 
 import numpy as np
-from mathutils.geometry import normal
+
+from svrx.util.polygon import face_normals, triangulate
+from svrx.util.vertices import vertex_layout
+
 
 class SMesh:
     @classmethod
-    def from_mesh(cls, mesh):
-        return cls(SvVertices.from_mesh(mesh),
+    def from_mesh(cls, mesh, compact=False):
+        return cls(SvVertices.from_mesh(mesh, compact),
                    SvEdges.from_mesh(mesh),
                    SvPolygon.from_mesh(mesh))
 
@@ -46,10 +50,7 @@ class SMesh:
         """
         Face normals
         """
-        normals = np.empty((len(self.faces), 3))
-        for idx, face in enumerate(self.faces):
-            normals[idx] = normal(self.vertices[face])
-        self.faces.normals = normals
+        self.faces.normals = face_normals(self.vertices.vertices, self.faces)
 
     def as_pydata(self):
         return self.vertices.as_pydata(), self.edges.as_pydata(), self.faces
@@ -63,13 +64,21 @@ class SMesh:
 
 class SvVertices:
     @classmethod
-    def from_mesh(cls, mesh):
-        vertices = np.empty(len(mesh.vertices) * 3, dtype=np.float32)
-        mesh.vertices.foreach_get("co", vertices)
-        vertices.shape = (len(mesh.vertices), 3)
-        real_vertices = np.ones((len(mesh.vertices), 4))
-        real_vertices[:,:3] = vertices
-        return cls(real_vertices)
+    def from_mesh(cls, mesh, compact=False):
+        """
+        compact keeps the (N, 3) float32 coordinates as read from the mesh,
+        otherwise they are copied once into the usual (N, 4) float64 array
+        """
+        count = len(mesh.vertices)
+        co = np.empty(count * 3, dtype=np.float32)
+        mesh.vertices.foreach_get("co", co)
+        co.shape = (count, 3)
+        if compact:
+            return cls(co)
+        vertices = np.empty((count, 4))
+        vertices[:, :3] = co
+        vertices[:, 3] = 1.0
+        return cls(vertices)
 
     @classmethod
     def from_pydata(cls, vertices):
@@ -90,15 +99,12 @@ class SvVertices:
 class SvEdges:
     @classmethod
     def from_mesh(cls, mesh):
-        # should use foreach_get
-        #
-        #   :: like this?
-        #   edges = mesh.edges
-        #   k = np.empty(len(edges) * 2, dtype=np.uint32)
-        #   edges.foreach_get('vertices', k)
-        #   f = k.reshape(-1, 2)             # -1 infers whatever is sane for x in (x, 2)
-        #
-        return cls(np.array(mesh.edge_keys, dtype=np.uint32))
+        # int32 matches the rna type so foreach_get can copy the raw buffer,
+        # viewing it as uint32 afterwards is free
+        edges = np.empty(len(mesh.edges) * 2, dtype=np.int32)
+        mesh.edges.foreach_get("vertices", edges)
+        edges.shape = (len(mesh.edges), 2)
+        return cls(edges.view(np.uint32))
 
     @classmethod
     def from_pydata(cls, edges):
@@ -154,14 +160,15 @@ class SvPolygon:
 
     @classmethod
     def from_mesh(cls, mesh):
-        loop_total = np.empty(len(mesh.polygons), dtype=np.uint32)
-        loop_start = np.empty(len(mesh.polygons), dtype=np.uint32)
+        loop_total = np.empty(len(mesh.polygons), dtype=np.int32)
+        loop_start = np.empty(len(mesh.polygons), dtype=np.int32)
         mesh.polygons.foreach_get("loop_total", loop_total)
         mesh.polygons.foreach_get("loop_start", loop_start)
-        vertex_indices = np.empty(len(mesh.loops), dtype=np.uint32)
+        vertex_indices = np.empty(len(mesh.loops), dtype=np.int32)
         mesh.loops.foreach_get("vertex_index", vertex_indices)
-        return cls(loop_start, loop_total, vertex_indices)
-
+        return cls(loop_start.view(np.uint32),
+                   loop_total.view(np.uint32),
+                   vertex_indices.view(np.uint32))
 
     def __getitem__(self, key):
         loop_start = self.loop_start[key]
@@ -174,6 +181,13 @@ class SvPolygon:
     def as_pydata(self):
         return [tuple(face) for face in self]
 
+    def triangulate(self, vertices=None):
+        """
+        returns (M, 3) uint32 triangles and the face index of each triangle,
+        with vertices concave faces are ear clipped instead of fanned
+        """
+        return triangulate(self, vertices)
+
     def __iadd__(self, other):
         if isinstance(other, SvPolygon):
             face_count = len(self)
@@ -188,6 +202,7 @@ class SvPolygon:
                 elif len(other.shape) == 2:
                     #self += SvPolygon
                     pass
+        return self
 
     """
     def join(self, poly):
@@ -197,3 +212,41 @@ class SvPolygon:
         self.vertex_indices = np.concatenate((self.vertex_indices, poly.vertex_indices + offset))
         self.loop_info[face_count:,1] += offset
     """
+
+
+def mesh_nbytes(verts, edges, faces, loops):
+    """
+    bytes used by rx mesh data of the given size, vertices in the
+    current layout, (E, 2) uint32 edges and a SvPolygon. Works on arrays
+    of sizes too, used for cost estimates of generators
+    """
+    width, dtype = vertex_layout()
+    return verts * width * np.dtype(dtype).itemsize + edges * 8 + faces * 8 + loops * 4
+
+
+def _array_fingerprint(a):
+    if a is None:
+        return None
+    a = np.ascontiguousarray(a)
+    return a.shape, a.dtype.str, zlib.adler32(a)
+
+
+def topology_key(edges=None, faces=None):
+    """
+    cheap content fingerprint of rx edges and faces, shapes plus a checksum
+    """
+    if faces is not None:
+        if not isinstance(faces, SvPolygon):
+            faces = SvPolygon.from_pydata(faces)
+        # the split into faces is part of the topology, not just the loops
+        faces = (faces.loop_start, faces.loop_total, faces.vertex_indices)
+    else:
+        faces = ()
+    return tuple(_array_fingerprint(a) for a in (edges,) + faces)
+
+
+def fingerprint(vertices, edges=None, faces=None):
+    """
+    cheap content fingerprint of rx data, (vertices, topology_key)
+    """
+    return _array_fingerprint(vertices), topology_key(edges, faces)
@@ -0,0 +1,133 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; either version 2
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+#
+# Bounded text summaries of data trees, used by the stethoscope.
+# Only the first children of each level are visited and every leaf is
+# described by a few statistics and its first and last rows, so the
+# cost does not grow with the size of the data.
+#
+
+import time
+
+import numpy as np
+
+
+class _OutOfBudget(Exception):
+    pass
+
+
+def leaf_stats(data):
+    """
+    one line description of an array, dtype, shape and for numeric
+    data min / max / mean and the number of NaN values
+    """
+    data = np.asarray(data)
+    desc = "{} {}".format(data.dtype, data.shape)
+    if data.size == 0 or data.dtype.kind not in 'biuf':
+        return desc
+    if data.dtype.kind == 'f':
+        nan = np.isnan(data)
+        nan_count = int(nan.sum())
+        if nan_count == data.size:
+            return desc + " all NaN"
+        values = data[~nan] if nan_count else data
+    else:
+        nan_count = 0
+        values = data
+    desc += " min {:.4g} max {:.4g} mean {:.4g}".format(
+        values.min(), values.max(), values.mean(dtype=np.float64))
+    if nan_count:
+        desc += " NaN {}".format(nan_count)
+    return desc
+
+
+class _print_options:
+    """short float formatting, restored on exit"""
+    def __enter__(self):
+        self.old = np.get_printoptions()
+        np.set_printoptions(precision=4, suppress=True, threshold=50, edgeitems=3)
+
+    def __exit__(self, *args):
+        np.set_printoptions(**self.old)
+
+
+def head_tail(data, head=3):
+    """first and last head rows of an array as text lines"""
+    data = np.asarray(data)
+    if data.ndim == 0:
+        return [repr(data.item())]
+    rows = len(data)
+    with _print_options():
+        if rows <= 2 * head:
+            return [str(row) for row in data]
+        lines = [str(row) for row in data[:head]]
+        lines.append("... {} rows ...".format(rows - 2 * head))
+        lines.extend(str(row) for row in data[-head:])
+    return lines
+
+
+def summarize_leaf(data, shape=False, head=3):
+    """text lines describing one leaf of a data tree"""
+    if hasattr(data, 'loop_total'):
+        # SvPolygon, describe the face sizes instead of three arrays
+        lines = ["{} faces, {} loops".format(len(data.loop_total), len(data.vertex_indices))]
+        if len(data.loop_total):
+            lines.append("face size " + leaf_stats(data.loop_total))
+        return lines
+    if isinstance(data, np.ndarray):
+        lines = [leaf_stats(data)]
+        if not shape:
+            lines.extend("  " + line for line in head_tail(data, head))
+        return lines
+    if hasattr(data, '__len__') and not isinstance(data, str):
+        return ["{} len {}".format(type(data).__name__, len(data))]
+    return [repr(data)[:80]]
+
+
+def summarize_tree(dt, shape=False, max_children=5, head=3, max_lines=60, max_time=0.1):
+    """
+    text lines describing the data tree dt, walking at most max_children
+    per level. Stops when max_lines lines are produced or after max_time
+    seconds, the last line then notes that the output was cut.
+    """
+    lines = []
+    end_time = time.perf_counter() + max_time
+
+    def add(line):
+        if len(lines) >= max_lines or time.perf_counter() > end_time:
+            raise _OutOfBudget
+        lines.append(line)
+
+    def walk(dt, indent):
+        if dt.level == 0:
+            for line in summarize_leaf(dt.data, shape, head):
+                add(indent + line)
+            return
+        children = dt.children
+        add("{}[{} items, level {}]".format(indent, len(children), dt.level))
+        for child in children[:max_children]:
+            walk(child, indent + "  ")
+        if len(children) > max_children:
+            add("{}  ... {} more".format(indent, len(children) - max_children))
+
+    try:
+        walk(dt, "")
+    except _OutOfBudget:
+        lines.append("... output cut at {} lines".format(len(lines)))
+    return lines
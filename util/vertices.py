@@ -0,0 +1,127 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; either version 2
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+#
+# Vertex layouts. The full layout is (N, 4) float64 with w = 1, the
+# compact layout is (N, 3) float32, the same as blender stores, 12
+# instead of 32 bytes per vertex. Nodes that create vertices use the
+# layout of the tree being executed, see new_vertices, nodes that take
+# vertices keep the layout of their input. The homogeneous column is
+# only added when needed, and then only transiently.
+#
+# The layout belongs to an execution, exec_node_group and offline.Plan
+# run the nodes inside layout_scope, outside of one it is always full.
+#
+
+from contextlib import contextmanager
+
+import numpy as np
+
+
+# compact flag of each execution in progress, innermost last
+_scopes = [False]
+
+
+@contextmanager
+def layout_scope(compact):
+    """vertices made inside use the compact or full layout"""
+    _scopes.append(bool(compact))
+    try:
+        yield
+    finally:
+        _scopes.pop()
+
+
+def compact_mode():
+    return _scopes[-1]
+
+
+def is_compact(verts):
+    return verts.shape[-1] == 3
+
+
+def vertex_layout(compact=None):
+    """(width, dtype) of vertices in the compact or full layout"""
+    if compact is None:
+        compact = _scopes[-1]
+    if compact:
+        return 3, np.float32
+    return 4, np.float64
+
+
+def new_vertices(shape, compact=None):
+    """
+    uninitialized vertices of shape + (width,), in the full layout
+    w is already set to 1
+    """
+    width, dtype = vertex_layout(compact)
+    verts = np.empty(tuple(np.atleast_1d(shape)) + (width,), dtype=dtype)
+    if width == 4:
+        verts[..., 3] = 1.0
+    return verts
+
+
+def vertices_like(verts, count):
+    """uninitialized (count, width) vertices in the layout of verts"""
+    out = np.empty((count, verts.shape[-1]), dtype=verts.dtype)
+    if out.shape[-1] == 4:
+        out[:, 3] = 1.0
+    return out
+
+
+def as_layout(verts, compact=None):
+    """verts in the compact or full layout, not copied if already in it"""
+    width, dtype = vertex_layout(compact)
+    if verts.shape[-1] == width and verts.dtype == dtype:
+        return verts
+    if width == 3:
+        return np.ascontiguousarray(verts[..., :3], dtype=dtype)
+    return homogeneous(verts)
+
+
+def homogeneous(verts):
+    """(N, 4) float64 with w = 1 from any layout"""
+    if verts.shape[-1] == 4 and verts.dtype == np.float64:
+        return verts
+    out = np.empty(verts.shape[:-1] + (4,))
+    out[..., :3] = verts[..., :3]
+    out[..., 3] = 1.0 if verts.shape[-1] == 3 else verts[..., 3]
+    return out
+
+
+def match_layout(a, b):
+    """b in the layout of a"""
+    if a.shape[-1] == b.shape[-1] and a.dtype == b.dtype:
+        return b
+    return as_layout(b, is_compact(a))
+
+
+def transform(verts, matrix):
+    """
+    apply a (4, 4) matrix, the result has the layout of verts.
+    Compact vertices are treated as w = 1 without making the column,
+    for projective matrices they are divided by w
+    """
+    if not is_compact(verts):
+        return verts.dot(matrix.T)
+    if np.array_equal(matrix[3], (0, 0, 0, 1)):
+        out = verts.dot(matrix[:3, :3].T.astype(np.float32))
+        out += matrix[:3, 3].astype(np.float32)
+        return out
+    co = homogeneous(verts).dot(matrix.T)
+    return (co[:, :3] / co[:, 3:]).astype(np.float32)